@@ -2,15 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException, status, Body
 from sqlalchemy.orm import Session
 import logging
 from pydantic import ValidationError
-from app.crud.user import get_user_by_email, reset_password
-from app.crud.auth import create_otp, get_otp_by_user, delete_otp
-from app.core.auth import create_access_token, create_refresh_token, decode_token
+from app.crud.user import get_user_by_email, reset_password, revoke_user_tokens
+from app.crud.revoked_token import revoke_token
+from app.crud.auth import create_otp, get_otp_by_user, consume_otp
+from app.core.auth import create_access_token, create_refresh_token, decode_token, user_claims, ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE
+from app.core.revocation import revocation_list
 from app.core.otp_security import verify_otp
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.token import Token, TokenRequest, OTPRequest, OTPResponse
+from app.schemas.token import Token, TokenRequest, OTPRequest, OTPResponse, LogoutRequest
 from app.schemas.user import PasswordReset, UserRead
-from app.api.deps import verify_user_credentials, get_current_user
+from app.api.deps import verify_user_credentials, get_current_user, oauth2_scheme
 
 router = APIRouter()
 
@@ -110,11 +112,17 @@ def login_access_token(
             detail="Incorrect or expired OTP",
         )
     
-    # Clear OTP after successful validation
-    delete_otp(db, otp.otp_id)
+    # Use the OTP up; only one of several concurrent logins with it gets tokens
+    if not consume_otp(db, otp):
+        logger.warning(f"Failed login attempt: OTP already used or locked for email {form_data.email}.")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect or expired OTP",
+        )
     
-    access_token = create_access_token({"sub": user.email})
-    refresh_token = create_refresh_token({"sub": user.email})
+    claims = user_claims(user)
+    access_token = create_access_token(claims)
+    refresh_token = create_refresh_token(claims)
     
     logger.info(f"Access and refresh tokens generated for user {user.email}.")
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
@@ -166,25 +174,32 @@ def refresh_access_token(
     db: Session = Depends(get_db)
 ):
     """
-    Refresh access token using a valid refresh token.
+    Exchange a refresh token for a new access token and a new refresh token.
+
+    Refresh tokens are single use: the presented token is revoked as part of the exchange, and
+    only the request whose revocation is stored first gets new tokens. Presenting an already
+    revoked refresh token, or racing another exchange of the same one, means it was copied, so
+    every token of that user is revoked and they must log in again.
 
     Args:
         refresh_token (str): The refresh token to validate and use for generating a new access token.
         db (Session): The database session.
 
     Raises:
-        HTTPException: If the refresh token is invalid or if user is not found.
+        HTTPException: If the refresh token is invalid, revoked or if user is not found.
 
     Returns:
-        Token: The new access token.
+        Token: The new access and refresh tokens.
     """
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+    )
+
     payload = decode_token(refresh_token)
-    if payload is None:
+    if payload is None or payload.get("typ") == ACCESS_TOKEN_TYPE:
         logger.warning("Invalid refresh token.")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid refresh token",
-        )
+        raise invalid_token_exception
     
     email = payload.get("sub")
     user = db.query(User).filter(User.email == email).first()
@@ -194,7 +209,75 @@ def refresh_access_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+
+    if payload.get("jti") and revocation_list.is_revoked(payload["jti"]):
+        logger.warning(f"Reuse of a rotated refresh token detected for user {email}; revoking all tokens.")
+        revoke_user_tokens(db, user)
+        raise invalid_token_exception
+
+    stamp = payload.get("stamp")
+    if stamp is not None and stamp != user.security_stamp:
+        logger.warning(f"Superseded refresh token presented for user {email}.")
+        raise invalid_token_exception
+
+    # The in-memory list can lag other workers by a poll; the insert itself decides reuse
+    if payload.get("jti") and not revoke_token(db, payload):
+        logger.warning(f"Concurrent reuse of a refresh token detected for user {email}; revoking all tokens.")
+        revoke_user_tokens(db, user)
+        raise invalid_token_exception
     
-    access_token = create_access_token({"sub": user.email})
+    claims = user_claims(user)
+    access_token = create_access_token(claims)
+    new_refresh_token = create_refresh_token(claims)
     logger.info(f"Access token refreshed for user {user.email}.")
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
+
+@router.post("/logout")
+def logout(
+    db: Session = Depends(get_db),
+    form_data: LogoutRequest = Body(LogoutRequest()),
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Revoke the presented access token and, when given, its refresh token. Requires authentication.
+
+    Args:
+        db (Session): The database session.
+        form_data (LogoutRequest): Optionally the refresh token to revoke as well.
+        token (str): The access token being logged out.
+        current_user (User): The currently authenticated user.
+
+    Raises:
+        HTTPException: If the user is not authorized or a token cannot be revoked.
+
+    Returns:
+        dict: Confirmation message.
+    """
+    if not current_user:
+        logger.warning("Unauthorized logout attempt.")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized",
+        )
+
+    access_payload = decode_token(token)
+    if access_payload is None:
+        # Expired since it was authenticated; it can no longer be used, so there is nothing to revoke
+        logger.info(f"Access token of {current_user.email} expired before logout.")
+    else:
+        revoke_token(db, access_payload)
+
+    if form_data.refresh_token:
+        refresh_payload = decode_token(form_data.refresh_token)
+        if (refresh_payload is None or refresh_payload.get("typ") != REFRESH_TOKEN_TYPE
+                or refresh_payload.get("sub") != current_user.email):
+            logger.warning(f"Invalid refresh token presented at logout by {current_user.email}.")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid refresh token",
+            )
+        revoke_token(db, refresh_payload)
+
+    logger.info(f"User {current_user.email} logged out.")
+    return {"detail": "Logged out successfully"}
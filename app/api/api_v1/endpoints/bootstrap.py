@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Response
+import logging
+from typing import Optional
+from app.crud.bootstrap import get_bootstrap_document, etag_matches
+from app.api.deps import get_current_user
+from app.models.user import User
+
+router = APIRouter()
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+@router.get("/bootstrap")
+def read_bootstrap(
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get all client reference data in a single versioned document. Requires authentication.
+
+    The document contains the lookups grouped by category (ordered by `sort`), all request types,
+    the unique request types, the branding elements types and the request branding elements
+    types. It carries a strong `ETag`; clients that send it back in `If-None-Match` receive an
+    empty `304 Not Modified` while their copy is still current.
+
+    Args:
+        if_none_match (Optional[str]): The ETag of the client's cached copy.
+        current_user (User): The current authenticated user.
+
+    Raises:
+        HTTPException: If the user is not authorized.
+
+    Returns:
+        Response: The JSON document, or 304 when the client's copy is current.
+    """
+    if not current_user:
+        logger.warning("Unauthorized access attempt to bootstrap data.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    try:
+        body, etag = get_bootstrap_document()
+    except Exception as e:
+        logger.error(f"Error building bootstrap document: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching bootstrap data")
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        logger.info("Bootstrap data not modified.")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    logger.info("Fetched bootstrap data successfully.")
+    return Response(content=body, media_type="application/json", headers=headers)
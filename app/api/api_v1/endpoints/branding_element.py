@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 import logging
-from app.schemas.branding_element import BrandingElementRead, BrandingElementCreate
-from app.crud.branding_element import get_branding_elements_by_request, create_branding_element
+from app.schemas.branding_element import BrandingElementRead, BrandingElementCreate, BrandingElementChanges
+from app.crud.branding_element import get_branding_elements_by_request, create_branding_element, get_branding_element_changes
+from app.config import CHANGE_FEED_MAX_PAGE_SIZE
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -35,6 +36,24 @@ def read_branding_elements(
     logger.info(f"Fetched {len(branding_element)} branding element successfully.")
     return branding_element
 
+@router.get("/changes", response_model=BrandingElementChanges)
+def read_branding_element_changes(
+    since: Optional[str] = Query(None, description="Sync token returned by the previous call; omit for a full sync"),
+    limit: int = Query(100, ge=1, le=CHANGE_FEED_MAX_PAGE_SIZE, description="Maximum number of changed branding elements to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get branding elements created or updated since a sync token, plus IDs of deleted ones. Requires authentication.
+    """
+    if not current_user:
+        logger.warning("Unauthorized access attempt to the branding element change feed.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    changes = get_branding_element_changes(db, since=since, limit=limit)
+    logger.info(f"Fetched {len(changes.changes)} changed and {len(changes.deleted)} deleted branding elements.")
+    return changes
+
 @router.post("/create", response_model=BrandingElementRead)
 def create_new_branding_element(
     branding_element_in: BrandingElementCreate,
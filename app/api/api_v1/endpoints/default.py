@@ -1,5 +1,19 @@
-from fastapi import APIRouter,  HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemas.default import AppInfo
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.core.reference_cache import reference_cache
+from app.core.warmup import warm_up
+from app.core.cache_sync import cache_versions
+from app.core.user_cache import user_cache
+from app.core.security_stamps import security_stamps
+from app.core.revocation import revocation_list
+from app.core.hash_pool import hash_pool
+from app.core.token_cache import token_cache
+from app.core.email_dispatcher import email_dispatcher
+from app.core.notification_digest import notification_digest
+from app.workflows.http_client import workflow_client, async_workflow_client
+from app.workflows.circuit_breaker import breaker_stats
 import logging
 
 router = APIRouter()
@@ -7,6 +21,9 @@ router = APIRouter()
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+# Roles allowed to read the operational metrics, which name internal endpoints
+METRICS_ROLES = ("Admin",)
+
 @router.get("/", response_model=AppInfo)
 def get_app_info():
     """
@@ -30,4 +47,37 @@ def get_app_info():
         return AppInfo(**app_info)
     except Exception as e:
         logger.error(f"Error occurred: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+
+@router.get("/metrics")
+def get_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Report in-process cache counters for this instance. Requires an admin user.
+
+    Args:
+        current_user (User): The current authenticated user.
+
+    Raises:
+        HTTPException: 403 if the user is not an admin.
+
+    Returns:
+        dict: Hit/miss counters and sizes per cache.
+    """
+    if current_user.role not in METRICS_ROLES:
+        logger.warning(f"User {current_user.email} is not allowed to read metrics.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return {
+        "reference_cache": reference_cache.stats(),
+        "warm_up": warm_up.stats() if warm_up else None,
+        "cache_versions": cache_versions.stats(),
+        "user_cache": user_cache.stats(),
+        "security_stamps": security_stamps.stats(),
+        "revoked_tokens": revocation_list.stats(),
+        "token_cache": token_cache.stats(),
+        "hash_pool": hash_pool.stats(),
+        "email_dispatcher": email_dispatcher.stats() if email_dispatcher else None,
+        "notification_digest": notification_digest.stats() if notification_digest else None,
+        "workflow_client": workflow_client.stats(),
+        "async_workflow_client": async_workflow_client.stats(),
+        "circuit_breakers": breaker_stats()
+    }
\ No newline at end of file
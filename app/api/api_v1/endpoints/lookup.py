@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.schemas.lookup import LookupRead
-from app.crud.lookup import get_lookup_dynamic
+from app.crud.lookup import get_lookup_dynamic, get_lookups_grouped
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
 import logging
-from typing import Optional
+from typing import Optional, List
 
 router = APIRouter()
 
@@ -15,7 +15,8 @@ logger = logging.getLogger(__name__)
 @router.get("/by_fields", response_model=list[LookupRead])
 def read_lookup(
     lookup_id: Optional[int] = Query(None, description="The ID of the lookup to retrieve"),
-    category: Optional[str] = Query(None, description="The category of the lookup to filter"),
+    category: Optional[List[str]] = Query(None, description="The category of the lookup to filter; repeat to filter by several"),
+    display_value: Optional[List[str]] = Query(None, description="The display value of the lookup to filter; repeat to filter by several"),
     is_active: Optional[bool] = Query(None, description="Filter lookups by active status"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -25,14 +26,16 @@ def read_lookup(
 
     This endpoint allows querying lookup entries by one or more of the following fields:
     - `lookup_id`: The unique identifier for the lookup entry.
-    - `category`: The category of the lookup entry.
+    - `category`: The category of the lookup entry. Repeat the parameter to match several categories.
+    - `display_value`: The display value of the lookup entry. Repeat the parameter to match several values.
     - `is_active`: A boolean value to filter lookups based on their active status.
 
-    If no lookup is found matching the provided filters, a 404 error is returned.
+    Results are ordered by category and then by the `sort` column. If no lookup is found matching the provided filters, a 404 error is returned.
 
     Args:
         lookup_id (Optional[int]): The ID of the lookup to retrieve.
-        category (Optional[str]): The category to filter lookups.
+        category (Optional[List[str]]): The categories to filter lookups.
+        display_value (Optional[List[str]]): The display values to filter lookups.
         is_active (Optional[bool]): Filter by active status.
         db (Session): The database session, injected by FastAPI.
         current_user (User): The currently authenticated user, injected by FastAPI.
@@ -46,7 +49,7 @@ def read_lookup(
             - 404: If no lookup entries are found based on the provided filters.
     """
     logger.debug("Received request to fetch lookup(s) with filters: "
-                 f"lookup_id={lookup_id}, category={category}, is_active={is_active}")
+                 f"lookup_id={lookup_id}, category={category}, display_value={display_value}, is_active={is_active}")
 
     # Verify if the current user is authenticated
     if not current_user:
@@ -55,7 +58,7 @@ def read_lookup(
 
     # Fetch lookups based on the dynamic filters
     try:
-        lookups = get_lookup_dynamic(db, lookup_id=lookup_id, category=category, is_active=is_active)
+        lookups = get_lookup_dynamic(db, lookup_id=lookup_id, category=category, display_value=display_value, is_active=is_active)
     except Exception as e:
         logger.error(f"Error fetching lookups: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching lookup data")
@@ -68,3 +71,54 @@ def read_lookup(
     # Successfully retrieved lookup entries
     logger.info(f"Successfully fetched {len(lookups)} lookup(s) based on the provided filters.")
     return lookups
+
+@router.get("/grouped", response_model=dict[str, list[LookupRead]])
+def read_lookup_grouped(
+    category: Optional[List[str]] = Query(None, description="Categories to include; repeat to request several"),
+    display_value: Optional[List[str]] = Query(None, description="The display value of the lookup to filter; repeat to filter by several"),
+    is_active: Optional[bool] = Query(None, description="Filter lookups by active status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Retrieve lookup entries for several categories in one call, grouped by category.
+
+    Intended for populating a whole form at once, e.g. `?category=UserRole&category=Status`.
+    Entries within each category are ordered by the `sort` column; requested categories
+    without entries are returned as empty lists.
+
+    Args:
+        category (Optional[List[str]]): The categories to include; all categories when omitted.
+        display_value (Optional[List[str]]): The display values to filter lookups.
+        is_active (Optional[bool]): Filter by active status.
+        db (Session): The database session, injected by FastAPI.
+        current_user (User): The currently authenticated user, injected by FastAPI.
+
+    Returns:
+        dict[str, list[LookupRead]]: Category to its lookup entries.
+
+    Raises:
+        HTTPException: 
+            - 403: If the user is unauthorized.
+            - 404: If no lookup entries are found based on the provided filters.
+    """
+    logger.debug("Received request to fetch grouped lookups with filters: "
+                 f"category={category}, display_value={display_value}, is_active={is_active}")
+
+    # Verify if the current user is authenticated
+    if not current_user:
+        logger.warning("Unauthorized access attempt by user.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    try:
+        grouped = get_lookups_grouped(db, category=category, display_value=display_value, is_active=is_active)
+    except Exception as e:
+        logger.error(f"Error fetching grouped lookups: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error fetching lookup data")
+
+    if not any(grouped.values()):
+        logger.info("No lookup entries found for provided filters.")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No lookup entries found")
+
+    logger.info(f"Successfully fetched lookups for {len(grouped)} categor(ies).")
+    return grouped
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request as HTTPRequest
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import logging
-from app.schemas.request import RequestRead, RequestCreate, RequestUpdate
-from app.crud.request import get_requests, create_request, update_request
-from app.api.deps import get_db, get_current_user
+from app.schemas.request import RequestRead, RequestCreate, RequestUpdate, RequestChanges
+from app.crud.request import get_requests, create_request, update_request, get_request_changes
+from app.config import CHANGE_FEED_MAX_PAGE_SIZE, EVENT_HEARTBEAT_SECONDS
+from app.api.deps import get_db, get_current_user, get_current_user_without_session
+from app.core.events import event_broker, can_see_request
+from app.crud.audit import get_audit_history
+from app.schemas.audit import AuditLogRead
+from app.models.request import Request
 from app.models.user import User
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -56,6 +62,111 @@ def read_requests(
     logger.info(f"Fetched {len(requests)} requests successfully.")
     return requests
 
+@router.get("/changes", response_model=RequestChanges)
+def read_request_changes(
+    since: Optional[str] = Query(None, description="Sync token returned by the previous call; omit for a full sync"),
+    limit: int = Query(100, ge=1, le=CHANGE_FEED_MAX_PAGE_SIZE, description="Maximum number of changed requests to return"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get requests created or updated since a sync token, plus IDs of deleted requests. Requires authentication.
+
+    Clients store `next_token` and pass it back as `since` on the next poll. While `has_more`
+    is true, the next page can be fetched straight away.
+
+    Args:
+        since (Optional[str]): Opaque sync token from the previous call.
+        limit (int): Maximum number of changed requests to return.
+        db (Session): The database session.
+        current_user (User): The current authenticated user.
+
+    Raises:
+        HTTPException: If the user is not authorized or the sync token is invalid.
+
+    Returns:
+        RequestChanges: The changed requests, deleted request IDs and the next sync token.
+    """
+    if not current_user:
+        logger.warning("Unauthorized access attempt to the request change feed.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    changes = get_request_changes(db, since=since, limit=limit)
+    logger.info(f"Fetched {len(changes.changes)} changed and {len(changes.deleted)} deleted requests.")
+    return changes
+
+@router.get("/events")
+async def stream_request_events(
+    request: HTTPRequest,
+    current_user: User = Depends(get_current_user_without_session)
+):
+    """
+    Stream request status and stage changes as Server-Sent Events. Requires authentication.
+
+    Admins receive events for every request; other users only receive events for requests they
+    are assigned to (`tm_email`, `designer_email`, `supplier_email`, and so on). A comment line
+    is sent every `EVENT_HEARTBEAT_SECONDS` to keep idle connections open through proxies.
+
+    Args:
+        request (Request): The incoming HTTP request, used to detect client disconnects.
+        current_user (User): The current authenticated user.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response.
+    """
+    if not current_user or not current_user.is_active:
+        logger.warning("Unauthorized attempt to subscribe to request events.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    subscription = event_broker.subscribe(current_user.email, current_user.role)
+    logger.info(f"User {current_user.email} subscribed to request events.")
+
+    async def event_stream():
+        try:
+            yield b"retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next_event(timeout=EVENT_HEARTBEAT_SECONDS)
+                yield event.encode() if event is not None else b": keep-alive\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+            logger.info(f"User {current_user.email} unsubscribed from request events.")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/history", response_model=List[AuditLogRead])
+def read_request_history(
+    request_id: int = Query(..., description="The ID of the request"),
+    skip: int = 0,  # Pagination: records to skip
+    limit: int = 100,  # Pagination: max records to return
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the field-level change history of a request, oldest change first. Requires authentication.
+
+    Admins can read the history of every request; other users only of requests they are assigned to,
+    as with request events.
+    """
+    if not current_user:
+        logger.warning("Unauthorized access attempt to request history.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    db_request = db.query(Request).filter(Request.request_id == request_id).first()
+    if not db_request:
+        logger.warning(f"Request with ID {request_id} not found for history.")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+    if not can_see_request(db_request, current_user.email, current_user.role):
+        logger.warning(f"User {current_user.email} attempted to read the history of request {request_id}.")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    history = get_audit_history(db, Request.__tablename__, request_id, skip=skip, limit=limit)
+    logger.info(f"Fetched {len(history)} history entries for request {request_id}.")
+    return history
+
 @router.post("/create", response_model=RequestRead)
 def create_new_request(
     request_in: RequestCreate,
@@ -109,7 +220,7 @@ def update_existing_user(
         logger.warning("Unauthorized attempt to update user.")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     
-    user = update_request(db, request_in.request_id, request_in)
+    user = update_request(db, request_in.request_id, request_in, updated_by=current_user.email)
     if not user:
         logger.info(f"User with ID {request_in.request_id} not found for update.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -95,7 +95,7 @@ def update_existing_user(
         logger.warning("Unauthorized attempt to update user.")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
     
-    user = update_user(db, user_in.user_id, user_in)
+    user = update_user(db, user_in.user_id, user_in, updated_by=current_user.email)
     if not user:
         logger.info(f"User with ID {user_in.user_id} not found for update.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
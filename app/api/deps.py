@@ -1,12 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
 import logging
-from app.db.session import get_db
+import time
+from app.db.session import get_db, SessionLocal
 from app.models.user import User
-from app.core.password_security import verify_password
-from app.core.auth import decode_token
+from app.core.password_security import verify_and_update_password
+from app.core.auth import decode_token, TokenUser, REFRESH_TOKEN_TYPE
+from app.core.revocation import revocation_list
 from app.crud.user import get_user_by_email
+from app.core.user_cache import user_cache
+from app.core.security_stamps import security_stamps
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
@@ -18,6 +23,9 @@ def verify_user_credentials(email: str, password: str, db: Session = Depends(get
     """
     Verify user credentials and return the user if valid.
 
+    A password hashed with a bcrypt cost other than `BCRYPT_ROUNDS` is rehashed and saved on
+    a successful login, so stored hashes follow cost changes without a reset.
+
     Args:
         email (str): The email address of the user.
         password (str): The password provided by the user.
@@ -38,27 +46,61 @@ def verify_user_credentials(email: str, password: str, db: Session = Depends(get
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if not verify_password(password, user.hashed_password):
+    is_valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not is_valid:
         logger.warning(f"Incorrect password for user with email {email}.")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if new_hash is not None:
+        try:
+            user.hashed_password = new_hash
+            db.commit()
+            logger.info(f"Password hash for user with email {email} upgraded to the configured bcrypt cost.")
+        except SQLAlchemyError as e:
+            # The login is still valid; the rehash is retried on the next one
+            db.rollback()
+            logger.warning(f"Could not store rehashed password for user with email {email}: {e}")
     
     logger.info(f"User with email {email} successfully authenticated.")
     return user
 
+def _load_user(db: Session, email: str) -> User:
+    """
+    Load a user through the user cache, falling back to the database.
+    """
+    user = user_cache.get(email)
+    if user is not None:
+        logger.debug("User with email %s served from the user cache.", email)
+        return user
+
+    generation = user_cache.generation
+    started = time.perf_counter()
+    user = db.query(User).filter(User.email == email).first()
+    if user is None:
+        return None
+    return user_cache.put(user, generation, time.perf_counter() - started)
+
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
     """
     Retrieve the current user based on the JWT token.
 
+    Revoked tokens are rejected with an in-memory lookup. Access tokens carry the user's ID, role, vendor, active flag and security stamp. While
+    the stamp matches the in-memory stamp table the user is built from those claims alone,
+    with no database access. Otherwise, and for tokens issued before these claims existed,
+    the user is loaded (through the user cache) and a token whose stamp has been superseded,
+    e.g. by a deactivation or password reset, is rejected. The returned object must be
+    treated as read-only.
+
     Args:
         db (Session, optional): The database session. Defaults to Depends(get_db).
         token (str, optional): The JWT token. Defaults to Depends(oauth2_scheme).
 
     Raises:
-        HTTPException: If credentials are invalid or user not found.
+        HTTPException: If credentials are invalid, superseded or the user is not found.
 
     Returns:
         User: The current user if the token is valid.
@@ -78,11 +120,57 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     if email is None:
         logger.warning("Token payload missing 'sub' field.")
         raise credentials_exception
+
+    if payload.get("typ") == REFRESH_TOKEN_TYPE:
+        logger.warning(f"Refresh token used as an access token by {email}.")
+        raise credentials_exception
+
+    if payload.get("jti") and revocation_list.is_revoked(payload["jti"]):
+        logger.warning(f"Revoked token presented for user {email}.")
+        raise credentials_exception
+
+    user_id = payload.get("user_id")
+    stamp = payload.get("stamp")
+    if user_id is not None and stamp is not None and security_stamps.matches(user_id, stamp):
+        logger.debug("User with email %s authorised from token claims.", email)
+        return TokenUser.from_claims(payload)
     
-    user = db.query(User).filter(User.email == email).first()
+    user = _load_user(db, email)
+    if user is not None and stamp is not None and user.security_stamp != stamp:
+        # The cached copy may predate a change made by another process
+        user_cache.invalidate(email)
+        user = _load_user(db, email)
     if user is None:
         logger.warning(f"User with email {email} not found in the database.")
         raise credentials_exception
+
+    security_stamps.record(user.user_id, user.security_stamp or 0)
+    if stamp is not None and user.security_stamp != stamp:
+        logger.warning(f"Superseded token presented for user {email}.")
+        raise credentials_exception
     
     logger.info(f"User with email {email} successfully retrieved from token.")
     return user
+
+def get_current_user_without_session(token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Retrieve the current user using a short-lived database session.
+
+    Long-lived responses such as event streams use this instead of `get_current_user`, so that
+    no pooled connection stays checked out for the lifetime of the response.
+
+    Args:
+        token (str, optional): The JWT token. Defaults to Depends(oauth2_scheme).
+
+    Raises:
+        HTTPException: If credentials are invalid or user not found.
+
+    Returns:
+        User: The current user if the token is valid.
+    """
+    db = SessionLocal()
+    try:
+        # Cached users are already detached from any session
+        return get_current_user(db=db, token=token)
+    finally:
+        db.close()
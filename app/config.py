@@ -1,4 +1,5 @@
 import os
+import json
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
@@ -26,8 +27,117 @@ REFRESH_TOKEN_EXPIRE_DAYS = os.getenv("REFRESH_TOKEN_EXPIRE_DAYS")
 OTP_LENGTH = os.getenv("OTP_LENGTH")
 OTP_VALID_DURATION = os.getenv("OTP_VALID_DURATION")
 OTP_MAX_ATTEMPTS = os.getenv("OTP_MAX_ATTEMPTS")
+OTP_HMAC_KEY = os.getenv("OTP_HMAC_KEY")
 
 # Power Automate Workflow URL
 SEND_EMAIL_URL = os.getenv("SEND_EMAIL_URL")
 OTP_TEST_EMAIL = os.getenv("OTP_TEST_EMAIL")
-OTP_TEST_CC_EMAIL = os.getenv("OTP_TEST_CC_EMAIL")
\ No newline at end of file
+OTP_TEST_CC_EMAIL = os.getenv("OTP_TEST_CC_EMAIL")
+
+# Shared HTTP client for the workflow: timeouts, keep-alive pool size and in-flight call cap
+WORKFLOW_CONNECT_TIMEOUT_SECONDS = float(os.getenv("WORKFLOW_CONNECT_TIMEOUT_SECONDS", "3.05"))
+WORKFLOW_READ_TIMEOUT_SECONDS = float(os.getenv("WORKFLOW_READ_TIMEOUT_SECONDS", "15"))
+WORKFLOW_POOL_SIZE = int(os.getenv("WORKFLOW_POOL_SIZE", "10"))
+WORKFLOW_MAX_CONCURRENCY = int(os.getenv("WORKFLOW_MAX_CONCURRENCY", "10"))
+WORKFLOW_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("WORKFLOW_ACQUIRE_TIMEOUT_SECONDS", "5"))
+
+# Workflow retries (jittered exponential backoff, capped) and circuit breaker
+WORKFLOW_BACKOFF_MAX_SECONDS = float(os.getenv("WORKFLOW_BACKOFF_MAX_SECONDS", "8"))
+WORKFLOW_BREAKER_FAILURE_RATE = float(os.getenv("WORKFLOW_BREAKER_FAILURE_RATE", "0.5"))
+WORKFLOW_BREAKER_WINDOW_SECONDS = float(os.getenv("WORKFLOW_BREAKER_WINDOW_SECONDS", "60"))
+WORKFLOW_BREAKER_MINIMUM_CALLS = int(os.getenv("WORKFLOW_BREAKER_MINIMUM_CALLS", "5"))
+WORKFLOW_BREAKER_OPEN_SECONDS = float(os.getenv("WORKFLOW_BREAKER_OPEN_SECONDS", "30"))
+
+# Fake workflow for load tests, used when SEND_EMAIL_URL is fake://... (see app/workflows/fake_workflow.py)
+FAKE_WORKFLOW_LATENCY_MS = os.getenv("FAKE_WORKFLOW_LATENCY_MS", "lognormal:150,0.5")
+FAKE_WORKFLOW_ERROR_RATE = float(os.getenv("FAKE_WORKFLOW_ERROR_RATE", "0"))
+FAKE_WORKFLOW_THROTTLE_RATE = float(os.getenv("FAKE_WORKFLOW_THROTTLE_RATE", "0"))
+FAKE_WORKFLOW_BURST_EVERY_SECONDS = float(os.getenv("FAKE_WORKFLOW_BURST_EVERY_SECONDS", "0"))
+FAKE_WORKFLOW_BURST_SECONDS = float(os.getenv("FAKE_WORKFLOW_BURST_SECONDS", "0"))
+FAKE_WORKFLOW_CAPTURE_SIZE = int(os.getenv("FAKE_WORKFLOW_CAPTURE_SIZE", "1000"))
+FAKE_WORKFLOW_SEED = int(os.getenv("FAKE_WORKFLOW_SEED")) if os.getenv("FAKE_WORKFLOW_SEED") else None
+
+# Email outbox dispatcher (disable to deliver from a separate `python -m app.core.email_dispatcher` worker)
+EMAIL_DISPATCHER_ENABLED = os.getenv("EMAIL_DISPATCHER_ENABLED", "true").lower() == "true"
+EMAIL_DISPATCH_BATCH_SIZE = int(os.getenv("EMAIL_DISPATCH_BATCH_SIZE", "20"))
+EMAIL_DISPATCH_POLL_SECONDS = float(os.getenv("EMAIL_DISPATCH_POLL_SECONDS", "5"))
+EMAIL_DISPATCH_MAX_ATTEMPTS = int(os.getenv("EMAIL_DISPATCH_MAX_ATTEMPTS", "5"))
+EMAIL_DISPATCH_RETRY_SECONDS = float(os.getenv("EMAIL_DISPATCH_RETRY_SECONDS", "30"))
+EMAIL_DISPATCH_LEASE_SECONDS = float(os.getenv("EMAIL_DISPATCH_LEASE_SECONDS", "120"))
+# Fernet keys encrypting queued email payloads, comma-separated, newest first
+# (`python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`);
+# derived from SECRET_KEY when unset
+EMAIL_OUTBOX_KEYS = os.getenv("EMAIL_OUTBOX_KEYS")
+
+# Request stage change emails to assignees: "off", "immediate" or "digest" (merged per recipient
+# over the window, or earlier once the size limit is reached)
+REQUEST_NOTIFICATIONS = os.getenv("REQUEST_NOTIFICATIONS", "digest").lower()
+NOTIFICATION_DIGEST_WINDOW_SECONDS = float(os.getenv("NOTIFICATION_DIGEST_WINDOW_SECONDS", "900"))
+NOTIFICATION_DIGEST_MAX_EVENTS = int(os.getenv("NOTIFICATION_DIGEST_MAX_EVENTS", "50"))
+NOTIFICATION_DIGEST_FIELDS = tuple(os.getenv("NOTIFICATION_DIGEST_FIELDS", "designer_email,supplier_email,cdm_email,auditor_email").split(","))
+NOTIFICATION_DIGEST_EVENTS = tuple(os.getenv("NOTIFICATION_DIGEST_EVENTS", "request.stage_changed").split(","))
+
+# Response compression
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_BROTLI_ENABLED = os.getenv("COMPRESSION_BROTLI_ENABLED", "true").lower() == "true"
+
+# Change feed
+CHANGE_FEED_SAFETY_LAG_SECONDS = int(os.getenv("CHANGE_FEED_SAFETY_LAG_SECONDS", "2"))
+CHANGE_FEED_MAX_PAGE_SIZE = int(os.getenv("CHANGE_FEED_MAX_PAGE_SIZE", "500"))
+
+# Request event stream (Server-Sent Events)
+EVENT_SUBSCRIBER_BUFFER = int(os.getenv("EVENT_SUBSCRIBER_BUFFER", "100"))
+EVENT_HEARTBEAT_SECONDS = int(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+# Audit trail
+AUDIT_FLUSH_SIZE = int(os.getenv("AUDIT_FLUSH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "2"))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+
+# Reference data cache (lookup, request type, branding type and SFA tables)
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "600"))
+
+# Startup warm-up and reference cache snapshot (empty path disables the snapshot)
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_TIME_BUDGET_SECONDS = float(os.getenv("WARMUP_TIME_BUDGET_SECONDS", "5"))
+WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", "2"))
+REFERENCE_SNAPSHOT_PATH = os.getenv("REFERENCE_SNAPSHOT_PATH", "")
+
+# Cross-process cache invalidation through the cache_version table
+CACHE_VERSION_POLL_SECONDS = float(os.getenv("CACHE_VERSION_POLL_SECONDS", "1"))
+
+# Authenticated-user cache used by get_current_user
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1000"))
+
+# Verified bearer token cache used by decode_token (0 disables it)
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# Dedicated bcrypt hashing pool (0 workers means min(4, CPU count))
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", "0"))
+HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", "16"))
+HASH_POOL_QUEUE_TIMEOUT_SECONDS = float(os.getenv("HASH_POOL_QUEUE_TIMEOUT_SECONDS", "5"))
+
+# bcrypt cost factor; measure it on the target hardware with `python -m app.utils.calibrate_bcrypt`
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# OTP store: "database", "memory" (single instance) or "redis" (any RESP server, TCP or unix socket)
+OTP_STORE_BACKEND = os.getenv("OTP_STORE_BACKEND", "database")
+OTP_STORE_URL = os.getenv("OTP_STORE_URL")
+
+# Login/OTP rate limiting: "METHOD /path" -> {"ip" | "email": [limit, window seconds]}
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL")
+# Only enable behind a proxy that appends to X-Forwarded-For; HOPS is the number of such proxies
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+RATE_LIMIT_FORWARDED_HOPS = int(os.getenv("RATE_LIMIT_FORWARDED_HOPS", "1"))
+RATE_LIMIT_RULES = json.loads(os.getenv("RATE_LIMIT_RULES") or json.dumps({
+    "POST /api/v1/login/otp": {"ip": [20, 60], "email": [5, 60]},
+    "POST /api/v1/login/access_token": {"ip": [30, 60], "email": [10, 60]},
+    "POST /api/v1/login/reset_password": {"ip": [10, 60], "email": [5, 60]},
+    "POST /api/v1/login/refresh_token": {"ip": [60, 60]},
+    "POST /api/v1/user/create": {"ip": [20, 60]}
+}))
@@ -0,0 +1,196 @@
+import logging
+import queue
+import threading
+import time
+from datetime import date, datetime, timezone
+from sqlalchemy import inspect, insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.audit import AuditLog
+from app.config import AUDIT_FLUSH_SIZE, AUDIT_FLUSH_INTERVAL_SECONDS, AUDIT_QUEUE_SIZE
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Columns whose values must never be copied into the audit trail
+MASKED_FIELDS = {"hashed_password"}
+MASK = "***"
+
+# Bookkeeping columns already captured by `changed_by` / `changed_on`
+IGNORED_FIELDS = {"updated_on", "updated_by"}
+
+
+def snapshot(obj) -> dict:
+    """
+    Capture the current column values of an ORM object.
+
+    Args:
+        obj: A SQLAlchemy model instance.
+
+    Returns:
+        dict: Column name to value.
+    """
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def diff(before: dict, after: dict) -> dict:
+    """
+    Compare two snapshots field by field.
+
+    Args:
+        before (dict): Snapshot taken before the change (empty for creates).
+        after (dict): Snapshot taken after the change.
+
+    Returns:
+        dict: Field name to (old, new) for every field whose value changed.
+    """
+    return {
+        field: (before.get(field), value)
+        for field, value in after.items()
+        if field not in IGNORED_FIELDS and before.get(field) != value
+    }
+
+
+def _to_text(field: str, value):
+    if value is None:
+        return None
+    if field in MASKED_FIELDS:
+        return MASK
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class AuditWriter:
+    """
+    Background writer for the append-only audit trail.
+
+    `record` only appends to an in-process queue, so auditing adds no database round trip to
+    the write path. A daemon thread drains the queue and inserts the entries in batches of up
+    to `flush_size`, or every `flush_interval` seconds, whichever comes first.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session.
+        flush_size (int): Maximum number of entries per batch insert.
+        flush_interval (float): Maximum seconds an entry waits in the queue.
+        queue_size (int): Queue capacity; entries beyond it are dropped and logged.
+    """
+
+    def __init__(self, session_factory, flush_size: int = 100, flush_interval: float = 2.0, queue_size: int = 10000):
+        self.session_factory = session_factory
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit writer started.")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the background thread after flushing everything still queued.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._drain()
+        logger.info(f"Audit writer stopped. {self.written} entries written, {self.dropped} dropped.")
+
+    def record(self, table_name: str, row_id: int, action: str, changes: dict, changed_by: str = None):
+        """
+        Queue field-level audit entries for one create or update.
+
+        Args:
+            table_name (str): The audited table.
+            row_id (int): Primary key of the audited row.
+            action (str): 'create' or 'update'.
+            changes (dict): Field name to (old, new), as returned by `diff`.
+            changed_by (str): Email of the user who made the change.
+        """
+        changed_on = datetime.now(timezone.utc)
+        for field, (old, new) in changes.items():
+            entry = {
+                "table_name": table_name,
+                "row_id": row_id,
+                "action": action,
+                "field_name": field,
+                "old_value": _to_text(field, old),
+                "new_value": _to_text(field, new),
+                "changed_by": changed_by,
+                "changed_on": changed_on
+            }
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self.dropped += 1
+                logger.error(f"Audit queue full; dropped entry for {table_name} {row_id}.{field}.")
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped}
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+
+    def _take_batch(self) -> list:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.5)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.flush_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: list):
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLog), batch)
+            db.commit()
+            self.written += len(batch)
+            logger.debug("Flushed %d audit entries.", len(batch))
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Failed to write {len(batch)} audit entries: {e}")
+        finally:
+            db.close()
+
+
+def _session_factory():
+    # Imported lazily so this module can be imported without opening a connection
+    from app.db.session import SessionLocal
+    return SessionLocal()
+
+
+# Process-wide audit writer, started and stopped with the application
+audit_writer = AuditWriter(
+    _session_factory,
+    flush_size=AUDIT_FLUSH_SIZE,
+    flush_interval=AUDIT_FLUSH_INTERVAL_SECONDS,
+    queue_size=AUDIT_QUEUE_SIZE
+)
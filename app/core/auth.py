@@ -1,14 +1,66 @@
 import jwt
+import secrets
 from datetime import datetime, timedelta, timezone
 import logging
+from app.core.token_cache import token_cache
 from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+# Values of the `typ` claim; a refresh token is never accepted as an access token
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+class TokenUser:
+    """
+    Read-only principal built from the claims of a verified access token.
+
+    Exposes the user attributes endpoints authorise on, so they need no database lookup.
+    """
+    __slots__ = ("user_id", "email", "role", "vendor_id", "is_active", "security_stamp")
+
+    def __init__(self, user_id: int, email: str, role: str, vendor_id: int, is_active: bool, security_stamp: int):
+        self.user_id = user_id
+        self.email = email
+        self.role = role
+        self.vendor_id = vendor_id
+        self.is_active = is_active
+        self.security_stamp = security_stamp
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "TokenUser":
+        return cls(
+            user_id=payload["user_id"],
+            email=payload["sub"],
+            role=payload.get("role"),
+            vendor_id=payload.get("vendor_id"),
+            is_active=payload.get("active", False),
+            security_stamp=payload["stamp"]
+        )
+
+def user_claims(user) -> dict:
+    """
+    Build the identity claims embedded in access and refresh tokens.
+
+    Args:
+        user: The `User` the token is issued to.
+
+    Returns:
+        dict: `sub` plus the user's ID, role, vendor, active flag and security stamp.
+    """
+    return {
+        "sub": user.email,
+        "user_id": user.user_id,
+        "role": user.role,
+        "vendor_id": user.vendor_id,
+        "active": bool(user.is_active),
+        "stamp": user.security_stamp or 0
+    }
+
 def create_access_token(data: dict, token_expiration: int = ACCESS_TOKEN_EXPIRE_MINUTES) -> str:
     """
-    Create an access token with an expiration time.
+    Create an access token with an expiration time and a unique `jti` for revocation.
 
     Args:
         data (dict): The data to encode in the token.
@@ -19,10 +71,10 @@ def create_access_token(data: dict, token_expiration: int = ACCESS_TOKEN_EXPIRE_
     """
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=int(token_expiration))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": secrets.token_hex(16), "typ": ACCESS_TOKEN_TYPE})
     try:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        logger.debug(f"Access token created with expiration: {expire}")
+        logger.debug("Access token created with expiration: %s", expire)
         return encoded_jwt
     except Exception as e:
         logger.error(f"Error creating access token: {e}")
@@ -30,7 +82,7 @@ def create_access_token(data: dict, token_expiration: int = ACCESS_TOKEN_EXPIRE_
 
 def create_refresh_token(data: dict, token_expiration: int = REFRESH_TOKEN_EXPIRE_DAYS) -> str:
     """
-    Create a refresh token with an expiration time.
+    Create a refresh token with an expiration time and a unique `jti` for revocation and rotation.
 
     Args:
         data (dict): The data to encode in the token.
@@ -41,10 +93,10 @@ def create_refresh_token(data: dict, token_expiration: int = REFRESH_TOKEN_EXPIR
     """
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=int(token_expiration))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": secrets.token_hex(16), "typ": REFRESH_TOKEN_TYPE})
     try:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        logger.debug(f"Refresh token created with expiration: {expire}")
+        logger.debug("Refresh token created with expiration: %s", expire)
         return encoded_jwt
     except Exception as e:
         logger.error(f"Error creating refresh token: {e}")
@@ -54,15 +106,22 @@ def decode_token(token: str):
     """
     Decode a JWT token and return the payload.
 
+    Tokens already verified by this process are served from `token_cache` until they expire,
+    skipping the signature check. The returned payload must be treated as read-only.
+
     Args:
         token (str): The JWT token to decode.
 
     Returns:
         dict: The decoded token payload if the token is valid, None otherwise.
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        logger.debug(f"Token decoded successfully: {payload}")
+        token_cache.put(token, payload)
+        logger.debug("Token decoded successfully for %s.", payload.get("sub"))
         return payload
     except jwt.ExpiredSignatureError:
         logger.warning("Token has expired.")
@@ -0,0 +1,97 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.cache_version import CacheVersion
+from app.config import CACHE_VERSION_POLL_SECONDS
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class CacheVersionPoller:
+    """
+    Keeps in-process caches coherent across workers and instances through the `cache_version` table.
+
+    Caches register a callback per logical table and call `check()` before serving a read.
+    At most once per `interval` a single caller reads the whole (tiny) version table; callers
+    arriving meanwhile do not wait and keep using what they have. Every table whose version
+    moved since the previous poll has its callbacks run, so each process drops exactly the
+    segments another process wrote to.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session.
+        interval (float): Minimum seconds between two polls.
+    """
+
+    def __init__(self, session_factory, interval: float = 1.0):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._versions = None
+        self._listeners = defaultdict(list)
+        self._lock = threading.Lock()
+        self._last_poll = 0.0
+        self.polls = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def subscribe(self, name: str, callback):
+        """
+        Run `callback()` whenever the version of `name` changes in another process.
+        """
+        self._listeners[name].append(callback)
+
+    def check(self):
+        """
+        Poll the version table if the interval has elapsed and no other thread is polling.
+        """
+        if time.monotonic() - self._last_poll < self.interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() - self._last_poll < self.interval:
+                return
+            self._last_poll = time.monotonic()
+            self._poll()
+        finally:
+            self._lock.release()
+
+    def stats(self) -> dict:
+        return {"polls": self.polls, "invalidations": self.invalidations, "errors": self.errors}
+
+    def _poll(self):
+        db = self.session_factory()
+        try:
+            versions = dict(db.execute(select(CacheVersion.name, CacheVersion.version)).all())
+        except SQLAlchemyError as e:
+            self.errors += 1
+            logger.warning(f"Cache version poll failed; serving cached data: {e}")
+            return
+        finally:
+            db.close()
+        self.polls += 1
+
+        previous, self._versions = self._versions, versions
+        if previous is None:
+            # First poll only establishes the baseline
+            return
+        for name, version in versions.items():
+            if previous.get(name) == version:
+                continue
+            self.invalidations += 1
+            logger.info(f"Cache version of {name} changed to {version}; invalidating.")
+            for callback in self._listeners.get(name, ()):
+                callback()
+
+
+def _session_factory():
+    # Imported lazily so this module can be imported without opening a connection
+    from app.db.session import SessionLocal
+    return SessionLocal()
+
+
+# Process-wide poller shared by every in-process cache
+cache_versions = CacheVersionPoller(_session_factory, interval=CACHE_VERSION_POLL_SECONDS)
@@ -0,0 +1,225 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.email_outbox import EmailOutbox
+from app.workflows.notification import send_notification, split_recipients
+from app.core.outbox_security import decrypt_payload, PayloadError
+from app.config import (
+    SEND_EMAIL_URL, EMAIL_DISPATCHER_ENABLED, EMAIL_DISPATCH_BATCH_SIZE, EMAIL_DISPATCH_POLL_SECONDS,
+    EMAIL_DISPATCH_MAX_ATTEMPTS, EMAIL_DISPATCH_RETRY_SECONDS, EMAIL_DISPATCH_LEASE_SECONDS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class EmailDispatcher:
+    """
+    Background delivery of the `email_outbox` table to the Power Automate workflow.
+
+    A daemon thread claims due emails in batches of up to `batch_size` and posts them one by
+    one. Claiming pushes `next_attempt_on` out by `lease` seconds in a short transaction that
+    skips rows locked by other instances, so several processes can dispatch the same outbox
+    and an email whose dispatcher died mid-send is retried once its lease runs out. Payloads
+    are decrypted only for the workflow call and cleared once sent or given up. Failed
+    deliveries are retried with jittered exponential backoff starting at `retry_delay` seconds,
+    up to `max_attempts` attempts. While the workflow's circuit breaker is open, claimed emails
+    go back to the queue until it may close, without using up an attempt. The thread polls
+    every `poll_interval` seconds; `wake` starts a
+    batch immediately after an email is queued.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session.
+        workflow_url (str): The workflow endpoint emails are posted to.
+        batch_size (int): Maximum number of emails claimed at once.
+        poll_interval (float): Seconds between polls when idle.
+        max_attempts (int): Delivery attempts before an email is marked failed.
+        retry_delay (float): Delay before the first retry; doubled for every further one.
+        lease (float): Seconds a claimed email is hidden from other dispatchers.
+    """
+
+    def __init__(self, session_factory, workflow_url: str, batch_size: int = 20, poll_interval: float = 5.0,
+                 max_attempts: int = 5, retry_delay: float = 30.0, lease: float = 120.0):
+        self.session_factory = session_factory
+        self.workflow_url = workflow_url
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.deferred = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info("Email dispatcher started.")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the background thread. Undelivered emails stay in the outbox for the next start.
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        logger.info(f"Email dispatcher stopped. {self.sent} sent, {self.retried} retried, {self.failed} failed.")
+
+    def wake(self):
+        """
+        Deliver newly committed emails now instead of at the next poll.
+        """
+        self._wake.set()
+
+    def dispatch_once(self) -> int:
+        """
+        Claim and deliver one batch of due emails.
+
+        Returns:
+            int: Number of emails claimed.
+        """
+        batch = self._claim()
+        for item in batch:
+            self._deliver(*item)
+        return len(batch)
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "deferred": self.deferred
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            claimed = self.dispatch_once()
+            if claimed < self.batch_size:
+                # Outbox drained; sleep until the next poll or an explicit wake-up
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _claim(self) -> list:
+        db = self.session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            rows = (
+                db.query(EmailOutbox)
+                .filter(EmailOutbox.status == "pending", EmailOutbox.next_attempt_on <= now)
+                .order_by(EmailOutbox.outbox_id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = []
+            for row in rows:
+                row.attempts += 1
+                row.next_attempt_on = now + timedelta(seconds=self.lease)
+                claimed.append((row.outbox_id, row.email_type, row.recipient, row.cc, row.bcc, row.payload, row.attempts))
+            db.commit()
+            return claimed
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error claiming queued emails: {e}")
+            return []
+        finally:
+            db.close()
+
+    def _deliver(self, outbox_id: int, email_type: str, recipient: str, cc: str, bcc: str, payload: str, attempts: int):
+        try:
+            body = decrypt_payload(payload)
+        except (PayloadError, ValueError) as e:
+            # Retrying cannot help: the key is gone or the row was altered
+            body, result = None, {"status": "failure", "error": str(e)}
+            attempts = self.max_attempts
+        if body is not None:
+            try:
+                # One workflow call per message; the workflow fans it out to every recipient
+                result = send_notification(
+                    self.workflow_url, email_type, body,
+                    to=split_recipients(recipient), cc=split_recipients(cc), bcc=split_recipients(bcc), retries=1
+                )
+            except Exception as e:
+                result = {"status": "failure", "error": str(e)}
+
+        now = datetime.now(timezone.utc)
+        if result.get("circuit_open"):
+            # Not delivered and not attempted; wait for the circuit instead of burning attempts
+            values = {"attempts": attempts - 1, "next_attempt_on": now + timedelta(seconds=result.get("retry_after") or 1)}
+            self.deferred += 1
+        elif result.get("status") == "success":
+            # The payload may hold an OTP or temporary password; keep no copy once delivered
+            values = {"status": "sent", "sent_on": now, "payload": None, "last_error": None}
+            self.sent += 1
+        elif attempts >= self.max_attempts:
+            values = {"status": "failed", "payload": None, "last_error": result.get("error")}
+            self.failed += 1
+            logger.error(f"Giving up on {email_type} email {outbox_id} to {recipient} after {attempts} attempts: {result.get('error')}")
+        else:
+            delay = self.retry_delay * 2 ** (attempts - 1) * random.uniform(0.5, 1.0)
+            values = {"next_attempt_on": now + timedelta(seconds=delay), "last_error": result.get("error")}
+            self.retried += 1
+            logger.warning(f"{email_type} email {outbox_id} to {recipient} failed; retrying in {delay:.0f} seconds.")
+
+        db = self.session_factory()
+        try:
+            db.execute(update(EmailOutbox).where(EmailOutbox.outbox_id == outbox_id).values(**values))
+            db.commit()
+        except SQLAlchemyError as e:
+            # The lease expires and the email is delivered again; duplicates beat losing it
+            db.rollback()
+            logger.error(f"Error recording delivery of email {outbox_id}: {e}")
+        finally:
+            db.close()
+
+
+def _session_factory():
+    # Imported lazily so this module can be imported without opening a connection
+    from app.db.session import SessionLocal
+    return SessionLocal()
+
+
+# Process-wide email dispatcher, started and stopped with the application (None when disabled,
+# e.g. when a separate worker runs `python -m app.core.email_dispatcher`)
+email_dispatcher = EmailDispatcher(
+    _session_factory,
+    SEND_EMAIL_URL,
+    batch_size=EMAIL_DISPATCH_BATCH_SIZE,
+    poll_interval=EMAIL_DISPATCH_POLL_SECONDS,
+    max_attempts=EMAIL_DISPATCH_MAX_ATTEMPTS,
+    retry_delay=EMAIL_DISPATCH_RETRY_SECONDS,
+    lease=EMAIL_DISPATCH_LEASE_SECONDS
+) if EMAIL_DISPATCHER_ENABLED else None
+
+
+if __name__ == "__main__":
+    # Standalone worker delivering the outbox for instances running with the dispatcher disabled
+    worker = EmailDispatcher(
+        _session_factory,
+        SEND_EMAIL_URL,
+        batch_size=EMAIL_DISPATCH_BATCH_SIZE,
+        poll_interval=EMAIL_DISPATCH_POLL_SECONDS,
+        max_attempts=EMAIL_DISPATCH_MAX_ATTEMPTS,
+        retry_delay=EMAIL_DISPATCH_RETRY_SECONDS,
+        lease=EMAIL_DISPATCH_LEASE_SECONDS
+    )
+    logging.basicConfig(level=logging.INFO)
+    worker.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        worker.stop()
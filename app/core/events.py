@@ -0,0 +1,211 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+from app.config import EVENT_SUBSCRIBER_BUFFER
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Request columns that assign a user to a request
+ASSIGNEE_FIELDS = ("tm_email", "fsm_email", "cdm_email", "designer_email", "supplier_email", "auditor_email", "bm_email")
+
+# Roles that receive events for every request rather than only their assignments
+SEE_ALL_ROLES = ("Admin",)
+
+
+def can_see_request(db_request, email: str, role: str) -> bool:
+    """
+    Whether a user may see a request: see-all roles see every request, other users only the
+    requests they are assigned to.
+    """
+    if role in SEE_ALL_ROLES:
+        return True
+    email = (email or "").lower()
+    return bool(email) and any((getattr(db_request, field, None) or "").lower() == email for field in ASSIGNEE_FIELDS)
+
+
+class RequestEvent:
+    """
+    A status or stage change on a request, as delivered to subscribers.
+
+    Attributes:
+        event_id (int): Monotonic ID within this process, used as the SSE `id`.
+        event_type (str): One of "request.created", "request.status_changed", "request.stage_changed".
+        request_id (int): The request that changed.
+        data (dict): JSON-serialisable payload sent to clients.
+        recipients (frozenset): Lower-cased emails of the users assigned to the request.
+    """
+    __slots__ = ("event_id", "event_type", "request_id", "data", "recipients", "_encoded")
+
+    def __init__(self, event_id: int, event_type: str, request_id: int, data: dict, recipients: frozenset):
+        self.event_id = event_id
+        self.event_type = event_type
+        self.request_id = request_id
+        self.data = data
+        self.recipients = recipients
+        self._encoded = None
+
+    def encode(self) -> bytes:
+        """
+        Format the event as a Server-Sent Events frame. Encoded once and shared by all subscribers.
+        """
+        if self._encoded is None:
+            payload = json.dumps(self.data, default=str, separators=(",", ":"))
+            self._encoded = f"id: {self.event_id}\nevent: {self.event_type}\ndata: {payload}\n\n".encode()
+        return self._encoded
+
+
+class Subscription:
+    """
+    A single client's bounded event buffer.
+
+    When the client falls behind and the buffer is full, the oldest event is dropped so a slow
+    consumer never blocks publishers or grows memory without bound.
+    """
+
+    def __init__(self, email: str, role: str, loop: asyncio.AbstractEventLoop, buffer_size: int):
+        self.email = (email or "").lower()
+        self.role = role
+        self.loop = loop
+        self.buffer = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def offer(self, event: RequestEvent):
+        # Runs on the subscription's event loop
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(event)
+        self._ready.set()
+
+    async def next_event(self, timeout: float) -> Optional[RequestEvent]:
+        """
+        Wait for the next event.
+
+        Returns:
+            RequestEvent | None: The next buffered event, or None if `timeout` expired first.
+        """
+        if not self.buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.buffer.popleft() if self.buffer else None
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe fan-out for request events.
+
+    Subscribers are indexed by email, so publishing an event only touches the subscriptions of
+    the request's assignees plus the see-all roles; idle subscribers cost a buffer and a
+    parked coroutine each. `publish` is thread-safe and may be called from the sync CRUD
+    functions that run on Starlette's threadpool.
+    """
+
+    def __init__(self, buffer_size: int = 100):
+        self.buffer_size = buffer_size
+        self._by_email = {}
+        self._see_all = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Call `listener(event)` for every published event, regardless of subscribers.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def subscribe(self, email: str, role: str) -> Subscription:
+        subscription = Subscription(email, role, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            if role in SEE_ALL_ROLES:
+                self._see_all.add(subscription)
+            else:
+                self._by_email.setdefault(subscription.email, set()).add(subscription)
+        logger.debug("Event subscriber added for %s.", subscription.email)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._see_all.discard(subscription)
+            subscribers = self._by_email.get(subscription.email)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_email[subscription.email]
+        if subscription.dropped:
+            logger.warning(f"Event subscriber {subscription.email} dropped {subscription.dropped} events.")
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._see_all) + sum(len(subscribers) for subscribers in self._by_email.values())
+
+    def publish(self, event_type: str, request_id: int, data: dict, assignees: dict):
+        """
+        Deliver an event to every subscriber allowed to see it.
+
+        Args:
+            event_type (str): The event name sent to clients.
+            request_id (int): The request that changed.
+            data (dict): Event payload.
+            assignees (dict): Assignee column name to email, used to route the event.
+        """
+        recipients = frozenset(email.lower() for email in assignees.values() if email)
+        event = RequestEvent(next(self._ids), event_type, request_id, data, recipients)
+        with self._lock:
+            targets = set(self._see_all)
+            for email in recipients:
+                targets.update(self._by_email.get(email, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down; it will be unsubscribed by its own finally block
+                pass
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Event listener failed for {event_type} on request {request_id}: {e}")
+        logger.debug("Published %s for request %s to %d subscriber(s).", event_type, request_id, len(targets))
+
+
+def build_request_events(db_request, previous_status: Optional[str], previous_stage: Optional[str],
+                         status: Optional[str], stage: Optional[str], created: bool = False) -> list:
+    """
+    Work out which events a committed create or update of a request should raise.
+
+    Returns:
+        list[tuple]: (event_type, payload, assignees) tuples, empty when nothing relevant changed.
+    """
+    assignees = {field: getattr(db_request, field, None) for field in ASSIGNEE_FIELDS}
+    payload = {
+        "request_id": db_request.request_id,
+        "status": status,
+        "stage": stage,
+        "previous_status": previous_status,
+        "previous_stage": previous_stage,
+        "occurred_on": datetime.now(timezone.utc).isoformat(),
+        **assignees
+    }
+    if created:
+        return [("request.created", payload, assignees)]
+    events = []
+    if status != previous_status:
+        events.append(("request.status_changed", payload, assignees))
+    if stage != previous_stage:
+        events.append(("request.stage_changed", payload, assignees))
+    return events
+
+
+# Process-wide broker shared by the CRUD layer and the SSE endpoint
+event_broker = EventBroker(buffer_size=EVENT_SUBSCRIBER_BUFFER)
@@ -0,0 +1,102 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from fastapi import HTTPException, status
+from app.config import HASH_POOL_WORKERS, HASH_POOL_MAX_QUEUE, HASH_POOL_QUEUE_TIMEOUT_SECONDS
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class HashPool:
+    """
+    Dedicated, size-limited executor for bcrypt password and OTP hashing.
+
+    bcrypt releases the GIL while it works, so a small thread pool gives real parallelism.
+    Admission is bounded: at most `workers` hashes run and `max_queue` wait, and any caller
+    beyond that is rejected immediately with 503 and a Retry-After header. A login storm can
+    therefore tie up at most `workers + max_queue` of Starlette's shared threads, leaving the
+    rest for read traffic.
+
+    Args:
+        workers (int): Number of hashing threads.
+        max_queue (int): Number of hashes allowed to wait for a free thread.
+        queue_timeout (float): Seconds a caller waits for its result before giving up with 503.
+    """
+
+    def __init__(self, workers: int, max_queue: int, queue_timeout: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.peak_pending = 0
+
+    def run(self, func, *args):
+        """
+        Run a hashing function on the pool and wait for its result.
+
+        Raises:
+            HTTPException: 503 when the pool is saturated or the result does not arrive in time.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                saturated = True
+            else:
+                self._pending += 1
+                self.peak_pending = max(self.peak_pending, self._pending)
+                saturated = False
+        if saturated:
+            logger.warning("Hash pool saturated; shedding request.")
+            raise self._unavailable()
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.queue_timeout)
+        except FutureTimeoutError:
+            # Drop it if it has not started; a running hash finishes and releases its slot
+            future.cancel()
+            self.timeouts += 1
+            logger.warning(f"Hash pool result not ready within {self.queue_timeout}s.")
+            raise self._unavailable()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self.completed += 1
+
+    def _unavailable(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": str(max(1, int(self.queue_timeout)))}
+        )
+
+
+# Process-wide pool shared by password and OTP hashing
+hash_pool = HashPool(
+    workers=HASH_POOL_WORKERS or min(4, os.cpu_count() or 1),
+    max_queue=HASH_POOL_MAX_QUEUE,
+    queue_timeout=HASH_POOL_QUEUE_TIMEOUT_SECONDS
+)
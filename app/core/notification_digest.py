@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from app.core.events import RequestEvent
+from app.config import (
+    REQUEST_NOTIFICATIONS, NOTIFICATION_DIGEST_WINDOW_SECONDS, NOTIFICATION_DIGEST_MAX_EVENTS,
+    NOTIFICATION_DIGEST_FIELDS, NOTIFICATION_DIGEST_EVENTS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Email type of the summary message, as passed to the workflow
+DIGEST_EMAIL_TYPE = "Request Digest"
+
+
+def render_digest(recipient: str, events: list) -> dict:
+    """
+    Merge the buffered events of one recipient into a single summary message.
+
+    Events of the same request are collapsed into one line going from the first previous
+    stage to the latest stage.
+
+    Args:
+        recipient (str): The assignee the digest is for.
+        events (list[RequestEvent]): Buffered events, oldest first.
+
+    Returns:
+        dict: Workflow message fields: `Subject`, a plain text `Summary` and the `Requests` items.
+    """
+    requests = {}
+    for event in events:
+        data = event.data
+        item = requests.get(event.request_id)
+        if item is None:
+            item = requests[event.request_id] = {
+                "RequestId": event.request_id,
+                "PreviousStage": data.get("previous_stage"),
+                "Changes": 0
+            }
+        item["Stage"] = data.get("stage")
+        item["Status"] = data.get("status")
+        item["UpdatedOn"] = data.get("occurred_on")
+        item["Changes"] += 1
+
+    lines = []
+    for item in requests.values():
+        if item["PreviousStage"] and item["PreviousStage"] != item["Stage"]:
+            change = f"{item['PreviousStage']} -> {item['Stage']}"
+        else:
+            change = f"now {item['Stage']}"
+        lines.append(f"Request #{item['RequestId']}: {change} (status {item['Status']})")
+
+    count = len(requests)
+    return {
+        "Subject": f"{count} request{'s' if count != 1 else ''} assigned to you changed stage",
+        "Summary": "\n".join(lines),
+        "Requests": list(requests.values())
+    }
+
+
+class NotificationDigest:
+    """
+    Per-recipient buffer that turns request events into digest emails.
+
+    Registered as an event broker listener, it keeps the events that concern each assignee
+    and, once the oldest buffered event is `window` seconds old or `max_events` are buffered,
+    merges them into one summary message queued in the email outbox. A burst of updates to
+    many requests therefore costs one workflow call per recipient and window instead of one
+    per event. A `window` of 0 sends every event on its own. Buffers are flushed on shutdown;
+    events still buffered when the process is killed are lost.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session.
+        window (float): Seconds events are collected before a recipient's digest is sent.
+        max_events (int): Buffered events that trigger an early flush for a recipient.
+        fields (tuple): Assignee columns whose users are notified.
+        event_types (tuple): Event types that are notified.
+    """
+
+    def __init__(self, session_factory, window: float = 900, max_events: int = 50,
+                 fields: tuple = (), event_types: tuple = ("request.stage_changed",)):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_events = max_events
+        self.fields = fields
+        self.event_types = event_types
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self._due = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.events = 0
+        self.digests = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-digest", daemon=True)
+        self._thread.start()
+        logger.info("Notification digest started.")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop the background thread after queueing a digest for everything still buffered.
+        """
+        self._stop.set()
+        self._due.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self.flush(force=True)
+        logger.info(f"Notification digest stopped. {self.events} events merged into {self.digests} digests.")
+
+    def offer(self, event: RequestEvent):
+        """
+        Buffer an event for each notified assignee. Called by the event broker on publish.
+        """
+        if event.event_type not in self.event_types:
+            return
+        recipients = {(event.data.get(field) or "").lower() for field in self.fields} - {""}
+        if not recipients:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for recipient in recipients:
+                buffer = self._buffers.setdefault(recipient, [now, []])
+                buffer[1].append(event)
+                self.events += 1
+                if len(buffer[1]) >= self.max_events or self.window <= 0:
+                    self._due.set()
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Queue the digests that are due (or all of them with `force`).
+
+        Returns:
+            int: Number of digests queued.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                recipient for recipient, (started, events) in self._buffers.items()
+                if force or now - started >= self.window or len(events) >= self.max_events
+            ]
+            batches = [(recipient, self._buffers.pop(recipient)[1]) for recipient in due]
+        if not batches:
+            return 0
+        return self._queue(batches)
+
+    def stats(self) -> dict:
+        with self._lock:
+            buffered = sum(len(events) for _, events in self._buffers.values())
+            return {
+                "recipients_buffered": len(self._buffers),
+                "events_buffered": buffered,
+                "events": self.events,
+                "digests": self.digests,
+                "calls_saved": max(self.events - buffered - self.digests, 0)
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._due.wait(min(self.window, 5) if self.window > 0 else 5)
+            self._due.clear()
+            if not self._stop.is_set():
+                self.flush()
+
+    def _queue(self, batches: list) -> int:
+        # Imported lazily to keep the event broker free of database imports
+        from app.crud.email_outbox import enqueue_notification
+        from app.core.email_dispatcher import email_dispatcher
+
+        db = self.session_factory()
+        try:
+            for recipient, events in batches:
+                enqueue_notification(db, type=DIGEST_EMAIL_TYPE, body=render_digest(recipient, events), to=[recipient])
+            db.commit()
+            self.digests += len(batches)
+            logger.info(f"Queued {len(batches)} request digests covering {sum(len(events) for _, events in batches)} events.")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error queueing {len(batches)} request digests: {e}")
+            # Put the events back so the next flush retries them
+            with self._lock:
+                for recipient, events in batches:
+                    buffer = self._buffers.setdefault(recipient, [time.monotonic(), []])
+                    buffer[1][:0] = events
+            return 0
+        finally:
+            db.close()
+        if email_dispatcher:
+            email_dispatcher.wake()
+        return len(batches)
+
+
+def _session_factory():
+    # Imported lazily so this module can be imported without opening a connection
+    from app.db.session import SessionLocal
+    return SessionLocal()
+
+
+# Process-wide request notification digest (None when REQUEST_NOTIFICATIONS is "off");
+# "immediate" sends every event on its own
+notification_digest = NotificationDigest(
+    _session_factory,
+    window=NOTIFICATION_DIGEST_WINDOW_SECONDS if REQUEST_NOTIFICATIONS == "digest" else 0,
+    max_events=NOTIFICATION_DIGEST_MAX_EVENTS,
+    fields=NOTIFICATION_DIGEST_FIELDS,
+    event_types=NOTIFICATION_DIGEST_EVENTS
+) if REQUEST_NOTIFICATIONS in ("digest", "immediate") else None
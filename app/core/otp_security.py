@@ -1,33 +1,35 @@
-from passlib.context import CryptContext
-import random
-import string
+import hmac
+import hashlib
+import secrets
 import logging
 from fastapi import HTTPException, status
 from app.schemas.token import OTP
 from app.schemas.user import UserRead
-from app.models.auth import Otp
+from app.core.otp_store import otp_store
 from app.utils.otp_utils import verify_otp_attempts
 from datetime import datetime, timedelta, timezone
-from app.config import OTP_LENGTH, OTP_MAX_ATTEMPTS, OTP_VALID_DURATION
+from app.config import OTP_LENGTH, OTP_VALID_DURATION, OTP_HMAC_KEY, SECRET_KEY
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
-# Create a password context with bcrypt hashing algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Key for OTP digests; a dedicated key allows rotating it independently of the JWT secret
+_otp_key = (OTP_HMAC_KEY or SECRET_KEY or "").encode()
 
-def generate_otp(db, existing_otps: list[Otp], user: UserRead, length=int(OTP_LENGTH)):
+def generate_otp(db, user: UserRead, length=int(OTP_LENGTH)):
     """
-    Generate a one-time password (OTP) consisting of digits.
+    Generate a one-time password (OTP) consisting of digits and store its digest for the user.
+
+    Each user has at most one OTP in the OTP store; issuing a new OTP replaces the previous
+    one and resets its attempt count.
 
     Args:
         db (Session): The database session.
-        existing_otps (list[Otp]): List of existing OTPs in the database.
         user (UserRead): The user object for whom the OTP is being generated.
-        length (int): The length of the OTP. Default is 5. Must be a positive integer.
+        length (int): The length of the OTP. Default is `OTP_LENGTH`. Must be a positive integer.
 
     Returns:
-        tuple: A tuple containing the generated OTP as a string and the OTP object saved in the database.
+        tuple: A tuple containing the generated OTP as a string and the stored OTP record.
 
     Raises:
         ValueError: If length is less than or equal to 0.
@@ -37,67 +39,33 @@ def generate_otp(db, existing_otps: list[Otp], user: UserRead, length=int(OTP_LE
         raise ValueError("Length must be a positive integer.")
     
     try:
-        max_attempts = int(OTP_MAX_ATTEMPTS)
-        attempt = 0
-
-        while attempt < max_attempts:
-            attempt += 1
-            
-            if length == 1:
-                otp = random.choice(string.digits[1:])  # Only digits 1-9
-            else:
-                otp = random.choice(string.digits[1:]) + ''.join(random.choice(string.digits) for _ in range(length - 1))
-
-            logger.info("Generating OTP.")
-
-            # Hash the generated OTP
-            hashed_otp = hash_otp(otp)
-
-            # Check if the hashed OTP already exists in the database
-            if existing_otps and hashed_otp in [otp.otp for otp in existing_otps]:
-                logger.debug("Generated OTP already exists, trying a new one.")
-                continue
-            
-            # Create and save the OTP in the database
-            db_otp = Otp(
-                user_id=user.user_id,
-                otp=hashed_otp,
-                created_on=datetime.now(timezone.utc)
-            )
-            db.add(db_otp)
-            db.commit()
-            db.refresh(db_otp)
-
-            logger.info(f"OTP created successfully for User ID {user.user_id}.")
-            logger.debug(f"Generated OTP: {otp}")
-            return otp, db_otp
-        
-        raise Exception("Failed to generate a unique OTP after multiple attempts.")
+        # First digit 1-9 so the OTP keeps its length when handled as an integer
+        otp = str(secrets.randbelow(9) + 1) + ''.join(str(secrets.randbelow(10)) for _ in range(length - 1))
+        logger.info("Generating OTP.")
+
+        db_otp = otp_store.issue(db, user.user_id, hash_otp(otp, user.user_id))
+
+        logger.info(f"OTP created successfully for User ID {user.user_id}.")
+        return otp, db_otp
     
     except Exception as e:
         logger.error(f"Error generating OTP: {e}")
         raise
 
-def hash_otp(otp: int) -> str:
+def hash_otp(otp, user_id: int) -> str:
     """
-    Hash a one-time password (OTP) using bcrypt.
+    Compute the keyed HMAC-SHA256 digest stored for an OTP.
+
+    The user ID is part of the message, so a digest is only valid for the user it was issued to.
 
     Args:
-        otp (int): The plain number OTP to hash.
+        otp (int | str): The plain OTP.
+        user_id (int): The ID of the user the OTP belongs to.
 
     Returns:
-        str: The hashed OTP.
-
-    Raises:
-        Exception: If an error occurs during hashing.
+        str: The hex digest.
     """
-    try:
-        hashed = pwd_context.hash(str(otp))
-        logger.debug("OTP hashed successfully.")
-        return hashed
-    except Exception as e:
-        logger.error(f"Error hashing OTP: {e}")
-        raise
+    return hmac.new(_otp_key, f"{user_id}:{otp}".encode(), hashlib.sha256).hexdigest()
 
 def verify_otp(db, plain_otp: int, otp: OTP) -> bool:
     """
@@ -120,8 +88,8 @@ def verify_otp(db, plain_otp: int, otp: OTP) -> bool:
     # Ensure otp.created_on is timezone-aware
     otp_created_on = otp.created_on if otp.created_on.tzinfo else otp.created_on.replace(tzinfo=timezone.utc)
 
-    # Verify OTP
-    is_verified = pwd_context.verify(str(plain_otp), otp.otp)
+    # Verify OTP with a constant-time comparison of the digests
+    is_verified = hmac.compare_digest(hash_otp(plain_otp, otp.user_id), otp.otp)
 
     # Handle OTP verification failure and maximum attempts
     if not is_verified:
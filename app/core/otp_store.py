@@ -0,0 +1,338 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import and_, update, delete
+from sqlalchemy.exc import IntegrityError
+from app.models.auth import Otp
+from app.schemas.token import OTP
+from app.utils.resp import RespClient, RespError
+from app.config import OTP_STORE_BACKEND, OTP_STORE_URL, OTP_VALID_DURATION
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class AttemptResult(Enum):
+    """
+    Outcome of counting a failed OTP attempt.
+    """
+    COUNTED = "counted"  # Attempt recorded, the OTP can still be used
+    LOCKED = "locked"    # Limit already reached; the OTP has been removed
+    MISSING = "missing"  # No such OTP (used, replaced or expired)
+
+
+class OtpStore(ABC):
+    """
+    Storage for the one active OTP of each user.
+
+    Every method takes the request's database session; backends that keep OTPs elsewhere
+    ignore it. Records are returned as `OTP` schema objects, and an OTP is identified by its
+    ID together with its digest, so acting on an OTP read earlier never touches one issued
+    since, even when a backend reuses the ID.
+    """
+
+    @abstractmethod
+    def issue(self, db, user_id: int, digest: str) -> OTP:
+        """
+        Store a new OTP digest for a user, replacing any previous one and resetting its attempts.
+
+        The database backend only flushes, so the caller commits the OTP together with the
+        email queued for it.
+        """
+
+    @abstractmethod
+    def get(self, db, user_id: int) -> Optional[OTP]:
+        """
+        Return the user's current OTP, or None when there is none (or it has expired).
+        """
+
+    @abstractmethod
+    def register_failure(self, db, otp: OTP, max_attempts: int) -> AttemptResult:
+        """
+        Atomically count one failed attempt against an OTP, removing it once `max_attempts`
+        failures have already been counted.
+
+        The database backend leaves a lockout uncommitted, so the caller can deactivate the
+        user in the same transaction; every other outcome is final when this returns.
+        """
+
+    @abstractmethod
+    def delete(self, db, otp: OTP) -> bool:
+        """
+        Remove an OTP once used or locked out. A newer OTP of the same user is left alone.
+
+        Returns:
+            bool: True if the OTP was still current and has been removed.
+        """
+
+    @abstractmethod
+    def consume(self, db, otp: OTP, max_attempts: int) -> bool:
+        """
+        Atomically remove a verified OTP, provided it is still current and fewer than
+        `max_attempts` failures have been counted against it.
+
+        Of several concurrent logins with the same OTP only one gets True, and a failure
+        counted meanwhile by another request is taken into account.
+
+        Returns:
+            bool: True if exactly this OTP was removed and tokens may be issued.
+        """
+
+
+class DatabaseOtpStore(OtpStore):
+    """
+    OTPs in the `Otp` table, one row per user. Expired rows are removed by the MySQL event in
+    mysql/otp.sql and rejected at verification until then.
+    """
+
+    def issue(self, db, user_id: int, digest: str) -> OTP:
+        created_on = datetime.now(timezone.utc)
+        db_otp = db.query(Otp).filter(Otp.user_id == user_id).first()
+        if db_otp is None:
+            try:
+                # Savepoint, so a lost insert race leaves the caller's transaction intact
+                with db.begin_nested():
+                    db_otp = Otp(user_id=user_id, otp=digest, attempts=0, created_on=created_on)
+                    db.add(db_otp)
+            except IntegrityError:
+                # A concurrent request inserted the user's row first; replace it instead
+                db_otp = db.query(Otp).filter(Otp.user_id == user_id).one()
+        if db_otp.otp != digest:
+            db_otp.otp = digest
+            db_otp.attempts = 0
+            db_otp.created_on = created_on
+        db.flush()
+        return OTP.model_validate(db_otp)
+
+    def get(self, db, user_id: int) -> Optional[OTP]:
+        db_otp = db.query(Otp).filter(Otp.user_id == user_id).first()
+        return OTP.model_validate(db_otp) if db_otp else None
+
+    def register_failure(self, db, otp: OTP, max_attempts: int) -> AttemptResult:
+        # One conditional statement both checks the limit and counts the attempt
+        counted = db.execute(
+            update(Otp)
+            .where(self._is_current(otp), Otp.attempts < max_attempts)
+            .values(attempts=Otp.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if counted:
+            db.commit()
+            return AttemptResult.COUNTED
+        # Limit reached or OTP gone; the delete tells which. Committed by the caller.
+        deleted = db.execute(delete(Otp).where(self._is_current(otp)).execution_options(synchronize_session=False)).rowcount
+        return AttemptResult.LOCKED if deleted else AttemptResult.MISSING
+
+    def delete(self, db, otp: OTP) -> bool:
+        deleted = db.execute(delete(Otp).where(self._is_current(otp)).execution_options(synchronize_session=False)).rowcount
+        db.commit()
+        return deleted == 1
+
+    def consume(self, db, otp: OTP, max_attempts: int) -> bool:
+        deleted = db.execute(
+            delete(Otp)
+            .where(self._is_current(otp), Otp.attempts < max_attempts)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return deleted == 1
+
+    @staticmethod
+    def _is_current(otp: OTP):
+        # A reissue rewrites the user's row in place and keeps its ID; the digest tells them apart
+        return and_(Otp.otp_id == otp.otp_id, Otp.otp == otp.otp)
+
+
+class MemoryOtpStore(OtpStore):
+    """
+    OTPs in a process-local dict that expire on their own after `ttl` seconds.
+
+    Needs no database writes, but each process has its own OTPs, so it only suits a single
+    instance (or sticky routing of the login flow).
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._records = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def issue(self, db, user_id: int, digest: str) -> OTP:
+        record = OTP(otp_id=next(self._ids), user_id=user_id, otp=digest, attempts=0, created_on=datetime.now(timezone.utc))
+        with self._lock:
+            self._sweep()
+            self._records[user_id] = (record, time.monotonic() + self.ttl)
+        return record
+
+    def get(self, db, user_id: int) -> Optional[OTP]:
+        with self._lock:
+            entry = self._records.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self._records.pop(user_id, None)
+                return None
+            return entry[0].model_copy()
+
+    def register_failure(self, db, otp: OTP, max_attempts: int) -> AttemptResult:
+        with self._lock:
+            entry = self._current(otp)
+            if entry is None:
+                return AttemptResult.MISSING
+            if entry[0].attempts >= max_attempts:
+                del self._records[otp.user_id]
+                return AttemptResult.LOCKED
+            entry[0].attempts += 1
+            return AttemptResult.COUNTED
+
+    def delete(self, db, otp: OTP) -> bool:
+        with self._lock:
+            if self._current(otp) is None:
+                return False
+            del self._records[otp.user_id]
+            return True
+
+    def consume(self, db, otp: OTP, max_attempts: int) -> bool:
+        with self._lock:
+            entry = self._current(otp)
+            if entry is None or entry[0].attempts >= max_attempts:
+                return False
+            del self._records[otp.user_id]
+            return True
+
+    def _current(self, otp: OTP):
+        entry = self._records.get(otp.user_id)
+        if entry is None or entry[0].otp_id != otp.otp_id or entry[0].otp != otp.otp or entry[1] <= time.monotonic():
+            return None
+        return entry
+
+    def _sweep(self):
+        now = time.monotonic()
+        for user_id in [user_id for user_id, (_, expires_at) in self._records.items() if expires_at <= now]:
+            del self._records[user_id]
+
+
+class RespOtpStore(OtpStore):
+    """
+    OTPs in Redis, or any server speaking its protocol, shared by every instance.
+
+    Keys expire with the OTP, so nothing needs cleaning up. Attempts are counted per OTP with
+    `INCR`, so concurrent failures are never lost. Removal is a `WATCH`/`MULTI` compare-and-delete,
+    so an OTP reissued or failed meanwhile is never removed in its place.
+
+    Args:
+        client (RespClient): Connection to the server.
+        ttl (float): OTP lifetime in seconds.
+        prefix (str): Key prefix.
+    """
+
+    def __init__(self, client: RespClient, ttl: float, prefix: str = "otp:"):
+        self.client = client
+        self.ttl_ms = int(ttl * 1000)
+        self.prefix = prefix
+
+    def issue(self, db, user_id: int, digest: str) -> OTP:
+        otp_id = self._check(self.client.execute("INCR", f"{self.prefix}seq"))
+        record = OTP(otp_id=otp_id, user_id=user_id, otp=digest, attempts=0, created_on=datetime.now(timezone.utc))
+        payload = json.dumps({"otp_id": otp_id, "otp": digest, "created_on": record.created_on.isoformat()})
+        self._check(self.client.execute("SET", self._key(user_id), payload, "PX", self.ttl_ms))
+        return record
+
+    def get(self, db, user_id: int) -> Optional[OTP]:
+        payload = self._check(self.client.execute("GET", self._key(user_id)))
+        if payload is None:
+            return None
+        data = json.loads(payload)
+        attempts = self._check(self.client.execute("GET", self._attempts_key(user_id, data["otp_id"])))
+        return OTP(
+            otp_id=data["otp_id"],
+            user_id=user_id,
+            otp=data["otp"],
+            attempts=int(attempts or 0),
+            created_on=datetime.fromisoformat(data["created_on"])
+        )
+
+    def register_failure(self, db, otp: OTP, max_attempts: int) -> AttemptResult:
+        key = self._attempts_key(otp.user_id, otp.otp_id)
+        payload, attempts, _ = [self._check(reply) for reply in self.client.pipeline(
+            ("GET", self._key(otp.user_id)), ("INCR", key), ("PEXPIRE", key, self.ttl_ms)
+        )]
+        if not self._matches(payload, otp):
+            return AttemptResult.MISSING
+        if attempts <= max_attempts:
+            return AttemptResult.COUNTED
+        return AttemptResult.LOCKED if self.delete(db, otp) else AttemptResult.MISSING
+
+    def delete(self, db, otp: OTP) -> bool:
+        return self._remove(otp)
+
+    def consume(self, db, otp: OTP, max_attempts: int) -> bool:
+        return self._remove(otp, max_attempts)
+
+    def _remove(self, otp: OTP, max_attempts: int = None) -> bool:
+        key = self._key(otp.user_id)
+        attempts_key = self._attempts_key(otp.user_id, otp.otp_id)
+        # The transaction is discarded if the OTP or its attempt count changes between the
+        # check and the delete
+        _, payload, attempts = [self._check(reply) for reply in self.client.pipeline(
+            ("WATCH", key, attempts_key), ("GET", key), ("GET", attempts_key)
+        )]
+        if not self._matches(payload, otp):
+            for reply in self.client.pipeline(("UNWATCH",), ("DEL", attempts_key)):
+                self._check(reply)
+            return False
+        if max_attempts is not None and int(attempts or 0) >= max_attempts:
+            self._check(self.client.execute("UNWATCH"))
+            return False
+        replies = [self._check(reply) for reply in self.client.pipeline(("MULTI",), ("DEL", key, attempts_key), ("EXEC",))]
+        return replies[-1] is not None
+
+    @staticmethod
+    def _matches(payload, otp: OTP) -> bool:
+        if payload is None:
+            return False
+        data = json.loads(payload)
+        return data["otp_id"] == otp.otp_id and data["otp"] == otp.otp
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}{user_id}"
+
+    def _attempts_key(self, user_id: int, otp_id: int) -> str:
+        return f"{self.prefix}{user_id}:{otp_id}:attempts"
+
+    @staticmethod
+    def _check(reply):
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+
+def create_otp_store(backend: str, url: str = None) -> OtpStore:
+    """
+    Build the OTP store selected by configuration.
+
+    Args:
+        backend (str): "database", "memory" or "redis".
+        url (str): Server URL for the "redis" backend (`redis://host:port/db` or `unix:///path`).
+
+    Raises:
+        ValueError: If the backend is unknown or the redis backend has no URL.
+    """
+    ttl = timedelta(minutes=int(OTP_VALID_DURATION or 5)).total_seconds()
+    if backend == "database":
+        return DatabaseOtpStore()
+    if backend == "memory":
+        return MemoryOtpStore(ttl)
+    if backend == "redis":
+        if not url:
+            raise ValueError("OTP_STORE_URL is required for the redis OTP store.")
+        return RespOtpStore(RespClient(url), ttl)
+    raise ValueError(f"Unknown OTP store backend: {backend}")
+
+
+# Process-wide OTP store
+otp_store = create_otp_store(OTP_STORE_BACKEND, OTP_STORE_URL)
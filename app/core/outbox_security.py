@@ -0,0 +1,64 @@
+import base64
+import hashlib
+import json
+import logging
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+from app.config import EMAIL_OUTBOX_KEYS, SECRET_KEY
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class PayloadError(Exception):
+    """
+    An outbox payload could not be decrypted (unknown key or tampered data).
+    """
+
+
+def _build_fernet(keys: str, fallback_secret: str) -> MultiFernet:
+    """
+    Build the cipher for outbox payloads.
+
+    Args:
+        keys (str): Comma-separated Fernet keys; the first encrypts and all of them decrypt,
+            so a new key can be put in front while queued emails still use the old one.
+        fallback_secret (str): Secret a key is derived from when no dedicated key is configured.
+    """
+    configured = [key.strip() for key in (keys or "").split(",") if key.strip()]
+    if not configured:
+        derived = hashlib.sha256(f"email-outbox:{fallback_secret or ''}".encode()).digest()
+        configured = [base64.urlsafe_b64encode(derived).decode()]
+    return MultiFernet([Fernet(key) for key in configured])
+
+
+_fernet = _build_fernet(EMAIL_OUTBOX_KEYS, SECRET_KEY)
+
+
+def encrypt_payload(body: dict) -> str:
+    """
+    Encrypt the message fields of a queued email, which may hold an OTP or temporary password.
+
+    Args:
+        body (dict): Message fields posted to the workflow.
+
+    Returns:
+        str: The encrypted, authenticated payload for `email_outbox.payload`.
+    """
+    return _fernet.encrypt(json.dumps(body).encode()).decode()
+
+
+def decrypt_payload(payload: str) -> dict:
+    """
+    Decrypt a payload written by `encrypt_payload`.
+
+    Rows queued before payloads were encrypted hold plain JSON and are read as is.
+
+    Raises:
+        PayloadError: If the payload was encrypted with an unknown key or has been altered.
+    """
+    if payload.lstrip().startswith("{"):
+        return json.loads(payload)
+    try:
+        return json.loads(_fernet.decrypt(payload.encode()))
+    except InvalidToken as e:
+        raise PayloadError("Cannot decrypt the email payload.") from e
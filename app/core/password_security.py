@@ -2,16 +2,26 @@ from passlib.context import CryptContext
 import random
 import string
 import logging
+from typing import Optional
+from app.core.hash_pool import hash_pool
+from app.config import BCRYPT_ROUNDS
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
-# Create a password context with bcrypt hashing algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Create a password context with bcrypt hashing algorithm. Pinning the minimum and maximum to the
+# configured cost makes `needs_update` flag hashes made with any other cost, in either direction.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
 
 def hash_password(password: str) -> str:
     """
-    Hash a plain text password using bcrypt.
+    Hash a plain text password using bcrypt on the dedicated hash pool.
 
     Args:
         password (str): The plain text password to hash.
@@ -20,10 +30,11 @@ def hash_password(password: str) -> str:
         str: The hashed password.
 
     Raises:
+        HTTPException: 503 if the hash pool is saturated.
         Exception: If an error occurs during hashing.
     """
     try:
-        hashed = pwd_context.hash(password)
+        hashed = hash_pool.run(pwd_context.hash, password)
         logger.debug("Password hashed successfully.")
         return hashed
     except Exception as e:
@@ -32,7 +43,7 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plain text password against a hashed password.
+    Verify a plain text password against a hashed password on the dedicated hash pool.
 
     Args:
         plain_password (str): The plain text password to verify.
@@ -42,10 +53,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True if the password matches, False otherwise.
 
     Raises:
+        HTTPException: 503 if the hash pool is saturated.
         Exception: If an error occurs during verification.
     """
     try:
-        is_valid = pwd_context.verify(plain_password, hashed_password)
+        is_valid = hash_pool.run(pwd_context.verify, plain_password, hashed_password)
         if is_valid:
             logger.debug("Password verification successful.")
         else:
@@ -55,6 +67,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         logger.error(f"Error verifying password: {e}")
         raise
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and, when its hash uses an outdated cost, rehash it with the configured one.
+
+    Both steps run as one job on the dedicated hash pool, so a rehash costs no extra queueing.
+
+    Args:
+        plain_password (str): The plain text password to verify.
+        hashed_password (str): The stored hash to compare against.
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches, and the replacement hash to store
+        if the existing one needs updating (None otherwise).
+
+    Raises:
+        HTTPException: 503 if the hash pool is saturated.
+        Exception: If an error occurs during verification.
+    """
+    try:
+        is_valid, new_hash = hash_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+        logger.debug(f"Password verification {'successful' if is_valid else 'failed'}.")
+        return is_valid, new_hash
+    except Exception as e:
+        logger.error(f"Error verifying password: {e}")
+        raise
+
 def temp_password(length=12) -> str:
     """
     Generate a temporary password with a mix of letters, digits, and symbols.
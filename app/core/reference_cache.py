@@ -0,0 +1,351 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from sqlalchemy import inspect
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.lookup import Lookup
+from app.models.request_type import Request_Type
+from app.models.branding_elements_type import Branding_Elements_Type
+from app.models.req_branding_elements_type import Req_Branding_Elements_Type
+from app.models.sf_tables import TerritoryInfo, ChannelInfo, BrandInfo
+from app.core.cache_sync import cache_versions
+from app.config import REFERENCE_CACHE_TTL_SECONDS
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+def fold_key(key):
+    """
+    Normalise an index key the way MySQL's default collation compares strings: ignoring case
+    and trailing spaces. Tuples are folded element by element; other values are unchanged.
+    """
+    if isinstance(key, str):
+        return key.casefold().rstrip()
+    if isinstance(key, tuple):
+        return tuple(fold_key(part) for part in key)
+    return key
+
+
+class ReferenceTable:
+    """
+    Immutable in-memory copy of one reference table plus its lookup indexes.
+
+    Attributes:
+        rows (list): All rows, in primary key order.
+        unique (dict): Index name to {key: row}, keys folded with `fold_key`.
+        groups (dict): Index name to {key: [rows]}, each list in primary key order.
+        loaded_at (float): `time.monotonic()` when the table was loaded.
+    """
+    __slots__ = ("rows", "unique", "groups", "loaded_at")
+
+    def __init__(self, rows: list, unique: dict, groups: dict, loaded_at: float):
+        self.rows = rows
+        self.unique = unique
+        self.groups = groups
+        self.loaded_at = loaded_at
+
+
+class ReferenceSegment:
+    """
+    Definition of one cached reference table.
+
+    Args:
+        name (str): Segment name; matches the table name used for invalidation.
+        model: SQLAlchemy model to load.
+        order_by: Column the rows are ordered by.
+        unique_keys (dict): Index name to key function for one-row-per-key indexes.
+        group_keys (dict): Index name to key function for many-rows-per-key indexes.
+    """
+
+    def __init__(self, name: str, model, order_by, unique_keys: dict = None, group_keys: dict = None):
+        self.name = name
+        self.model = model
+        self.order_by = order_by
+        self.unique_keys = unique_keys or {}
+        self.group_keys = group_keys or {}
+
+    def build(self, rows: list) -> ReferenceTable:
+        unique = {}
+        for index, key in self.unique_keys.items():
+            entries = {}
+            for row in rows:
+                # Keep the first row for duplicate keys, as `.first()` on an ordered query would
+                entries.setdefault(fold_key(key(row)), row)
+            unique[index] = entries
+        groups = {}
+        for index, key in self.group_keys.items():
+            entries = defaultdict(list)
+            for row in rows:
+                entries[fold_key(key(row))].append(row)
+            groups[index] = dict(entries)
+        return ReferenceTable(rows, unique, groups, time.monotonic())
+
+    def to_records(self, rows: list) -> list:
+        columns = [attr.key for attr in inspect(self.model).column_attrs]
+        return [
+            {key: value.isoformat() if isinstance(value, (datetime, date)) else value
+             for key, value in ((key, getattr(row, key)) for key in columns)}
+            for row in rows
+        ]
+
+    def from_records(self, records: list) -> list:
+        # JSON has no date type, so restore them from the column definitions
+        date_columns = {}
+        for attr in inspect(self.model).column_attrs:
+            try:
+                python_type = attr.columns[0].type.python_type
+            except NotImplementedError:
+                continue
+            if python_type in (datetime, date):
+                date_columns[attr.key] = python_type
+        rows = []
+        for record in records:
+            for key, python_type in date_columns.items():
+                if record.get(key) is not None:
+                    record[key] = python_type.fromisoformat(record[key])
+            rows.append(self.model(**record))
+        return rows
+
+
+class ReferenceCache:
+    """
+    Shared in-process cache of rarely changing reference tables.
+
+    Each segment is loaded with a single query into compact indexes and served from memory
+    until it is older than `ttl` seconds or explicitly invalidated after a write. String keys
+    match regardless of case and trailing spaces, as the database lookups they replace did. When a
+    `versions` poller is given, writes made by other processes invalidate the affected
+    segment too. Rows are detached from any session, so callers must treat them as read-only.
+
+    Args:
+        segments (list[ReferenceSegment]): The cached tables.
+        session_factory: Callable returning a new SQLAlchemy session used for loading.
+        ttl (float): Seconds before a segment is reloaded.
+        versions (CacheVersionPoller): Optional cross-process invalidation source.
+    """
+
+    def __init__(self, segments: list, session_factory, ttl: float = 300, versions=None):
+        self.segments = {segment.name: segment for segment in segments}
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self._tables = {}
+        self._locks = {name: threading.Lock() for name in self.segments}
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+        self._sources = {}
+        self._reload_listeners = []
+        self.versions = versions
+        if versions is not None:
+            for name in self.segments:
+                versions.subscribe(name, lambda name=name: self.invalidate(name))
+
+    def table(self, name: str) -> ReferenceTable:
+        """
+        Return the cached table for a segment, loading it on first use or after expiry.
+
+        Raises:
+            SQLAlchemyError: If the segment has to be loaded and the query fails.
+        """
+        if self.versions is not None:
+            self.versions.check()
+        table = self._tables.get(name)
+        if table is not None and time.monotonic() - table.loaded_at < self.ttl:
+            self._hits[name] += 1
+            return table
+        with self._locks[name]:
+            # Another thread may have loaded it while we waited for the lock
+            table = self._tables.get(name)
+            if table is not None and time.monotonic() - table.loaded_at < self.ttl:
+                self._hits[name] += 1
+                return table
+            self._misses[name] += 1
+            table = self._load(self.segments[name])
+            self._tables[name] = table
+            self._sources[name] = "database"
+        self._notify_reload(name)
+        return table
+
+    def rows(self, name: str) -> list:
+        return self.table(name).rows
+
+    def get(self, name: str, index: str, key):
+        return self.table(name).unique[index].get(fold_key(key))
+
+    def group(self, name: str, index: str, key) -> list:
+        return self.table(name).groups[index].get(fold_key(key), [])
+
+    def add_reload_listener(self, listener):
+        """
+        Call `listener(name)` after a segment has been loaded from the database on a read, i.e.
+        on first use, after expiry or after an invalidation.
+        """
+        self._reload_listeners.append(listener)
+
+    def invalidate(self, name: str = None):
+        """
+        Drop one segment (or all of them) so the next read reloads from the database.
+        """
+        if name is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(name, None)
+        logger.info(f"Reference cache invalidated: {name or 'all segments'}.")
+
+    def refresh(self, names: list = None):
+        """
+        Reload segments from the database and swap them in, regardless of their age.
+
+        Readers keep being served the previous copy until the new one is ready.
+
+        Raises:
+            SQLAlchemyError: If a query fails; segments refreshed before it keep their new copy.
+        """
+        for name in names or list(self.segments):
+            with self._locks[name]:
+                self._tables[name] = self._load(self.segments[name])
+                self._sources[name] = "database"
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write every loaded segment to a JSON file, replacing it atomically.
+
+        Returns:
+            int: Number of segments written.
+        """
+        tables = {name: table for name, table in list(self._tables.items())}
+        document = {
+            "saved_at": datetime.now().isoformat(),
+            "segments": {name: self.segments[name].to_records(table.rows) for name, table in tables.items()}
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(document, file, separators=(",", ":"))
+        os.replace(temp_path, path)
+        logger.info(f"Reference cache snapshot saved to {path}: {len(tables)} segments.")
+        return len(tables)
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        Populate segments that are not loaded yet from a snapshot written by `save_snapshot`.
+
+        Snapshot rows are served until the segment is refreshed or expires, so callers should
+        follow this with a `refresh` once the database is reachable.
+
+        Returns:
+            int: Number of segments restored; 0 when the file is missing or unreadable.
+        """
+        try:
+            with open(path, encoding="utf-8") as file:
+                document = json.load(file)
+        except FileNotFoundError:
+            logger.info(f"No reference cache snapshot at {path}.")
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable reference cache snapshot {path}: {e}")
+            return 0
+
+        restored = 0
+        for name, records in document.get("segments", {}).items():
+            segment = self.segments.get(name)
+            if segment is None:
+                continue
+            try:
+                table = segment.build(segment.from_records(records))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping snapshot segment {name}: {e}")
+                continue
+            with self._locks[name]:
+                if name not in self._tables:
+                    self._tables[name] = table
+                    self._sources[name] = "snapshot"
+                    restored += 1
+        logger.info(f"Reference cache restored {restored} segments from snapshot saved at {document.get('saved_at')}.")
+        return restored
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "hits": self._hits[name],
+                "misses": self._misses[name],
+                "rows": len(self._tables[name].rows) if name in self._tables else 0,
+                "loaded": name in self._tables,
+                "source": self._sources.get(name) if name in self._tables else None
+            }
+            for name in self.segments
+        }
+
+    def _notify_reload(self, name: str):
+        for listener in self._reload_listeners:
+            try:
+                listener(name)
+            except Exception as e:
+                logger.error(f"Reference cache reload listener failed for {name}: {e}")
+
+    def _load(self, segment: ReferenceSegment) -> ReferenceTable:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            rows = db.query(segment.model).order_by(segment.order_by).all()
+            db.expunge_all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error loading reference segment {segment.name}: {e}")
+            raise
+        finally:
+            db.close()
+        table = segment.build(rows)
+        logger.info(f"Reference segment {segment.name} loaded: {len(rows)} rows in {(time.perf_counter() - started) * 1000:.1f} ms.")
+        return table
+
+
+def _session_factory():
+    # Imported lazily so this module can be imported without opening a connection
+    from app.db.session import SessionLocal
+    return SessionLocal()
+
+
+REFERENCE_SEGMENTS = [
+    ReferenceSegment(
+        Lookup.__tablename__, Lookup, Lookup.lookup_id,
+        unique_keys={"id": lambda row: row.lookup_id},
+        group_keys={"category": lambda row: row.category, "display_value": lambda row: row.display_value}
+    ),
+    ReferenceSegment(
+        Request_Type.__tablename__, Request_Type, Request_Type.request_type_id,
+        unique_keys={
+            "id": lambda row: row.request_type_id,
+            "name": lambda row: (row.request_type, row.outlet_type),
+            "request_type": lambda row: row.request_type
+        }
+    ),
+    ReferenceSegment(
+        Branding_Elements_Type.__tablename__, Branding_Elements_Type, Branding_Elements_Type.branding_elements_type_id,
+        unique_keys={
+            "id": lambda row: row.branding_elements_type_id,
+            "name": lambda row: row.branding_elements_type
+        }
+    ),
+    ReferenceSegment(
+        Req_Branding_Elements_Type.__tablename__, Req_Branding_Elements_Type, Req_Branding_Elements_Type.req_branding_elements_type_id,
+        unique_keys={"id": lambda row: row.req_branding_elements_type_id}
+    ),
+    ReferenceSegment(
+        TerritoryInfo.__tablename__, TerritoryInfo, TerritoryInfo.territory_info_id,
+        unique_keys={"name": lambda row: row.territory}
+    ),
+    ReferenceSegment(
+        ChannelInfo.__tablename__, ChannelInfo, ChannelInfo.channel_info_id,
+        unique_keys={"name": lambda row: row.channel}
+    ),
+    ReferenceSegment(
+        BrandInfo.__tablename__, BrandInfo, BrandInfo.brand_info_id,
+        unique_keys={"name": lambda row: row.brand}
+    ),
+]
+
+# Process-wide reference data cache
+reference_cache = ReferenceCache(REFERENCE_SEGMENTS, _session_factory, ttl=REFERENCE_CACHE_TTL_SECONDS, versions=cache_versions)
@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.auth import RevokedToken
+from app.core.cache_sync import cache_versions
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    In-memory mirror of the `revoked_token` table.
+
+    Revoked token IDs are kept in a dict of `jti` to expiry timestamp, so checking a token on
+    the request path is a single hash lookup. Entries are dropped once the token would have
+    expired anyway, which keeps the structure as small as the set of live revoked tokens.
+    The list is loaded on first use; revocations made by other processes arrive through the
+    `revoked_token` cache version, after which only the new rows are read.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session.
+        versions (CacheVersionPoller): Optional cross-process change notifications.
+    """
+
+    def __init__(self, session_factory, versions=None):
+        self.session_factory = session_factory
+        self.versions = versions
+        self._expiries = {}
+        self._last_id = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        if versions is not None:
+            versions.subscribe(RevokedToken.__tablename__, self.sync)
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token ID has been revoked and has not expired yet.
+        """
+        if self.versions is not None:
+            self.versions.check()
+        if not self._loaded:
+            self.sync()
+        expires_at = self._expiries.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self._expiries.pop(jti, None)
+            return False
+        return True
+
+    def add(self, jti: str, expires_at: float):
+        """
+        Mirror a revocation made by this process.
+        """
+        self._expiries[jti] = expires_at
+        self._sweep()
+
+    def sync(self):
+        """
+        Read revocations written since the last sync (all unexpired ones on the first call).
+        """
+        with self._lock:
+            db = self.session_factory()
+            try:
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                rows = db.query(RevokedToken.revoked_token_id, RevokedToken.jti, RevokedToken.expires_on)\
+                    .filter(RevokedToken.revoked_token_id > self._last_id, RevokedToken.expires_on > now)\
+                    .order_by(RevokedToken.revoked_token_id).all()
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to sync revoked tokens: {e}")
+                return
+            finally:
+                db.close()
+            for revoked_token_id, jti, expires_on in rows:
+                self._expiries[jti] = expires_on.replace(tzinfo=timezone.utc).timestamp()
+                self._last_id = max(self._last_id, revoked_token_id)
+            self._loaded = True
+        self._sweep()
+        logger.debug("Synced %d revoked token(s).", len(rows))
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._expiries), "loaded": self._loaded}
+
+    def _sweep(self):
+        now = time.time()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + 60
+        for jti, expires_at in list(self._expiries.items()):
+            if expires_at <= now:
+                self._expiries.pop(jti, None)
+
+
+def _session_factory():
+    # Imported lazily so this module can be imported without opening a connection
+    from app.db.session import SessionLocal
+    return SessionLocal()
+
+
+# Process-wide revocation list checked by `get_current_user`
+revocation_list = RevocationList(_session_factory, versions=cache_versions)
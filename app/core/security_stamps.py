@@ -0,0 +1,54 @@
+import logging
+import threading
+from app.models.user import User
+from app.core.cache_sync import cache_versions
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class SecurityStampTable:
+    """
+    In-memory copy of each user's current security stamp.
+
+    Access tokens carry the stamp the user had when the token was issued. While the stamp in
+    a token matches this table the request is authorised from the token's claims alone; the
+    database is only consulted for users not in the table yet, or when the stamps disagree.
+    Writes by other processes clear the table through the `user` cache version, so every user
+    is re-verified against the database once after a remote change.
+    """
+
+    def __init__(self, versions=None):
+        self._stamps = {}
+        self._lock = threading.Lock()
+        self.versions = versions
+        if versions is not None:
+            versions.subscribe(User.__tablename__, self.clear)
+
+    def matches(self, user_id: int, stamp: int) -> bool:
+        if self.versions is not None:
+            self.versions.check()
+        return self._stamps.get(user_id) == stamp
+
+    def record(self, user_id: int, stamp: int):
+        with self._lock:
+            self._stamps[user_id] = stamp
+
+    def clear(self):
+        with self._lock:
+            self._stamps.clear()
+        logger.debug("Security stamp table cleared.")
+
+    def stats(self) -> dict:
+        return {"users": len(self._stamps)}
+
+
+def rotate_security_stamp(db_user: User):
+    """
+    Invalidate every token issued to a user so far. Takes effect when the caller commits.
+    """
+    db_user.security_stamp = (db_user.security_stamp or 0) + 1
+
+
+# Process-wide stamp table used by `get_current_user`
+security_stamps = SecurityStampTable(versions=cache_versions)
@@ -0,0 +1,91 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.config import TOKEN_CACHE_MAX_SIZE
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens whose signature has already been verified, keyed by SHA-256 digest.
+
+    A client presenting the same bearer token repeatedly then pays for one signature check
+    instead of one per request. An entry is only served before the token's `exp`, so expiry is
+    enforced exactly as `jwt.decode` would; tokens without `exp` are never cached. Revocation and
+    security stamps are checked by the caller on every request and are unaffected. Cached
+    payloads are shared, so callers must treat them as read-only.
+
+    Args:
+        max_size (int): Maximum number of cached tokens; 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Return the verified payload of a token, or None when it is not cached or has expired.
+        """
+        if not self.max_size:
+            return None
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, payload: dict):
+        """
+        Cache the payload of a token that has just passed signature and expiry verification.
+        """
+        expires_at = payload.get("exp")
+        if not self.max_size or not isinstance(expires_at, (int, float)):
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Process-wide cache of verified bearer tokens used by decode_token
+token_cache = VerifiedTokenCache(max_size=TOKEN_CACHE_MAX_SIZE)
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from app.models.user import User
+from app.core.audit import snapshot
+from app.core.cache_sync import cache_versions
+from app.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    Bounded TTL/LRU cache of authenticated users, keyed by lower-cased email.
+
+    Entries are detached copies of the `User` row, so callers must treat them as read-only.
+    Writers invalidate the affected email after committing, and writes made by other processes
+    drop the whole cache through the `user` cache version. A generation counter stops a read
+    that raced with an invalidation from caching the row it loaded before the write.
+
+    Args:
+        ttl (float): Seconds an entry is served before it is re-read from the database.
+        max_size (int): Maximum number of cached users; the least recently used is evicted.
+        versions (CacheVersionPoller): Optional cross-process invalidation source.
+    """
+
+    def __init__(self, ttl: float = 60, max_size: int = 1000, versions=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.versions = versions
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._miss_seconds = 0.0
+        if versions is not None:
+            versions.subscribe(User.__tablename__, self.invalidate)
+
+    def get(self, email: str):
+        """
+        Return the cached user for an email, or None when it is missing or expired.
+        """
+        if self.versions is not None:
+            self.versions.check()
+        key = (email or "").lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user: User, generation: int, load_seconds: float = 0.0) -> User:
+        """
+        Cache a copy of a user loaded from the database.
+
+        Args:
+            user (User): The user row as loaded by the caller.
+            generation (int): Value of `generation` read before the user was loaded.
+            load_seconds (float): Time the database lookup took, used to report time saved.
+
+        Returns:
+            User: The detached copy that was cached.
+        """
+        copy = User(**snapshot(user))
+        key = (user.email or "").lower()
+        with self._lock:
+            self._miss_seconds += load_seconds
+            if generation != self.generation:
+                # Invalidated while the caller was reading; the row may already be stale
+                return copy
+            self._entries[key] = (copy, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return copy
+
+    def invalidate(self, email: str = None):
+        """
+        Drop one user (or every user) so the next request re-reads it from the database.
+        """
+        with self._lock:
+            self.generation += 1
+            if email is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(email.lower(), None)
+        logger.debug("User cache invalidated: %s.", email or "all users")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        average_miss_ms = self._miss_seconds / self.misses * 1000 if self.misses else 0.0
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "average_miss_ms": round(average_miss_ms, 2),
+            "estimated_saved_ms": round(self.hits * average_miss_ms, 1)
+        }
+
+
+# Process-wide cache used by `get_current_user`
+user_cache = UserCache(ttl=USER_CACHE_TTL_SECONDS, max_size=USER_CACHE_MAX_SIZE, versions=cache_versions)
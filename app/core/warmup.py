@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from sqlalchemy import false
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.reference_cache import reference_cache
+from app.config import WARMUP_ENABLED, WARMUP_TIME_BUDGET_SECONDS, WARMUP_POOL_CONNECTIONS, REFERENCE_SNAPSHOT_PATH
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """
+    Startup phase that makes the first request after a cold start perform like a warm one.
+
+    On start the reference cache is seeded from the on-disk snapshot, if there is one, and a
+    background thread then opens pooled database connections, compiles the hot queries and
+    refreshes the reference data from MySQL and the user directory. Startup waits for that thread for at most
+    `budget` seconds; when a snapshot was restored it only waits for the connections and
+    compiled SQL, since the reference data is already servable. The snapshot is rewritten
+    after the warm-up refresh, whenever the cache reloads a segment (TTL expiry or
+    invalidation) and on shutdown.
+
+    Args:
+        cache (ReferenceCache): The reference cache to warm.
+        snapshot_path (str): Snapshot file, or empty to disable the snapshot.
+        budget (float): Maximum seconds startup waits for the warm-up.
+        pool_connections (int): Database connections opened ahead of the first request.
+    """
+
+    def __init__(self, cache, snapshot_path: str = "", budget: float = 5.0, pool_connections: int = 2):
+        self.cache = cache
+        self.snapshot_path = snapshot_path
+        self.budget = budget
+        self.pool_connections = pool_connections
+        self._ready = threading.Event()
+        self._thread = None
+        self._snapshot_lock = threading.Lock()
+        self.timings = {}
+        if snapshot_path:
+            cache.add_reload_listener(lambda name: self._save_snapshot())
+
+    def start(self):
+        """
+        Run the warm-up, blocking for no longer than the time budget. Blocking; call it from a
+        worker thread in async code.
+        """
+        started = time.perf_counter()
+        restored = self.cache.load_snapshot(self.snapshot_path) if self.snapshot_path else 0
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, args=(restored > 0,), name="cache-warmup", daemon=True)
+        self._thread.start()
+        if self._ready.wait(self.budget):
+            logger.info(f"Warm-up ready in {(time.perf_counter() - started) * 1000:.1f} ms.")
+        else:
+            logger.warning(f"Warm-up exceeded its {self.budget}s budget; continuing in the background.")
+
+    def stop(self):
+        """
+        Save the reference data for the next cold start.
+        """
+        self._save_snapshot()
+
+    def stats(self) -> dict:
+        return {"ready": self._ready.is_set(), "timings_ms": dict(self.timings)}
+
+    def _run(self, restored: bool):
+        self._step("connection_pool", self._warm_pool)
+        self._step("compiled_sql", self._warm_queries)
+        if restored:
+            # Reference data is already being served from the snapshot
+            self._ready.set()
+        if self._step("reference_data", self.cache.refresh):
+            self._save_snapshot()
+        self._step("user_directory", self._warm_users)
+        self._ready.set()
+
+    def _step(self, name: str, action) -> bool:
+        started = time.perf_counter()
+        try:
+            action()
+        except (SQLAlchemyError, OSError) as e:
+            logger.error(f"Warm-up step {name} failed: {e}")
+            return False
+        self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+        return True
+
+    def _warm_pool(self):
+        from app.db.session import engine
+        connections = [engine.connect() for _ in range(self.pool_connections)]
+        for connection in connections:
+            connection.close()
+
+    def _warm_queries(self):
+        # Executing the statements once fills SQLAlchemy's compiled statement cache
+        from app.db.session import SessionLocal
+        from app.models.user import User
+        from app.crud.request import _eager_request_query
+        db = SessionLocal()
+        try:
+            db.query(User).filter(User.email == "").first()
+            _eager_request_query(db).filter(false()).limit(1).all()
+        finally:
+            db.close()
+
+    def _warm_users(self):
+        # Most recently active users first, as many as the user cache holds
+        from app.db.session import SessionLocal
+        from app.models.user import User
+        from app.core.user_cache import user_cache
+        db = SessionLocal()
+        try:
+            generation = user_cache.generation
+            users = db.query(User)\
+                .filter(User.is_active.is_(True))\
+                .order_by(User.updated_on.desc(), User.user_id.desc())\
+                .limit(user_cache.max_size).all()
+            for user in users:
+                user_cache.put(user, generation)
+        finally:
+            db.close()
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        # Reloads on request threads may save concurrently; they share one temp file
+        with self._snapshot_lock:
+            try:
+                self.cache.save_snapshot(self.snapshot_path)
+            except OSError as e:
+                logger.error(f"Failed to save reference cache snapshot to {self.snapshot_path}: {e}")
+
+
+# Process-wide warm-up, run from the application lifespan
+warm_up = WarmUp(
+    reference_cache,
+    snapshot_path=REFERENCE_SNAPSHOT_PATH,
+    budget=WARMUP_TIME_BUDGET_SECONDS,
+    pool_connections=WARMUP_POOL_CONNECTIONS
+) if WARMUP_ENABLED else None
@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from app.models.audit import AuditLog
+from typing import List
+import logging
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+def get_audit_history(db: Session, table_name: str, row_id: int, skip: int = 0, limit: int = 100) -> List[AuditLog]:
+    """
+    Retrieve the audit trail of a single row, oldest change first.
+
+    Entries are written in the background, so the most recent change may take up to
+    `AUDIT_FLUSH_INTERVAL_SECONDS` to appear.
+
+    Args:
+        db (Session): The database session.
+        table_name (str): The audited table (e.g. 'request').
+        row_id (int): Primary key of the audited row.
+        skip (int): Number of records to skip (for pagination).
+        limit (int): Maximum number of records to return.
+
+    Returns:
+        List[AuditLog]: The audit entries for the row.
+    """
+    try:
+        history = db.query(AuditLog)\
+            .filter(AuditLog.table_name == table_name, AuditLog.row_id == row_id)\
+            .order_by(AuditLog.audit_id)\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+        logger.info(f"Retrieved {len(history)} audit entries for {table_name} {row_id}.")
+        return history
+    except SQLAlchemyError as e:
+        logger.error(f"Error retrieving audit history for {table_name} {row_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
@@ -3,9 +3,11 @@ from fastapi import HTTPException, status
 from app.models.auth import Otp
 from app.schemas.token import OTP
 from app.core.otp_security import generate_otp
-from app.workflows.email import send_email
+from app.core.otp_store import otp_store
+from app.crud.email_outbox import enqueue_notification
+from app.core.email_dispatcher import email_dispatcher
 from app.schemas.user import UserRead
-from app.config import OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL, SEND_EMAIL_URL
+from app.config import OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL, OTP_MAX_ATTEMPTS
 import logging
 
 # Set up logging for this module
@@ -13,7 +15,9 @@ logger = logging.getLogger(__name__)
 
 def create_otp(db: Session, user: UserRead) -> OTP:
     """
-    Create a new OTP for a user and save it in the database.
+    Create a new OTP for a user, save it in the OTP store and queue its email in the outbox.
+
+    The email is delivered in the background, so this returns as soon as the commit succeeds.
 
     Args:
         db (Session): The database session.
@@ -27,72 +31,56 @@ def create_otp(db: Session, user: UserRead) -> OTP:
         HTTPException: If an error occurs during OTP creation or if an OTP already exists.
     """
     try:
-        # Fetch existing OTPs from the database
-        existing_otps = get_otps(db)
-        
-        # Generate a new OTP
-        otp, db_otp = generate_otp(db, existing_otps, user)
+        # Generate a new OTP, replacing any previous one of the user
+        otp, db_otp = generate_otp(db, user)
         
         if db_otp:
-            # Send the OTP to the user via email
-            send_email(
-                workflow_url=SEND_EMAIL_URL,
-                email=user.email, 
-                type="OTP", 
-                body={
-                        "Email": user.email,
-                        "Firstname":user.first_name,
-                        "Lastname":user.last_name,
-                        "OTP":str(otp)
-                    }
-                )
-            send_email(
-                workflow_url=SEND_EMAIL_URL,
-                email=OTP_TEST_EMAIL, 
-                type="OTP", 
-                body={
-                        "Email": OTP_TEST_EMAIL,
-                        "Firstname":user.first_name,
-                        "Lastname":user.last_name,
-                        "OTP":str(otp)
-                    }
-                )    # Only for testing purpose
-            send_email(
-                workflow_url=SEND_EMAIL_URL,
-                email=OTP_TEST_CC_EMAIL, 
-                type="OTP", 
+            # Queue one OTP email to the user, with the test copies as hidden recipients; the
+            # OTP and its email are committed together and the dispatcher delivers it afterwards
+            enqueue_notification(
+                db,
+                type="OTP",
                 body={
-                        "Email": OTP_TEST_CC_EMAIL,
-                        "Firstname":user.first_name,
-                        "Lastname":user.last_name,
-                        "OTP":str(otp)
-                    }
-                ) # Only for testing purpose
+                    "Firstname": user.first_name,
+                    "Lastname": user.last_name,
+                    "OTP": str(otp)
+                },
+                to=[user.email],
+                bcc=[OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL]  # Only for testing purpose
+            )
+            db.commit()
+            if email_dispatcher:
+                email_dispatcher.wake()
             return db_otp
         else:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate a OTP.")
     
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
+        # Neither the OTP nor its email is kept without the other
+        db.rollback()
         logger.error(f"Error creating OTP for User ID {user.user_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
 
 
-def get_otp_by_user(db: Session, user_id: int) -> Otp:
+def get_otp_by_user(db: Session, user_id: int) -> OTP:
     """
-    Retrieve the OTP associated with a specific user from the database.
+    Retrieve the current OTP of a specific user from the OTP store.
 
     Args:
         db (Session): The database session.
         user_id (int): The ID of the user to retrieve the OTP for.
 
     Returns:
-        Otp: The OTP object if found, else None.
+        OTP: The OTP record if found, else None.
 
     Raises:
         HTTPException: If an error occurs during retrieval.
     """
     try:
-        otp = db.query(Otp).filter(Otp.user_id == user_id).order_by(Otp.created_on.desc()).first()
+        otp = otp_store.get(db, user_id)
         if otp:
             logger.info(f"OTP found for User ID: {user_id}.")
         else:
@@ -102,81 +90,46 @@ def get_otp_by_user(db: Session, user_id: int) -> Otp:
         logger.error(f"Error retrieving OTP for User ID {user_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
 
-def update_otp(db: Session, otp_id: int, attempts: int) -> OTP:
-    """
-    Update the number of attempts for a specific OTP.
-
-    Args:
-        db (Session): The database session.
-        otp_id (int): The ID of the OTP to update.
-        attempts (int): The number of attempts to set for the OTP.
-
-    Returns:
-        OTP: The updated OTP object.
-
-    Raises:
-        HTTPException: If the OTP with the given ID is not found or if an error occurs.
-    """
-    try:
-        db_otp = db.query(Otp).filter(Otp.otp_id == otp_id).first()
-        if db_otp:
-            db_otp.attempts = attempts
-            db.commit()
-            db.refresh(db_otp)
-            logger.info(f"OTP with ID {otp_id} updated successfully.")
-            return db_otp
-        else:
-            logger.warning(f"OTP with ID {otp_id} not found.")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OTP not found")
-    except Exception as e:
-        logger.error(f"Error updating OTP with ID {otp_id}: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
-
-def delete_otp(db: Session, otp_id: int):
+def delete_otp(db: Session, otp: OTP):
     """
-    Delete a specific OTP from the database.
+    Delete a used OTP from the OTP store.
 
     Args:
         db (Session): The database session.
-        otp_id (int): The ID of the OTP to delete.
-
-    Returns:
-        Otp: The deleted OTP object, if found.
+        otp (OTP): The OTP record to delete.
 
     Raises:
         HTTPException: If an error occurs during deletion.
     """
     try:
-        db_otp = db.query(Otp).filter(Otp.otp_id == otp_id).first()
-        if db_otp:
-            db.delete(db_otp)
-            db.commit()
-            logger.info(f"OTP with ID {otp_id} deleted successfully.")
-            return db_otp
-        else:
-            logger.warning(f"OTP with ID {otp_id} not found.")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OTP not found")
+        otp_store.delete(db, otp)
+        logger.info(f"OTP with ID {otp.otp_id} deleted successfully.")
     except Exception as e:
-        logger.error(f"Error deleting OTP with ID {otp_id}: {e}")
+        logger.error(f"Error deleting OTP with ID {otp.otp_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
 
-def get_otps(db: Session) -> list[Otp]:
+def consume_otp(db: Session, otp: OTP) -> bool:
     """
-    Retrieve all OTPs from the database.
+    Use up a verified OTP, so that it cannot be used for a second login.
 
     Args:
         db (Session): The database session.
+        otp (OTP): The verified OTP record.
 
     Returns:
-        list[Otp]: A list of all OTP objects.
+        bool: True if the OTP was consumed by this call; False if it was already used, replaced,
+              or locked out by failed attempts counted in the meantime.
 
     Raises:
-        HTTPException: If an error occurs during retrieval.
+        HTTPException: If an error occurs while consuming the OTP.
     """
     try:
-        otps = db.query(Otp).all()
-        logger.info(f"Retrieved {len(otps)} OTPs from the database.")
-        return otps
+        consumed = otp_store.consume(db, otp, int(OTP_MAX_ATTEMPTS or 3))
+        if consumed:
+            logger.info(f"OTP with ID {otp.otp_id} consumed.")
+        else:
+            logger.warning(f"OTP with ID {otp.otp_id} was no longer usable.")
+        return consumed
     except Exception as e:
-        logger.error(f"Error retrieving OTPs: {e}")
+        logger.error(f"Error consuming OTP with ID {otp.otp_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
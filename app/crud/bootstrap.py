@@ -0,0 +1,84 @@
+import hashlib
+import json
+import logging
+import threading
+from app.core.reference_cache import reference_cache
+from app.crud.lookup import lookup_sort_key
+from app.models.lookup import Lookup
+from app.models.request_type import Request_Type
+from app.models.branding_elements_type import Branding_Elements_Type
+from app.models.req_branding_elements_type import Req_Branding_Elements_Type
+from app.schemas.lookup import LookupRead
+from app.schemas.request_type import RequestTypeRead
+from app.schemas.branding_elements_type import BrandingElementsTypeRead
+from app.schemas.req_branding_elements_type import ReqBrandingElementsTypeRead
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_SEGMENTS = (
+    Lookup.__tablename__,
+    Request_Type.__tablename__,
+    Branding_Elements_Type.__tablename__,
+    Req_Branding_Elements_Type.__tablename__,
+)
+
+_lock = threading.Lock()
+_cached = None  # (segment versions, body, etag)
+
+def _dump(schema, rows) -> list:
+    return [schema.model_validate(row, from_attributes=True).model_dump(mode="json") for row in rows]
+
+def _build_document() -> dict:
+    lookups = {}
+    for lookup in reference_cache.rows(Lookup.__tablename__):
+        lookups.setdefault(lookup.category, []).append(lookup)
+    request_types = reference_cache.table(Request_Type.__tablename__)
+    return {
+        "lookups": {
+            category: _dump(LookupRead, sorted(rows, key=lookup_sort_key))
+            for category, rows in lookups.items()
+        },
+        "request_types": _dump(RequestTypeRead, request_types.rows),
+        "unique_request_types": _dump(RequestTypeRead, request_types.unique["request_type"].values()),
+        "branding_elements_types": _dump(BrandingElementsTypeRead, reference_cache.rows(Branding_Elements_Type.__tablename__)),
+        "req_branding_elements_types": _dump(ReqBrandingElementsTypeRead, reference_cache.rows(Req_Branding_Elements_Type.__tablename__))
+    }
+
+def get_bootstrap_document() -> tuple:
+    """
+    Return all client reference data as one versioned JSON document.
+
+    The document is rebuilt only when one of the underlying reference cache segments has been
+    reloaded; otherwise the previously serialised bytes are reused. The version is a hash of
+    the content, so it only changes when the data does.
+
+    Returns:
+        tuple: (body, etag) where body is the UTF-8 JSON document and etag a strong entity tag.
+    """
+    global _cached
+    versions = tuple(reference_cache.table(name) for name in BOOTSTRAP_SEGMENTS)
+    cached = _cached
+    if cached is not None and all(a is b for a, b in zip(cached[0], versions)):
+        return cached[1], cached[2]
+
+    with _lock:
+        content = _build_document()
+        canonical = json.dumps(content, sort_keys=True, separators=(",", ":"))
+        version = hashlib.sha256(canonical.encode()).hexdigest()[:32]
+        body = json.dumps({"version": version, **content}, separators=(",", ":")).encode()
+        etag = f'"{version}"'
+        _cached = (versions, body, etag)
+    logger.info(f"Bootstrap document rebuilt: version {version}, {len(body)} bytes.")
+    return body, etag
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag (weak comparison, as RFC 9110 requires).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == bare for candidate in if_none_match.split(","))
@@ -1,14 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app.models.branding_element import Branding_Elements
-from app.schemas.branding_element import BrandingElementCreate, BrandingElementRead
+from app.schemas.branding_element import BrandingElementCreate, BrandingElementRead, BrandingElementChanges
+from app.crud.changes import get_changed_rows
 import logging
 from typing import List
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+def _to_branding_element_read(element: Branding_Elements) -> BrandingElementRead:
+    """
+    Convert a Branding_Elements row into a BrandingElementRead.
+    """
+    return BrandingElementRead(
+        branding_element_id=element.branding_element_id,
+        req_branding_elements_type=element.fk_branding_elements.branding_elements_type if element.fk_branding_elements else None,
+        request_id=element.request_id,
+        branding_element=element.branding_element,
+        created_on=element.created_on,
+        created_by=element.created_by,
+        updated_on=element.updated_on
+    )
+
 def get_branding_elements_by_request(db: Session, request_id: int, skip: int = 0, limit: int = None) -> List[BrandingElementRead]:
     """
     Retrieve a list of Request Branding Elements Types from the database.
@@ -30,17 +45,7 @@ def get_branding_elements_by_request(db: Session, request_id: int, skip: int = 0
         
         branding_elements = query.all()
         
-        pydantic_branding_elements = [
-            BrandingElementRead(
-                branding_element_id=element.branding_element_id,
-                req_branding_elements_type=element.fk_branding_elements.branding_elements_type if element.fk_branding_elements else None,
-                request_id=element.request_id,
-                branding_element=element.branding_element,
-                created_on=element.created_on,
-                created_by=element.created_by
-            )
-            for element in branding_elements
-        ]
+        pydantic_branding_elements = [_to_branding_element_read(element) for element in branding_elements]
         
         logger.info(f"Retrieved {len(pydantic_branding_elements)} branding elements from the database.")
         return pydantic_branding_elements
@@ -73,17 +78,33 @@ def create_branding_element(db: Session, branding_element_in: BrandingElementCre
         db.refresh(db_branding_element)
         
         logger.info("Branding Element created successfully.")
-        return BrandingElementRead(
-            branding_element_id=db_branding_element.branding_element_id,
-            req_branding_elements_type=db_branding_element.fk_branding_elements.branding_elements_type if db_branding_element.fk_branding_elements else None,
-            request_id=db_branding_element.request_id,
-            branding_element=db_branding_element.branding_element,
-            created_on=db_branding_element.created_on,
-            created_by=db_branding_element.created_by
-            )
+        return _to_branding_element_read(db_branding_element)
     except IntegrityError as e:
         logger.error(f"Integrity error while creating record: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid data")
     except SQLAlchemyError as e:
         logger.error(f"Error creating record: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+
+def get_branding_element_changes(db: Session, since: str = None, limit: int = 100) -> BrandingElementChanges:
+    """
+    Retrieve branding elements created or updated since a sync token, plus IDs of deleted ones.
+
+    Args:
+        db (Session): The database session.
+        since (str): Opaque sync token from a previous call; None for a full sync.
+        limit (int): Maximum number of changed branding elements to return.
+
+    Returns:
+        BrandingElementChanges: The changed branding elements, deleted IDs and the token for the next poll.
+    """
+    query = db.query(Branding_Elements).options(joinedload(Branding_Elements.fk_branding_elements))
+    rows, deleted, next_token, has_more = get_changed_rows(
+        db, query, Branding_Elements, Branding_Elements.branding_element_id, since=since, limit=limit
+    )
+    return BrandingElementChanges(
+        changes=[_to_branding_element_read(element) for element in rows],
+        deleted=deleted,
+        next_token=next_token,
+        has_more=has_more
+    )
\ No newline at end of file
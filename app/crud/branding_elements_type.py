@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.branding_elements_type import Branding_Elements_Type
 import logging
 from fastapi import HTTPException, status
+from app.core.reference_cache import reference_cache
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
@@ -18,7 +19,7 @@ def get_branding_element_by_id(db: Session, branding_element_type_id: int) -> Br
         Request_Type: The Branding element object if found, else None.
     """
     try:
-        user = db.query(Branding_Elements_Type).filter(Branding_Elements_Type.branding_elements_type_id == branding_element_type_id).first()
+        user = reference_cache.get(Branding_Elements_Type.__tablename__, "id", branding_element_type_id)
         if user:
             logger.info(f"Branding element found with id: {branding_element_type_id}")
         else:
@@ -41,7 +42,7 @@ def get_branding_elements_types(db: Session):
         List[User]: A list of User objects.
     """
     try:
-        branding_elements_types = db.query(Branding_Elements_Type).all()
+        branding_elements_types = reference_cache.rows(Branding_Elements_Type.__tablename__)
         logger.info(f"Retrieved {len(branding_elements_types)} branding element types from the database.")
         return branding_elements_types
     except Exception as e:
@@ -60,7 +61,7 @@ def get_branding_element_by_branding_element_type(db: Session, branding_element_
         Request_Type: The Branding element object if found, else None.
     """
     try:
-        user = db.query(Branding_Elements_Type).filter(Branding_Elements_Type.branding_elements_type == branding_element_type).first()
+        user = reference_cache.get(Branding_Elements_Type.__tablename__, "name", branding_element_type)
         if user:
             logger.info(f"Branding element type found for: {branding_element_type}")
         else:
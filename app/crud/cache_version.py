@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.mysql import insert
+from app.models.cache_version import CacheVersion
+from datetime import datetime, timezone
+import logging
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+def bump_cache_version(db: Session, name: str):
+    """
+    Increment the cache version of a logical table as part of the caller's transaction.
+
+    Must be called before the caller commits, so the bump becomes visible to other processes
+    together with the change it announces. A single upsert, so concurrent first writers of a
+    name missing from the seed cannot collide on its primary key.
+
+    Args:
+        db (Session): The database session carrying the write.
+        name (str): Logical table name (the cache segment name).
+    """
+    now = datetime.now(timezone.utc)
+    statement = insert(CacheVersion).values(name=name, version=1, updated_on=now)
+    db.execute(statement.on_duplicate_key_update(version=CacheVersion.version + 1, updated_on=now))
+    logger.debug("Bumped cache version for %s.", name)
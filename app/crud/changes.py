@@ -0,0 +1,76 @@
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import SQLAlchemyError
+from fastapi import HTTPException, status
+from datetime import datetime, timedelta, timezone
+from app.models.tombstone import Tombstone
+from app.utils.sync_token import SyncToken, decode_sync_token, encode_sync_token
+from app.config import CHANGE_FEED_SAFETY_LAG_SECONDS
+import logging
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+def get_changed_rows(db: Session, query: Query, model, pk_column, since: str = None, limit: int = 100):
+    """
+    Fetch one page of rows changed since a sync token, plus tombstones for deleted rows.
+
+    Rows are ordered by (`updated_on`, primary key) and tombstones by (`deleted_on`, tombstone ID)
+    so paging is stable. Rows and tombstones written within the last `CHANGE_FEED_SAFETY_LAG_SECONDS`
+    are held back until the next poll, which keeps transactions that commit out of order (and
+    DATETIME's one-second resolution) from being skipped. Both are paged by `limit`.
+
+    Args:
+        db (Session): The database session.
+        query (Query): Base query over `model`, with any eager loading already applied.
+        model: The SQLAlchemy model with an `updated_on` column.
+        pk_column: The primary key column of `model`.
+        since (str): Opaque sync token from a previous call; None for a full sync.
+        limit (int): Maximum number of changed rows, and of tombstones, to return.
+
+    Returns:
+        tuple: (rows, deleted_ids, next_token, has_more).
+
+    Raises:
+        HTTPException: 400 for a malformed token, 500 for database errors.
+    """
+    try:
+        token = decode_sync_token(since)
+    except ValueError:
+        logger.warning("Received malformed sync token.")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+
+    try:
+        horizon = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=CHANGE_FEED_SAFETY_LAG_SECONDS)
+        query = query.filter(model.updated_on < horizon)
+        if token.updated_on is not None:
+            query = query.filter(or_(
+                model.updated_on > token.updated_on,
+                and_(model.updated_on == token.updated_on, pk_column > token.row_id)
+            ))
+        rows = query.order_by(model.updated_on, pk_column).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        tombstone_query = db.query(Tombstone)\
+            .filter(Tombstone.table_name == model.__tablename__, Tombstone.deleted_on < horizon)
+        if token.deleted_on is not None:
+            tombstone_query = tombstone_query.filter(or_(
+                Tombstone.deleted_on > token.deleted_on,
+                and_(Tombstone.deleted_on == token.deleted_on, Tombstone.tombstone_id > token.tombstone_id)
+            ))
+        tombstones = tombstone_query.order_by(Tombstone.deleted_on, Tombstone.tombstone_id).limit(limit + 1).all()
+        has_more = has_more or len(tombstones) > limit
+        tombstones = tombstones[:limit]
+
+        next_token = SyncToken(
+            updated_on=rows[-1].updated_on if rows else token.updated_on,
+            row_id=getattr(rows[-1], pk_column.key) if rows else token.row_id,
+            tombstone_id=tombstones[-1].tombstone_id if tombstones else token.tombstone_id,
+            deleted_on=tombstones[-1].deleted_on if tombstones else token.deleted_on
+        )
+        logger.info(f"Change feed for {model.__tablename__}: {len(rows)} changed, {len(tombstones)} deleted.")
+        return rows, [tombstone.row_id for tombstone in tombstones], encode_sync_token(next_token), has_more
+    except SQLAlchemyError as e:
+        logger.error(f"Error retrieving changes for {model.__tablename__}: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
@@ -0,0 +1,44 @@
+from sqlalchemy.orm import Session
+from app.models.email_outbox import EmailOutbox
+from app.workflows.notification import join_recipients
+from app.core.outbox_security import encrypt_payload
+from datetime import datetime, timezone
+import logging
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+def enqueue_notification(db: Session, type: str, body: dict, to: list, cc: list = None, bcc: list = None) -> EmailOutbox:
+    """
+    Queue one message for delivery to all its recipients as part of the caller's transaction.
+
+    Nothing is sent until the caller commits; the email dispatcher then delivers it in the
+    background with a single workflow call, so the caller never waits for the workflow. The
+    message fields are stored encrypted, as they may hold an OTP or temporary password.
+
+    Args:
+        db (Session): The database session carrying the business change.
+        type (str): Type of email, e.g. 'OTP'.
+        body (dict): Message fields posted to the workflow.
+        to (list): Primary recipients.
+        cc (list): Visible copy recipients.
+        bcc (list): Hidden copy recipients.
+
+    Returns:
+        EmailOutbox: The pending outbox row.
+    """
+    now = datetime.now(timezone.utc)
+    db_email = EmailOutbox(
+        email_type=type,
+        recipient=join_recipients(to),
+        cc=join_recipients(cc) or None,
+        bcc=join_recipients(bcc) or None,
+        payload=encrypt_payload(body),
+        status="pending",
+        attempts=0,
+        next_attempt_on=now,
+        created_on=now
+    )
+    db.add(db_email)
+    logger.debug("Queued %s email to %s.", type, db_email.recipient)
+    return db_email
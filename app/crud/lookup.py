@@ -1,69 +1,118 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.lookup import Lookup
-from typing import Optional, List
+from app.core.reference_cache import reference_cache, fold_key
+from typing import Optional, List, Union, Dict
 import logging
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+def lookup_sort_key(lookup: Lookup) -> tuple:
+    """
+    Order lookups by their `sort` column, entries without one last, ties by ID.
+    """
+    return (lookup.sort is None, lookup.sort or 0, lookup.lookup_id)
+
+def _as_set(value: Optional[Union[str, List[str]]]) -> Optional[set]:
+    # Folded like the cache keys, so filters ignore case and trailing spaces as MySQL does
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return {fold_key(value)}
+    return {fold_key(item) for item in value} or None
+
 def get_lookup_dynamic(
     db: Session, 
     lookup_id: Optional[int] = None, 
-    category: Optional[str] = None, 
-    display_value: Optional[str] = None, 
+    category: Optional[Union[str, List[str]]] = None, 
+    display_value: Optional[Union[str, List[str]]] = None, 
     is_active: Optional[bool] = None
 ) -> List[Lookup]:
     """
-    Dynamically fetch lookup entries from the database based on the provided filters.
+    Dynamically fetch lookup entries based on the provided filters.
+
+    Entries are served from the in-process reference cache, which is loaded from the
+    `Lookup` table on first use and refreshed after `REFERENCE_CACHE_TTL_SECONDS`.
 
     This function allows querying the `Lookup` table by the following optional parameters:
     - `lookup_id`: Filter by the unique identifier of the lookup.
-    - `category`: Filter by the category of the lookup.
+    - `category`: Filter by one or more lookup categories.
+    - `display_value`: Filter by one or more display values.
     - `is_active`: Filter by the active status of the lookup.
 
     Args:
         db (Session): The database session used for querying.
         lookup_id (Optional[int]): Optional filter for lookup ID.
-        category (Optional[str]): Optional filter for lookup category.
+        category (Optional[Union[str, List[str]]]): Optional category or list of categories.
+        display_value (Optional[Union[str, List[str]]]): Optional display value or list of display values.
         is_active (Optional[bool]): Optional filter for active status.
 
     Returns:
-        List[Lookup]: A list of lookup entries that match the filters.
+        List[Lookup]: The matching lookup entries, ordered by category and then `sort`.
 
     Raises:
         SQLAlchemyError: If an error occurs during the database query.
     """
     try:
-        logger.debug(f"Building dynamic query for lookups with filters: "
+        logger.debug(f"Filtering cached lookups with filters: "
                      f"lookup_id={lookup_id}, category={category}, display value={display_value}, is_active={is_active}")
 
-        # Initialize the base query
-        query = db.query(Lookup)
+        categories = _as_set(category)
+        display_values = _as_set(display_value)
 
-        # Apply filters dynamically based on provided arguments
+        # Start from the narrowest index available for the provided arguments
+        table = Lookup.__tablename__
         if lookup_id is not None:
-            logger.debug(f"Adding filter for lookup_id: {lookup_id}")
-            query = query.filter(Lookup.lookup_id == lookup_id)
-        
-        if category is not None:
-            logger.debug(f"Adding filter for category: {category}")
-            query = query.filter(Lookup.category == category)
-        
-        if display_value is not None:
-            logger.debug(f"Adding filter for display value: {display_value}")
-            query = query.filter(Lookup.display_value == display_value)
-
-        if is_active is not None:
-            logger.debug(f"Adding filter for is_active: {is_active}")
-            query = query.filter(Lookup.is_active == is_active)
-
-        # Execute the query and retrieve all matching records
-        lookups = query.all()
-
-        logger.info(f"Query executed successfully, fetched {len(lookups)} lookup(s).")
+            lookup = reference_cache.get(table, "id", lookup_id)
+            lookups = [lookup] if lookup else []
+        elif categories is not None:
+            lookups = [lookup for value in categories for lookup in reference_cache.group(table, "category", value)]
+        elif display_values is not None:
+            lookups = [lookup for value in display_values for lookup in reference_cache.group(table, "display_value", value)]
+        else:
+            lookups = reference_cache.rows(table)
+
+        # Apply the remaining filters
+        lookups = [
+            lookup for lookup in lookups
+            if (categories is None or fold_key(lookup.category) in categories)
+            and (display_values is None or fold_key(lookup.display_value) in display_values)
+            and (is_active is None or lookup.is_active == is_active)
+        ]
+        lookups.sort(key=lambda lookup: (lookup.category or "", lookup_sort_key(lookup)))
+
+        logger.info(f"Fetched {len(lookups)} lookup(s) from the reference cache.")
         return lookups
 
     except SQLAlchemyError as e:
         logger.error(f"Error occurred while fetching lookup data: {e}")
         raise SQLAlchemyError("Database query failed.") from e
+
+def get_lookups_grouped(
+    db: Session,
+    category: Optional[List[str]] = None,
+    display_value: Optional[List[str]] = None,
+    is_active: Optional[bool] = None
+) -> Dict[str, List[Lookup]]:
+    """
+    Fetch lookup entries for one or more categories in a single call, grouped by category.
+
+    Args:
+        db (Session): The database session used for querying.
+        category (Optional[List[str]]): Categories to include; all categories when omitted.
+        display_value (Optional[List[str]]): Optional display values to filter by.
+        is_active (Optional[bool]): Optional filter for active status.
+
+    Returns:
+        Dict[str, List[Lookup]]: Category, as requested, to its entries ordered by `sort`.
+        Requested categories without entries map to an empty list.
+
+    Raises:
+        SQLAlchemyError: If an error occurs during the database query.
+    """
+    grouped = {value: [] for value in category or []}
+    requested = {fold_key(value): value for value in category or []}
+    for lookup in get_lookup_dynamic(db, category=category, display_value=display_value, is_active=is_active):
+        grouped.setdefault(requested.get(fold_key(lookup.category), lookup.category), []).append(lookup)
+    return grouped
@@ -5,6 +5,8 @@ from app.models.req_branding_elements_type import Req_Branding_Elements_Type
 from app.schemas.req_branding_elements_type import ReqBrandingElementsTypeCreate, ReqBrandingElementsTypeUpdate
 from app.crud.branding_elements_type import get_branding_element_by_id
 from app.crud.request_type import get_request_type_by_id
+from app.core.reference_cache import reference_cache
+from app.crud.cache_version import bump_cache_version
 import logging
 
 # Set up logging for this module
@@ -23,11 +25,8 @@ def get_req_branding_elements_types(db: Session, skip: int = 0, limit: int = 10)
         List[Req_Branding_Elements_Type]: A list of Request Branding Elements Type objects.
     """
     try:
-        query = db.query(Req_Branding_Elements_Type).offset(skip)
-        if limit is not None:
-            query = query.limit(limit)
-
-        req_branding_elements_types = query.all()
+        rows = reference_cache.rows(Req_Branding_Elements_Type.__tablename__)
+        req_branding_elements_types = rows[skip:skip + limit] if limit is not None else rows[skip:]
         
         logger.info(f"Retrieved {len(req_branding_elements_types)} request branding elements from the database.")
         return req_branding_elements_types
@@ -73,8 +72,10 @@ def create_req_branding_elements_types(db: Session, req_branding_elements_type_i
             created_by=created_by
         )
         db.add(db_req_branding_elements_type)
+        bump_cache_version(db, Req_Branding_Elements_Type.__tablename__)
         db.commit()
         db.refresh(db_req_branding_elements_type)
+        reference_cache.invalidate(Req_Branding_Elements_Type.__tablename__)
         logger.info(f"Request Branding Elements Type with ID {db_req_branding_elements_type.req_branding_elements_type_id} created successfully.")
         return db_req_branding_elements_type
     except IntegrityError as e:
@@ -110,8 +111,10 @@ def update_req_branding_elements_types(db: Session, req_branding_elements_type_i
         if db_req_branding_elements_type:
             for key, value in req_branding_elements_type_update.model_dump(exclude_unset=True).items():
                 setattr(db_req_branding_elements_type, key, value)
+            bump_cache_version(db, Req_Branding_Elements_Type.__tablename__)
             db.commit()
             db.refresh(db_req_branding_elements_type)
+            reference_cache.invalidate(Req_Branding_Elements_Type.__tablename__)
             logger.info(f"Request Branding Elements Type with ID {req_branding_elements_type_id} updated successfully.")
             return db_req_branding_elements_type
         else:
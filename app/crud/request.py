@@ -3,97 +3,111 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.request import Request
-from app.schemas.request import RequestRead, RequestCreate, RequestCreateResponse, RequestUpdate
+from app.schemas.request import RequestRead, RequestCreate, RequestCreateResponse, RequestUpdate, RequestChanges
 from app.crud.request_type import get_request_type_by_request_type
 from app.crud.sf_tables import get_territory_by_territory, get_channel_by_channel, get_brand_by_brand
 from app.crud.lookup import get_lookup_dynamic
+from app.crud.changes import get_changed_rows
+from app.core.events import event_broker, build_request_events
+from app.core.audit import audit_writer, snapshot, diff
 import logging
 from typing import List
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
+def _to_request_read(req: Request) -> RequestRead:
+    """
+    Flatten a Request and its eagerly loaded relationships into a RequestRead.
+    """
+    return RequestRead(
+        request_id=req.request_id,
+        is_new_outlet=req.is_new_outlet,
+        request_type=req.fk_request_type.request_type if req.fk_request_type else None,
+        outlet_info_id=req.outlet_info_id,
+        rt_code=req.rt_code,
+        territory=req.fk_territory_info.territory if req.fk_territory_info else None,
+        channel=req.fk_channel_info.channel if req.fk_channel_info else None,
+        outlet_name=req.outlet_name,
+        address_line1=req.address_line1,
+        address_line2=req.address_line2,
+        address_line3=req.address_line3,
+        address_line4=req.address_line4,
+        address_line5=req.address_line5,
+        brand=req.fk_drive_brand.brand if req.fk_drive_brand else None,
+        is_chain_outlet=req.is_chain_outlet,
+        chain_name=req.chain_name,
+        is_urgent=req.is_urgent,
+        status=req.fk_status_lookup.display_value if req.fk_status_lookup else None,
+        stage=req.fk_stage_lookup.display_value if req.fk_stage_lookup else None,
+        contact_name=req.contact_name,
+        contact_email=req.contact_email,
+        contact_address=req.contact_address,
+        contact_number=req.contact_number,
+        bq_outlet_volume=req.bq_outlet_volume,
+        bq_competitor_threat_id=req.bq_competitor_threat_id,
+        bq_is_strategic_location=req.bq_is_strategic_location,
+        bq_consumer_profile=req.bq_consumer_profile,
+        bq_last_cost_incurred=req.bq_last_cost_incurred,
+        bq_portfolio_share=req.bq_portfolio_share,
+        bq_is_design_with_boq=req.bq_is_design_with_boq,
+        bq_sales_volume=req.bq_sales_volume,
+        tm_email=req.tm_email,
+        tm_first_name=req.fk_tm_user.first_name,
+        tm_lsat_name=req.fk_tm_user.last_name,
+        fsm_email=req.fsm_email,
+        cdm_email=req.cdm_email,
+        designer_email=req.designer_email,
+        supplier_email=req.supplier_email,
+        auditor_email=req.auditor_email,
+        bm_email=req.bm_email,
+        pr_number_designer=req.pr_number_designer,
+        pr_date_designer=req.pr_date_designer,
+        po_number_designer=req.po_number_designer,
+        po_date_designer=req.po_date_designer,
+        quotation_value_designer=req.quotation_value_designer,
+        pr_number_supplier=req.pr_number_supplier,
+        pr_date_supplier=req.pr_date_supplier,
+        po_number_supplier=req.po_number_supplier,
+        po_date_supplier=req.po_date_supplier,
+        quotation_value_supplier=req.quotation_value_supplier,
+        artwork_approved_on=req.artwork_approved_on,
+        measurement_completed_on=req.measurement_completed_on,
+        quotation_received_on=req.quotation_received_on,
+        work_completed_on=req.work_completed_on,
+        tm_signed_off_on=req.tm_signed_off_on,
+        cdm_signed_off_on=req.cdm_signed_off_on,
+        hod_approved_on=req.hod_approved_on,
+        created_on=req.created_on,
+        updated_on=req.updated_on
+    )
+
+def _eager_request_query(db: Session):
+    """
+    Build a Request query that eagerly loads the relationships `_to_request_read` needs.
+    """
+    return db.query(Request)\
+        .options(
+            joinedload(Request.fk_request_type),
+            joinedload(Request.fk_territory_info),
+            joinedload(Request.fk_channel_info),
+            joinedload(Request.fk_drive_brand),
+            joinedload(Request.fk_status_lookup),
+            joinedload(Request.fk_stage_lookup)
+        )
+
 def get_requests(db: Session, skip: int = 0, limit: int = 10) -> List[RequestRead]:
     try:
         # Building the query with eager loading for related entities
-        query = db.query(Request)\
-            .options(
-                joinedload(Request.fk_request_type),
-                joinedload(Request.fk_territory_info),
-                joinedload(Request.fk_channel_info),
-                joinedload(Request.fk_drive_brand),
-                joinedload(Request.fk_status_lookup),
-                joinedload(Request.fk_stage_lookup)
-            ).offset(skip)
+        query = _eager_request_query(db).offset(skip)
         
         if limit is not None:
             query = query.limit(limit)
 
         requests = query.all()
 
-        # Convert SQLAlchemy models to Pydantic models for response using from_orm
-        pydantic_requests = []
-        for req in requests:
-            pydantic_request = RequestRead(
-                request_id=req.request_id,
-                is_new_outlet=req.is_new_outlet,
-                request_type=req.fk_request_type.request_type if req.fk_request_type else None,
-                outlet_info_id=req.outlet_info_id,
-                rt_code=req.rt_code,
-                territory=req.fk_territory_info.territory if req.fk_territory_info else None,
-                channel=req.fk_channel_info.channel if req.fk_channel_info else None,
-                outlet_name=req.outlet_name,
-                address_line1=req.address_line1,
-                address_line2=req.address_line2,
-                address_line3=req.address_line3,
-                address_line4=req.address_line4,
-                address_line5=req.address_line5,
-                brand=req.fk_drive_brand.brand if req.fk_drive_brand else None,
-                is_chain_outlet=req.is_chain_outlet,
-                chain_name=req.chain_name,
-                is_urgent=req.is_urgent,
-                status=req.fk_status_lookup.display_value if req.fk_status_lookup else None,
-                stage=req.fk_stage_lookup.display_value if req.fk_stage_lookup else None,
-                contact_name=req.contact_name,
-                contact_email=req.contact_email,
-                contact_address=req.contact_address,
-                contact_number=req.contact_number,
-                bq_outlet_volume=req.bq_outlet_volume,
-                bq_competitor_threat_id=req.bq_competitor_threat_id,
-                bq_is_strategic_location=req.bq_is_strategic_location,
-                bq_consumer_profile=req.bq_consumer_profile,
-                bq_last_cost_incurred=req.bq_last_cost_incurred,
-                bq_portfolio_share=req.bq_portfolio_share,
-                bq_is_design_with_boq=req.bq_is_design_with_boq,
-                bq_sales_volume=req.bq_sales_volume,
-                tm_email=req.tm_email,
-                tm_first_name=req.fk_tm_user.first_name,
-                tm_lsat_name=req.fk_tm_user.last_name,
-                fsm_email=req.fsm_email,
-                cdm_email=req.cdm_email,
-                designer_email=req.designer_email,
-                supplier_email=req.supplier_email,
-                auditor_email=req.auditor_email,
-                bm_email=req.bm_email,
-                pr_number_designer=req.pr_number_designer,
-                pr_date_designer=req.pr_date_designer,
-                po_number_designer=req.po_number_designer,
-                po_date_designer=req.po_date_designer,
-                quotation_value_designer=req.quotation_value_designer,
-                pr_number_supplier=req.pr_number_supplier,
-                pr_date_supplier=req.pr_date_supplier,
-                po_number_supplier=req.po_number_supplier,
-                po_date_supplier=req.po_date_supplier,
-                quotation_value_supplier=req.quotation_value_supplier,
-                artwork_approved_on=req.artwork_approved_on,
-                measurement_completed_on=req.measurement_completed_on,
-                quotation_received_on=req.quotation_received_on,
-                work_completed_on=req.work_completed_on,
-                tm_signed_off_on=req.tm_signed_off_on,
-                cdm_signed_off_on=req.cdm_signed_off_on,
-                hod_approved_on=req.hod_approved_on
-            )
-            pydantic_requests.append(pydantic_request)
+        # Convert SQLAlchemy models to Pydantic models for response
+        pydantic_requests = [_to_request_read(req) for req in requests]
 
         # Log and return the result
         logger.info(f"Retrieved {len(pydantic_requests)} requests from the database.")
@@ -106,6 +120,28 @@ def get_requests(db: Session, skip: int = 0, limit: int = 10) -> List[RequestRea
             detail="Internal Server Error: Unable to retrieve requests"
         )
 
+def get_request_changes(db: Session, since: str = None, limit: int = 100) -> RequestChanges:
+    """
+    Retrieve requests created or updated since a sync token, plus IDs of deleted requests.
+
+    Args:
+        db (Session): The database session.
+        since (str): Opaque sync token from a previous call; None for a full sync.
+        limit (int): Maximum number of changed requests to return.
+
+    Returns:
+        RequestChanges: The changed requests, deleted request IDs and the token for the next poll.
+    """
+    rows, deleted, next_token, has_more = get_changed_rows(
+        db, _eager_request_query(db), Request, Request.request_id, since=since, limit=limit
+    )
+    return RequestChanges(
+        changes=[_to_request_read(req) for req in rows],
+        deleted=deleted,
+        next_token=next_token,
+        has_more=has_more
+    )
+
 def create_request(db: Session, request_in: RequestCreate, created_by: str) -> RequestCreateResponse:
     """
     Create a new Request with Branding Elements.
@@ -168,6 +204,8 @@ def create_request(db: Session, request_in: RequestCreate, created_by: str) -> R
         db.commit()
         db.refresh(db_request)
         logger.info(f"Request with ID {db_request.request_id} created successfully.")
+        audit_writer.record(Request.__tablename__, db_request.request_id, "create", diff({}, snapshot(db_request)), changed_by=created_by)
+        _publish_request_events(db_request, None, None, request_in.status, request_in.stage, created=True)
         return RequestCreateResponse(
             request_id=db_request.request_id,
             is_new_outlet=db_request.is_new_outlet,
@@ -202,37 +240,100 @@ def create_request(db: Session, request_in: RequestCreate, created_by: str) -> R
         logger.error(f"Error creating record: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
 
-def update_request(db: Session, request_id: int, request_update: dict) -> RequestRead:
+def update_request(db: Session, request_id: int, request_update: dict, updated_by: str = None) -> RequestRead:
     """
-    Update a user's information in the database.
+    Update a request in the database.
+
+    Display values in the update (`status`, `stage`, `territory`, `channel`, `brand`) are resolved
+    to their foreign keys. A status or stage change is published to event stream subscribers
+    once the update has been committed.
 
     Args:
         db (Session): The database session.
-        user_id (int): The ID of the user to update.
-        user_update (dict): Dictionary containing the fields to update.
+        request_id (int): The ID of the request to update.
+        request_update (dict): Dictionary containing the fields to update.
+        updated_by (str): The user making the change, stored on the request and in the audit trail.
 
     Returns:
-        User: The updated User object.
+        RequestRead: The updated request.
 
     Raises:
-        HTTPException: If the user with the given ID is not found.
+        HTTPException: 404 if the request is not found, 400 for unknown or read-only fields.
     """
     try:
         # Convert dict to Pydantic model if necessary
         if not isinstance(request_update, RequestUpdate):
             request_update = RequestUpdate(**request_update)
 
-        db_user = db.query(Request).filter(Request.request_id == request_id).first()
-        if db_user:
-            for key, value in RequestUpdate.model_dump(exclude_unset=True).items():
-                setattr(db_user, key, value)
-            db.commit()
-            db.refresh(db_user)
-            logger.info(f"Request with ID {request_id} updated successfully.")
-            return db_user
-        else:
-            logger.warning(f"User with ID {request_id} not found.")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        db_request = _eager_request_query(db).filter(Request.request_id == request_id).first()
+        if not db_request:
+            logger.warning(f"Request with ID {request_id} not found.")
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+
+        before = snapshot(db_request)
+        previous_status = db_request.fk_status_lookup.display_value if db_request.fk_status_lookup else None
+        previous_stage = db_request.fk_stage_lookup.display_value if db_request.fk_stage_lookup else None
+
+        changes = _resolve_request_references(db, request_update.model_dump(exclude_unset=True, exclude={"request_id"}))
+        unknown = sorted(key for key in changes if key not in Request.__table__.columns)
+        if unknown:
+            logger.warning(f"Rejected update of request {request_id} with unknown fields: {unknown}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown or read-only fields: {', '.join(unknown)}")
+        for key, value in changes.items():
+            setattr(db_request, key, value)
+        db_request.updated_by = updated_by
+        db.commit()
+        db.refresh(db_request)
+        logger.info(f"Request with ID {request_id} updated successfully.")
+        audit_writer.record(Request.__tablename__, request_id, "update", diff(before, snapshot(db_request)), changed_by=updated_by)
+
+        updated = _to_request_read(db_request)
+        _publish_request_events(db_request, previous_status, previous_stage, updated.status, updated.stage)
+        return updated
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating request with ID {request_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+
+def _resolve_request_references(db: Session, changes: dict) -> dict:
+    """
+    Replace display values in a request update with the matching foreign key columns.
+    """
+    resolved = dict(changes)
+    if "status" in resolved:
+        lookups = get_lookup_dynamic(db=db, display_value=resolved.pop("status"))
+        if not lookups:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown status")
+        resolved["status_id"] = lookups[0].lookup_id
+    if "stage" in resolved:
+        stage = resolved.pop("stage")
+        lookups = get_lookup_dynamic(db=db, display_value=stage) if stage is not None else []
+        if stage is not None and not lookups:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown stage")
+        resolved["stage_id"] = lookups[0].lookup_id if lookups else None
+    if "territory" in resolved:
+        db_territory = get_territory_by_territory(db, resolved.pop("territory"))
+        resolved["territory_info_id"] = db_territory.territory_info_id if db_territory else None
+    if "channel" in resolved:
+        db_channel = get_channel_by_channel(db, resolved.pop("channel"))
+        resolved["channel_info_id"] = db_channel.channel_info_id if db_channel else None
+    if "brand" in resolved:
+        db_brand = get_brand_by_brand(db, resolved.pop("brand"))
+        resolved["drive_brand_id"] = db_brand.brand_info_id if db_brand else None
+    return resolved
+
+def _publish_request_events(db_request: Request, previous_status: str, previous_stage: str, status_value: str, stage_value: str, created: bool = False):
+    """
+    Publish status and stage changes of a committed request to event stream subscribers.
+    """
+    try:
+        for event_type, payload, assignees in build_request_events(
+            db_request, previous_status, previous_stage, status_value, stage_value, created=created
+        ):
+            event_broker.publish(event_type, db_request.request_id, payload, assignees)
     except Exception as e:
-        logger.error(f"Error updating user with ID {request_id}: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
\ No newline at end of file
+        # Notifications must never fail a write that has already been committed
+        logger.error(f"Error publishing events for request {db_request.request_id}: {e}")
@@ -3,7 +3,7 @@ from app.models.request_type import Request_Type
 import logging
 from fastapi import status, HTTPException
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func
+from app.core.reference_cache import reference_cache
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ def get_request_type_by_id(db: Session, request_type_id: int) -> Request_Type:
         Request_Type: The Request type object if found, else None.
     """
     try:
-        user = db.query(Request_Type).filter(Request_Type.request_type_id == request_type_id).first()
+        user = reference_cache.get(Request_Type.__tablename__, "id", request_type_id)
         if user:
             logger.info(f"Request type found with id: {request_type_id}")
         else:
@@ -42,13 +42,11 @@ def get_request_type_by_request_type(db: Session, request_type: str, outlet_type
         Request_Type: The Request type object if found, else None.
     """
     try:
-        query = db.query(Request_Type).filter(Request_Type.request_type == request_type)
-
         if outlet_type is not None:
             logger.debug(f"Adding filter for outlet type: {outlet_type}")
-            query = query.filter(Request_Type.outlet_type == outlet_type)
-
-        request_type = query.first()
+            request_type = reference_cache.get(Request_Type.__tablename__, "name", (request_type, outlet_type))
+        else:
+            request_type = reference_cache.get(Request_Type.__tablename__, "request_type", request_type)
 
         if request_type:
             logger.info(f"Request type found for: {request_type}")
@@ -70,21 +68,8 @@ def get_unique_request_types(db: Session):
         List[Request_Type]: A list of unique Request_Type objects.
     """
     try:            
-        # Subquery to get the first occurrence of each unique request_type
-        subquery = (
-            db.query(
-                func.min(Request_Type.request_type_id).label("min_id")
-            )
-            .group_by(Request_Type.request_type)
-            .subquery()
-        )
-
-        # Use the subquery to get the full records with the unique request_type
-        request_types = (
-            db.query(Request_Type)
-            .join(subquery, Request_Type.request_type_id == subquery.c.min_id)
-            .all()
-        )
+        # The first occurrence (lowest ID) of each unique request_type
+        request_types = list(reference_cache.table(Request_Type.__tablename__).unique["request_type"].values())
 
         logger.info(f"Retrieved {len(request_types)} unique request types from the database.")
         return request_types
@@ -105,7 +90,7 @@ def get_request_types(db: Session):
         List[User]: A list of User objects.
     """
     try:
-        request_types = db.query(Request_Type).all()
+        request_types = reference_cache.rows(Request_Type.__tablename__)
         logger.info(f"Retrieved {len(request_types)} request types from the database.")
         return request_types
     except Exception as e:
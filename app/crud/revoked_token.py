@@ -0,0 +1,59 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from fastapi import HTTPException, status
+from datetime import datetime, timezone
+from app.models.auth import RevokedToken
+from app.crud.cache_version import bump_cache_version
+from app.core.revocation import revocation_list
+import logging
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+def revoke_token(db: Session, payload: dict) -> bool:
+    """
+    Revoke a decoded token until its own expiry.
+
+    The `revoked_token` row is the arbiter: of several processes revoking the same token at
+    once, exactly one inserts it and gets True.
+
+    Args:
+        db (Session): The database session.
+        payload (dict): The decoded token; must contain `jti` and `exp`.
+
+    Returns:
+        bool: True if this call revoked the token, False if it had already been revoked.
+
+    Raises:
+        HTTPException: If the token has no `jti` or the revocation cannot be stored.
+    """
+    jti = payload.get("jti")
+    expires_at = payload.get("exp")
+    if not jti or expires_at is None:
+        logger.warning(f"Token without jti presented for revocation by {payload.get('sub')}.")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token cannot be revoked")
+
+    try:
+        db.add(RevokedToken(
+            jti=jti,
+            email=payload.get("sub"),
+            expires_on=datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
+        ))
+        try:
+            # Flushed on its own so only a duplicate jti is read as "already revoked"
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            revocation_list.add(jti, expires_at)
+            logger.info(f"Token {jti} was already revoked.")
+            return False
+        bump_cache_version(db, RevokedToken.__tablename__)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error revoking token {jti}: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+
+    revocation_list.add(jti, expires_at)
+    logger.info(f"Token {jti} revoked for user {payload.get('sub')}.")
+    return True
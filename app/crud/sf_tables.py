@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.models.sf_tables import TerritoryInfo, ChannelInfo, BrandInfo
+from app.core.reference_cache import reference_cache
 import logging
 
 # Set up logging for this module
@@ -17,7 +18,7 @@ def get_territory_by_territory(db: Session, territory: str) -> TerritoryInfo:
         Request_Type: The Request type object if found, else None.
     """
     try:
-        territory = db.query(TerritoryInfo).filter(TerritoryInfo.territory == territory).first()
+        territory = reference_cache.get(TerritoryInfo.__tablename__, "name", territory)
         if territory:
             logger.info(f"Territory found for: {territory}")
         else:
@@ -39,7 +40,7 @@ def get_channel_by_channel(db: Session, channel: str) -> ChannelInfo:
         Request_Type: The Request type object if found, else None.
     """
     try:
-        channel = db.query(ChannelInfo).filter(ChannelInfo.channel == channel).first()
+        channel = reference_cache.get(ChannelInfo.__tablename__, "name", channel)
         if channel:
             logger.info(f"Channel found for: {channel}")
         else:
@@ -61,7 +62,7 @@ def get_brand_by_brand(db: Session, brand: str) -> BrandInfo:
         Request_Type: The Request type object if found, else None.
     """
     try:
-        brand = db.query(BrandInfo).filter(BrandInfo.brand == brand).first()
+        brand = reference_cache.get(BrandInfo.__tablename__, "name", brand)
         if brand:
             logger.info(f"Brand found for: {brand}")
         else:
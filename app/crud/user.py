@@ -4,9 +4,14 @@ from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.password_security import hash_password, temp_password
+from app.core.audit import audit_writer, snapshot, diff
+from app.crud.cache_version import bump_cache_version
+from app.core.user_cache import user_cache
+from app.core.security_stamps import security_stamps, rotate_security_stamp
 import logging
-from app.workflows.email import send_email
-from app.config import OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL, SEND_EMAIL_URL
+from app.crud.email_outbox import enqueue_notification
+from app.core.email_dispatcher import email_dispatcher
+from app.config import OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
@@ -31,7 +36,7 @@ def get_users(db: Session, skip: int = 0, limit: int = 10):
         logger.error(f"Error retrieving users: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
 
-def update_user(db: Session, user_id: int, user_update: dict) -> User:
+def update_user(db: Session, user_id: int, user_update: dict, updated_by: str = None) -> User:
     """
     Update a user's information in the database.
 
@@ -39,6 +44,7 @@ def update_user(db: Session, user_id: int, user_update: dict) -> User:
         db (Session): The database session.
         user_id (int): The ID of the user to update.
         user_update (dict): Dictionary containing the fields to update.
+        updated_by (str): Identifier of the user making the change.
 
     Returns:
         User: The updated User object.
@@ -53,11 +59,20 @@ def update_user(db: Session, user_id: int, user_update: dict) -> User:
 
         db_user = db.query(User).filter(User.user_id == user_id).first()
         if db_user:
+            before = snapshot(db_user)
             for key, value in user_update.model_dump(exclude_unset=True).items():
                 setattr(db_user, key, value)
+            if db_user.is_active != before["is_active"] or db_user.role != before["role"]:
+                # Tokens carry the active flag and role, so reissue them
+                rotate_security_stamp(db_user)
+            db_user.updated_by = updated_by
+            bump_cache_version(db, User.__tablename__)
             db.commit()
             db.refresh(db_user)
+            user_cache.invalidate(db_user.email)
+            security_stamps.record(db_user.user_id, db_user.security_stamp)
             logger.info(f"User with ID {user_id} updated successfully.")
+            audit_writer.record(User.__tablename__, user_id, "update", diff(before, snapshot(db_user)), changed_by=updated_by)
             return db_user
         else:
             logger.warning(f"User with ID {user_id} not found.")
@@ -68,7 +83,7 @@ def update_user(db: Session, user_id: int, user_update: dict) -> User:
 
 def create_user(db: Session, user_in: UserCreate, created_by: str) -> User:
     """
-    Create a new user in the database.
+    Create a new user in the database and queue the temporary password email in the outbox.
 
     Args:
         db (Session): The database session.
@@ -100,48 +115,33 @@ def create_user(db: Session, user_in: UserCreate, created_by: str) -> User:
             created_by=created_by
         )
         db.add(db_user)
+        # Queue the temporary password email in the same transaction as the user, with the
+        # test copies as hidden recipients
+        enqueue_notification(
+            db,
+            type="Temporary Password",
+            body={
+                "Firstname": user_in.first_name,
+                "Lastname": user_in.last_name,
+                "TempPassword": temporary_password
+            },
+            to=[user_in.email],
+            bcc=[OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL]  # Only for testing purpose
+        )
+        bump_cache_version(db, User.__tablename__)
         db.commit()
         db.refresh(db_user)
-        # Send the OTP to the user via email
-        send_email(
-            workflow_url=SEND_EMAIL_URL,
-            email=user_in.email, 
-            type="Temporary Password", 
-            body= {
-                    "Email": user_in.email,
-                    "Firstname":user_in.first_name,
-                    "Lastname":user_in.last_name,
-                    "TempPassword": temporary_password 
-                }
-            )
-        send_email(
-            workflow_url=SEND_EMAIL_URL,
-            email=OTP_TEST_EMAIL, 
-            type="Temporary Password", 
-            body={
-                    "Email": OTP_TEST_EMAIL,
-                    "TempPassword": temporary_password,
-                    "Firstname":user_in.first_name,
-                    "Lastname":user_in.last_name
-                }
-            )    # Only for testing purpose
-        send_email(
-            workflow_url=SEND_EMAIL_URL,
-            email=OTP_TEST_CC_EMAIL, 
-            type="Temporary Password", 
-            body={
-                    "Email": OTP_TEST_CC_EMAIL,
-                    "TempPassword": temporary_password,
-                    "Firstname":user_in.first_name,
-                    "Lastname":user_in.last_name
-                }
-            ) # Only for testing purpose
+        if email_dispatcher:
+            email_dispatcher.wake()
+        audit_writer.record(User.__tablename__, db_user.user_id, "create", diff({}, snapshot(db_user)), changed_by=created_by)
         logger.info(f"User with ID {db_user.user_id} created successfully.")
         return db_user
     except IntegrityError:
         db.rollback()
         logger.error(f"Email {user_in.email} is already registered.")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating user: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
@@ -159,12 +159,21 @@ def reset_password(db: Session, db_user: User, new_password: str) -> User:
         User: The updated User object.
     """
     try:
+        before = snapshot(db_user)
         db_user.hashed_password = hash_password(new_password)
         db_user.is_temp_password = False
+        db_user.updated_by = db_user.email
+        rotate_security_stamp(db_user)
+        bump_cache_version(db, User.__tablename__)
         db.commit()
         db.refresh(db_user)
+        user_cache.invalidate(db_user.email)
+        security_stamps.record(db_user.user_id, db_user.security_stamp)
+        audit_writer.record(User.__tablename__, db_user.user_id, "update", diff(before, snapshot(db_user)), changed_by=db_user.email)
         logger.info(f"Password reset successfully for user with ID {db_user.user_id}.")
         return db_user
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error resetting password for user with ID {db_user.user_id}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
@@ -213,3 +222,27 @@ def get_user_by_id(db: Session, user_id: int) -> User:
     except Exception as e:
         logger.error(f"Error retrieving user with id {user_id}: {e}")
         raise
+
+def revoke_user_tokens(db: Session, db_user: User) -> User:
+    """
+    Invalidate every token issued to a user so far by rotating their security stamp.
+
+    Args:
+        db (Session): The database session.
+        db_user (User): The user whose tokens are revoked.
+
+    Returns:
+        User: The updated User object.
+    """
+    try:
+        rotate_security_stamp(db_user)
+        bump_cache_version(db, User.__tablename__)
+        db.commit()
+        db.refresh(db_user)
+        user_cache.invalidate(db_user.email)
+        security_stamps.record(db_user.user_id, db_user.security_stamp)
+        logger.warning(f"All tokens revoked for user with ID {db_user.user_id}.")
+        return db_user
+    except Exception as e:
+        logger.error(f"Error revoking tokens for user with ID {db_user.user_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
@@ -1,9 +1,22 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.api_v1.endpoints import auth, user, default, lookup, req_branding_elements_type, request_type, branding_elements_type, request, branding_element
+from app.api.api_v1.endpoints import auth, user, default, lookup, req_branding_elements_type, request_type, branding_elements_type, request, branding_element, bootstrap
 from app.logging_config import setup_logging
 from fastapi.exceptions import RequestValidationError
 from app.exceptions.exception_handlers import validation_exception_handler
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, parse_rules, create_rate_limit_backend
+from app.core.audit import audit_writer
+from app.core.warmup import warm_up
+from app.core.hash_pool import hash_pool
+from app.core.email_dispatcher import email_dispatcher
+from app.core.events import event_broker
+from app.core.notification_digest import notification_digest
+from app.workflows.http_client import workflow_client, async_workflow_client
+from app.config import COMPRESSION_MINIMUM_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY, COMPRESSION_BROTLI_ENABLED
+from app.config import RATE_LIMIT_ENABLED, RATE_LIMIT_BACKEND, RATE_LIMIT_URL, RATE_LIMIT_TRUST_FORWARDED, RATE_LIMIT_FORWARDED_HOPS, RATE_LIMIT_RULES
 
 # API description
 description=    """
@@ -62,6 +75,11 @@ tags_metadata = [
         "description": """Contains operations related to lookup data management. This tag covers endpoints for creating, 
         updating, and retrieving lookup data.""",
     },
+    {
+        "name": "Bootstrap",
+        "description": """Contains the single versioned document of all client reference data. This tag covers the endpoint 
+        clients call on launch, with ETag support so unchanged data costs no transfer.""",
+    },
     {
         "name": "Request Branding Elements Type",
         "description": """Contains operations related to request branding elements type data management. This tag covers endpoints for 
@@ -89,8 +107,36 @@ tags_metadata = [
     },
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start background workers and warm caches when the application starts, and flush them on shutdown.
+    """
+    audit_writer.start()
+    if email_dispatcher:
+        email_dispatcher.start()
+    if notification_digest:
+        event_broker.add_listener(notification_digest.offer)
+        notification_digest.start()
+    if warm_up:
+        # Waits up to the warm-up budget; keep the event loop free meanwhile
+        await asyncio.to_thread(warm_up.start)
+    yield
+    if warm_up:
+        await asyncio.to_thread(warm_up.stop)
+    hash_pool.shutdown()
+    if notification_digest:
+        # Queue the buffered digests before the dispatcher stops
+        notification_digest.stop()
+    if email_dispatcher:
+        email_dispatcher.stop()
+    workflow_client.close()
+    await async_workflow_client.aclose()
+    audit_writer.stop()
+
 # Initialize FastAPI application
 app = FastAPI(
+    lifespan=lifespan,
     title="Lion Brewery (Ceylon) PLC Outlet System API Endpoints",
     description=description,
     version="1.0.0",
@@ -101,6 +147,17 @@ app = FastAPI(
     }
 )
 
+# Throttle login and OTP endpoints by client IP and email before any hashing or database work.
+# Added before CORS so that 429 responses still carry CORS headers.
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=parse_rules(RATE_LIMIT_RULES),
+        backend=create_rate_limit_backend(RATE_LIMIT_BACKEND, RATE_LIMIT_URL),
+        trust_forwarded=RATE_LIMIT_TRUST_FORWARDED,
+        forwarded_hops=RATE_LIMIT_FORWARDED_HOPS
+    )
+
 # Add CORS (Cross-Origin Resource Sharing) middleware
 app.add_middleware(
     CORSMiddleware,
@@ -114,6 +171,15 @@ app.add_middleware(
     allow_headers=["Authorization"],  # Specifies allowed headers
 )
 
+# Add gzip/brotli response compression negotiated from Accept-Encoding
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,  # Small payloads are cheaper to send as-is
+    gzip_level=COMPRESSION_GZIP_LEVEL,
+    brotli_quality=COMPRESSION_BROTLI_QUALITY,
+    enable_brotli=COMPRESSION_BROTLI_ENABLED,  # Only used when the optional brotli package is installed
+)
+
 # Register the custom exception handler
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
@@ -125,6 +191,7 @@ app.include_router(default.router, tags=["Default"])
 app.include_router(auth.router, prefix="/api/v1", tags=["Authentication"])
 app.include_router(user.router, prefix="/api/v1/user", tags=["User"])
 app.include_router(lookup.router, prefix="/api/v1/lookup", tags=["Lookup"])
+app.include_router(bootstrap.router, prefix="/api/v1", tags=["Bootstrap"])
 app.include_router(req_branding_elements_type.router, prefix="/api/v1/req_branding_elements_type", tags=["Request Branding Elements Type"])
 app.include_router(request_type.router, prefix="/api/v1/request_type", tags=["Request Type"])
 app.include_router(branding_elements_type.router, prefix="/api/v1/branding_elements_type", tags=["Branding Elements Type"])
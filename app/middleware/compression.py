@@ -0,0 +1,230 @@
+import zlib
+import logging
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Media types that must reach the client chunk by chunk, untouched
+DEFAULT_EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+
+def parse_accept_encoding(header_value: str) -> dict:
+    """
+    Parse an Accept-Encoding header into a mapping of coding to q-value.
+
+    Args:
+        header_value (str): The raw Accept-Encoding header value.
+
+    Returns:
+        dict: Lower-cased content codings mapped to their quality (0.0 - 1.0).
+    """
+    codings = {}
+    for item in header_value.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            if param.lower().startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses responses with brotli or gzip.
+
+    The encoding is negotiated from the request's Accept-Encoding header. Responses
+    smaller than `minimum_size` are sent as-is, as are responses that already carry a
+    Content-Encoding or use an excluded media type (e.g. Server-Sent Events). Streaming
+    responses are compressed chunk by chunk, so nothing beyond `minimum_size` bytes is
+    ever held back.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+        minimum_size (int): Smallest body, in bytes, worth compressing.
+        gzip_level (int): zlib compression level (1-9).
+        brotli_quality (int): Brotli quality (0-11); only used when brotli is installed.
+        enable_brotli (bool): Offer brotli when the client accepts it.
+        excluded_media_types (tuple): Content types that are never compressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        enable_brotli: bool = True,
+        excluded_media_types: tuple = DEFAULT_EXCLUDED_MEDIA_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.enable_brotli = enable_brotli and brotli is not None
+        self.excluded_media_types = excluded_media_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def select_encoding(self, accept_encoding: str):
+        """
+        Pick the best supported content coding for an Accept-Encoding header.
+
+        Returns:
+            str | None: "br", "gzip" or None when the client accepts neither.
+        """
+        if not accept_encoding:
+            return None
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        candidates = ["br", "gzip"] if self.enable_brotli else ["gzip"]
+        best, best_quality = None, 0.0
+        for coding in candidates:
+            quality = codings.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def create_encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+def _weaken_etag(headers: MutableHeaders):
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _CompressionResponder:
+    """
+    Per-request send wrapper that decides, from the first body bytes, whether to compress.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream_send = send
+        self.start_message: Message | None = None
+        self.pending = []
+        self.pending_size = 0
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            if (
+                "content-encoding" in headers
+                or media_type in self.middleware.excluded_media_types
+                or message["status"] in (204, 304)
+            ):
+                if message["status"] == 304:
+                    # Validates the compressed representation this client would have been sent
+                    _weaken_etag(MutableHeaders(raw=message["headers"]))
+                self.passthrough = True
+                await self.downstream_send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.downstream_send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is not None:
+            # Already streaming compressed output
+            chunk = self.encoder.compress(body) if more_body else self.encoder.finish(body)
+            await self.downstream_send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.pending.append(body)
+        self.pending_size += len(body)
+
+        if more_body and self.pending_size < self.middleware.minimum_size:
+            # Hold back a small prefix until we know the response is worth compressing
+            return
+
+        buffered = b"".join(self.pending)
+        self.pending = []
+
+        if not more_body and self.pending_size < self.middleware.minimum_size:
+            await self.downstream_send(self.start_message)
+            await self.downstream_send({"type": "http.response.body", "body": buffered, "more_body": False})
+            return
+
+        self.encoder = self.middleware.create_encoder(self.encoding)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        _weaken_etag(headers)
+
+        if more_body:
+            # Length of a compressed stream is unknown up front
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            chunk = self.encoder.compress(buffered)
+        else:
+            chunk = self.encoder.finish(buffered)
+            headers["Content-Length"] = str(len(chunk))
+            logger.debug("Compressed response with %s: %d -> %d bytes", self.encoding, len(buffered), len(chunk))
+
+        await self.downstream_send(self.start_message)
+        await self.downstream_send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,270 @@
+import json
+import logging
+import math
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.resp import RespClient, RespError, RespConnectionError
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Largest request body inspected for an email address; bigger bodies are only limited by IP
+MAX_INSPECTED_BODY = 64 * 1024
+
+
+class RateLimit:
+    """
+    One limit of a route: at most `limit` requests per `window` seconds for each key.
+    """
+    __slots__ = ("key_type", "limit", "window")
+
+    def __init__(self, key_type: str, limit: int, window: float):
+        if key_type not in ("ip", "email"):
+            raise ValueError(f"Unknown rate limit key: {key_type}")
+        self.key_type = key_type
+        self.limit = limit
+        self.window = window
+
+
+def parse_rules(rules: dict) -> dict:
+    """
+    Convert the configured rules into RateLimit objects.
+
+    Args:
+        rules (dict): "METHOD /path" to {key type: [limit, window seconds]}, e.g.
+            {"POST /api/v1/login/otp": {"ip": [20, 60], "email": [5, 60]}}.
+
+    Returns:
+        dict: (method, path) to a list of RateLimit.
+    """
+    parsed = {}
+    for route, limits in rules.items():
+        method, path = route.split(" ", 1)
+        parsed[(method.upper(), path)] = [RateLimit(key_type, int(limit), float(window)) for key_type, (limit, window) in limits.items()]
+    return parsed
+
+
+class MemoryRateLimitBackend:
+    """
+    Sliding-window counters held in this process.
+
+    Each worker counts on its own, so the effective limit is multiplied by the number of
+    workers; use the RESP backend to share counters.
+    """
+    blocking = False
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def hit(self, key: str, window: float, now: float) -> tuple:
+        """
+        Count one request and return the (current, previous) fixed-window counts.
+        """
+        index = int(now // window)
+        with self._lock:
+            self._prune(now)
+            current = self._counts.get((key, index), 0) + 1
+            self._counts[(key, index)] = current
+            return current, self._counts.get((key, index - 1), 0)
+
+    def _prune(self, now: float):
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 60
+        # Keys are (name, window index); anything older than the previous window is unused
+        self._counts = {
+            (key, index): count for (key, index), count in self._counts.items()
+            if index >= int(now // _window_of(key)) - 1
+        }
+
+
+class RespRateLimitBackend:
+    """
+    Sliding-window counters in Redis (or any RESP server), shared by every worker and instance.
+
+    The client does blocking socket I/O, so the middleware calls it from the threadpool.
+    """
+    blocking = True
+
+    def __init__(self, client: RespClient, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key: str, window: float, now: float) -> tuple:
+        index = int(now // window)
+        current_key = f"{self.prefix}{key}:{index}"
+        replies = self.client.pipeline(
+            ("INCR", current_key),
+            ("PEXPIRE", current_key, int(window * 2000)),
+            ("GET", f"{self.prefix}{key}:{index - 1}")
+        )
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies[0], int(replies[2] or 0)
+
+
+def _window_of(key: str) -> float:
+    # Keys are "<route>|<key type>|<window>|<value>"
+    return float(key.split("|", 3)[2])
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware that throttles selected routes by client IP and by email.
+
+    Limits use a sliding-window counter: the previous fixed window's count, weighted by how
+    much of it still overlaps the sliding window, plus the current window's count. The email
+    is read from the JSON request body, which is buffered and replayed to the application.
+    Rejected requests get 429 with Retry-After before any routing, hashing or database work.
+    If the shared backend is unreachable, requests are let through and the failure is logged.
+    Blocking backends are called from the threadpool so they never stall the event loop.
+
+    Args:
+        app (ASGIApp): The wrapped application.
+        rules (dict): (method, path) to a list of RateLimit, as returned by `parse_rules`.
+        backend: MemoryRateLimitBackend or RespRateLimitBackend.
+        trust_forwarded (bool): Take the client IP from X-Forwarded-For. Only safe behind proxies
+            that append the address they received the request from.
+        forwarded_hops (int): Number of trusted proxies appending to X-Forwarded-For. The client IP
+            is the entry this many places from the right; entries further left are client-supplied.
+    """
+
+    def __init__(self, app: ASGIApp, rules: dict, backend, trust_forwarded: bool = False, forwarded_hops: int = 1):
+        if forwarded_hops < 1:
+            raise ValueError("forwarded_hops must be at least 1.")
+        self.app = app
+        self.rules = rules
+        self.backend = backend
+        self.trust_forwarded = trust_forwarded
+        self.forwarded_hops = forwarded_hops
+        self.rejected = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limits = self.rules.get((scope["method"], scope["path"].rstrip("/") or "/"))
+        if not limits:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        email = None
+        if any(limit.key_type == "email" for limit in limits):
+            body, receive = await _buffer_body(receive, headers)
+            email = _extract_email(body)
+
+        keys = {"ip": self._client_ip(scope, headers), "email": email}
+        if self.backend.blocking:
+            retry_after = await run_in_threadpool(self._check, scope["path"], limits, keys)
+        else:
+            retry_after = self._check(scope["path"], limits, keys)
+        if retry_after is not None:
+            self.rejected += 1
+            logger.warning(f"Rate limit exceeded on {scope['path']} for ip={keys['ip']} email={email}.")
+            await _reject(send, retry_after)
+            return
+        await self.app(scope, receive, send)
+
+    def _check(self, path: str, limits: list, keys: dict):
+        now = time.time()
+        retry_after = None
+        for limit in limits:
+            value = keys.get(limit.key_type)
+            if not value:
+                continue
+            key = f"{path}|{limit.key_type}|{limit.window:g}|{value}"
+            try:
+                current, previous = self.backend.hit(key, limit.window, now)
+            except (RespError, RespConnectionError) as e:
+                logger.error(f"Rate limit backend unavailable, allowing request: {e}")
+                return None
+            elapsed = (now % limit.window) / limit.window
+            if previous * (1 - elapsed) + current > limit.limit:
+                wait = math.ceil(limit.window - now % limit.window)
+                retry_after = max(retry_after or 0, wait, 1)
+        return retry_after
+
+    def _client_ip(self, scope: Scope, headers: Headers) -> str:
+        if self.trust_forwarded:
+            # Each trusted proxy appends one entry, so count from the right; a header with fewer
+            # entries than hops did not come through all of them and is ignored
+            forwarded = [entry.strip() for entry in ",".join(headers.getlist("x-forwarded-for")).split(",") if entry.strip()]
+            if len(forwarded) >= self.forwarded_hops:
+                return forwarded[-self.forwarded_hops]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+
+async def _buffer_body(receive: Receive, headers: Headers):
+    """
+    Read the request body (up to MAX_INSPECTED_BODY) and return it with a receive that replays it.
+    """
+    try:
+        declared = int(headers.get("content-length", "0"))
+    except ValueError:
+        declared = 0
+    if declared > MAX_INSPECTED_BODY:
+        return b"", receive
+
+    messages = []
+    body = b""
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body", False) or len(body) > MAX_INSPECTED_BODY:
+            break
+
+    async def replay() -> Message:
+        if messages:
+            return messages.pop(0)
+        return await receive()
+
+    return (body if len(body) <= MAX_INSPECTED_BODY else b""), replay
+
+
+def _extract_email(body: bytes):
+    if not body:
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    email = data.get("email") if isinstance(data, dict) else None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+async def _reject(send: Send, retry_after: int):
+    body = json.dumps({"detail": "Too many requests, please retry later"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_rate_limit_backend(backend: str, url: str = None):
+    """
+    Build the counter backend selected by configuration ("memory" or "redis").
+    """
+    if backend == "memory":
+        return MemoryRateLimitBackend()
+    if backend == "redis":
+        if not url:
+            raise ValueError("RATE_LIMIT_URL is required for the redis rate limit backend.")
+        return RespRateLimitBackend(RespClient(url, timeout=0.5))
+    raise ValueError(f"Unknown rate limit backend: {backend}")
@@ -1,3 +1,8 @@
 from .lookup import Lookup
 from .user import User
 from .request import Request
+from .tombstone import Tombstone
+from .audit import AuditLog
+from .cache_version import CacheVersion
+from .auth import Otp, RevokedToken
+from .email_outbox import EmailOutbox
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.db.base import Base
+from datetime import datetime, timezone
+
+class AuditLog(Base):
+    """
+    SQLAlchemy model for the append-only 'audit_log' table.
+
+    One row is written per changed field of a create or update.
+
+    Attributes:
+        audit_id (int): Primary key for the audit entry.
+        table_name (str): Name of the audited table (e.g. 'request', 'user').
+        row_id (int): Primary key of the audited row.
+        action (str): 'create' or 'update'.
+        field_name (str): Name of the changed column.
+        old_value (str): Value before the change, as text (None for creates).
+        new_value (str): Value after the change, as text.
+        changed_by (str): Email of the user who made the change.
+        changed_on (datetime): Timestamp of the change (UTC).
+    """
+    __tablename__ = 'audit_log'
+
+    audit_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    action = Column(String(16), nullable=False)
+    field_name = Column(String(64), nullable=False)
+    old_value = Column(Text, nullable=True)
+    new_value = Column(Text, nullable=True)
+    changed_by = Column(String(255), nullable=True)
+    changed_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (Index('idx_audit_log_row', 'table_name', 'row_id', 'audit_id'),)
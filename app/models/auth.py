@@ -9,8 +9,8 @@ class Otp(Base):
 
     Attributes:
         otp_id (int): Primary key for the OTP entry.
-        user_id (int): Foreign key linking to the 'user' table, indicating the user associated with the OTP.
-        otp (str): The actual one-time password.
+        user_id (int): Foreign key linking to the 'user' table; unique, as a user has at most one OTP.
+        otp (str): Keyed HMAC-SHA256 digest of the one-time password.
         attempts (int): Number of attempts made using this OTP.
         created_on (datetime): Timestamp when the OTP was created (UTC).
 
@@ -20,9 +20,31 @@ class Otp(Base):
     __tablename__ = 'Otp'
 
     otp_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('user.user_id'))
+    user_id = Column(Integer, ForeignKey('user.user_id'), unique=True)
     otp = Column(String, nullable=False)  # Ensure OTP is not nullable
     attempts = Column(Integer, default=0, nullable=False)  # Ensure attempts is not nullable
     created_on = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     user = relationship('User', foreign_keys=[user_id])
+
+class RevokedToken(Base):
+    """
+    SQLAlchemy model for the 'revoked_token' table.
+
+    Persists the IDs of tokens revoked before their expiry (logout, refresh token rotation),
+    so that every process can mirror them in memory.
+
+    Attributes:
+        revoked_token_id (int): Primary key; monotonically increasing and used to sync new revocations.
+        jti (str): The `jti` claim of the revoked token.
+        email (str): The user the token was issued to.
+        expires_on (datetime): The token's own expiry; the row is useless afterwards (UTC).
+        revoked_on (datetime): Timestamp when the token was revoked (UTC).
+    """
+    __tablename__ = 'revoked_token'
+
+    revoked_token_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    jti = Column(String(64), unique=True, nullable=False)
+    email = Column(String, nullable=True)
+    expires_on = Column(DateTime, nullable=False, index=True)
+    revoked_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
@@ -14,6 +14,7 @@ class Branding_Elements(Base):
     branding_element = Column(String(255), nullable=True)
     created_by = Column(String(255), nullable=True)
     created_on = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
 
     # Relationships
     fk_request = relationship(
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.base import Base
+from datetime import datetime, timezone
+
+class CacheVersion(Base):
+    """
+    SQLAlchemy model for the 'cache_version' table.
+
+    Holds one counter per cached logical table. Writers increment it in the same transaction
+    as their change, and every process polls the table to drop its stale cache segments.
+
+    Attributes:
+        name (str): Logical table name, matching the cache segment name.
+        version (int): Incremented on every committed write to the table.
+        updated_on (datetime): Timestamp of the last increment (UTC).
+    """
+    __tablename__ = 'cache_version'
+
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
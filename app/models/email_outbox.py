@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from app.db.base import Base
+from datetime import datetime, timezone
+
+class EmailOutbox(Base):
+    """
+    SQLAlchemy model for the 'email_outbox' table.
+
+    Emails are written here in the same transaction as the change that triggers them and
+    delivered to the Power Automate workflow by the background email dispatcher.
+
+    Attributes:
+        outbox_id (int): Primary key; also the delivery order.
+        email_type (str): Type of email, e.g. 'OTP' or 'Temporary Password'.
+        recipient (str): Primary recipients, separated by ';'.
+        cc (str): Visible copy recipients, separated by ';'.
+        bcc (str): Hidden copy recipients, separated by ';'.
+        payload (str): Encrypted JSON message fields posted to the workflow; cleared once delivered or given up.
+        status (str): 'pending', 'sent' or 'failed'.
+        attempts (int): Number of delivery attempts made.
+        next_attempt_on (datetime): Earliest time of the next delivery attempt (UTC).
+        last_error (str): Error of the last failed attempt.
+        created_on (datetime): Timestamp when the email was queued (UTC).
+        sent_on (datetime): Timestamp of successful delivery (UTC).
+    """
+    __tablename__ = 'email_outbox'
+
+    outbox_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    email_type = Column(String(64), nullable=False)
+    recipient = Column(String(1024), nullable=False)
+    cc = Column(String(1024), nullable=True)
+    bcc = Column(String(1024), nullable=True)
+    payload = Column(Text, nullable=True)
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    sent_on = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index('idx_email_outbox_due', 'status', 'next_attempt_on'),)
@@ -5,6 +5,7 @@ from app.models.sf_tables import TerritoryInfo, ChannelInfo, ChainInfo, OutletIn
 from app.models.user import User
 from app.models.lookup import Lookup
 from app.models.request_type import Request_Type
+from datetime import datetime, timezone
 
 class Request(Base):
     __tablename__ = 'request'
@@ -64,6 +65,9 @@ class Request(Base):
     tm_signed_off_on = Column(DateTime)
     cdm_signed_off_on = Column(DateTime)
     hod_approved_on = Column(DateTime)
+    created_on = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
+    updated_by = Column(String(255))
 
     # Correct relationships
     fk_request_type = relationship(
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.db.base import Base
+from datetime import datetime, timezone
+
+class Tombstone(Base):
+    """
+    SQLAlchemy model for the 'tombstone' table.
+
+    A row is written by the AFTER DELETE triggers in mysql/tombstone.sql whenever a synced
+    record is deleted, however it is deleted, so that incremental clients can learn about
+    removals from the change feed.
+
+    Attributes:
+        tombstone_id (int): Primary key; breaks ties between equal `deleted_on` in the sync cursor.
+        table_name (str): Name of the table the deleted row belonged to.
+        row_id (int): Primary key of the deleted row.
+        deleted_on (datetime): Timestamp when the row was deleted (UTC).
+    """
+    __tablename__ = 'tombstone'
+
+    tombstone_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_on = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (Index('idx_tombstone_table', 'table_name', 'deleted_on', 'tombstone_id'),)
@@ -19,6 +19,8 @@ class User(Base):
     - created_on: Timestamp when the user record was created (UTC).
     - updated_by: Identifier for the last updater of the user record.
     - updated_on: Timestamp when the user record was last updated (UTC).
+    - security_stamp: Incremented whenever previously issued tokens must stop working
+      (deactivation, password reset, OTP lockout).
     """
     __tablename__ = 'user'
     
@@ -36,4 +38,5 @@ class User(Base):
     created_by = Column(String, nullable=True)
     created_on = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_by = Column(String, nullable=True)
-    updated_on = Column(DateTime, onupdate=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    updated_on = Column(DateTime, onupdate=lambda: datetime.now(timezone.utc))
+    security_stamp = Column(Integer, nullable=False, default=0)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+class AuditLogRead(BaseModel):
+    """
+    Model for reading a single field-level audit entry.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    audit_id: int
+    table_name: str
+    row_id: int
+    action: str
+    field_name: str
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+    changed_by: Optional[str] = None
+    changed_on: datetime
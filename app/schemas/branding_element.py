@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class BrandingElementBase(BaseModel):
@@ -23,6 +23,7 @@ class BrandingElementRead(BrandingElementBase):
     branding_element: str
     created_on: datetime
     created_by: str
+    updated_on: Optional[datetime] = None
 
     class Config:
         """
@@ -35,4 +36,13 @@ class BrandingElementCreate(BaseModel):
     req_branding_elements_type_id: int
     request_id: int
     branding_element: str
-    created_by: Optional[str] = None
\ No newline at end of file
+    created_by: Optional[str] = None
+
+class BrandingElementChanges(BaseModel):
+    """
+    A page of the branding element change feed.
+    """
+    changes: List[BrandingElementRead]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
\ No newline at end of file
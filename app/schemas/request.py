@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
 from datetime import datetime
 
 class AssigneeInfo(BaseModel):
@@ -98,6 +98,8 @@ class RequestRead(AssigneeInfo, PRPOInfo, Timestamps, BaseQuestionsInfo, Request
     is_urgent: Optional[bool] = None
     status: str
     stage: Optional[str] = None
+    created_on: Optional[datetime] = None
+    updated_on: Optional[datetime] = None
 
     class Config:
         """
@@ -105,6 +107,21 @@ class RequestRead(AssigneeInfo, PRPOInfo, Timestamps, BaseQuestionsInfo, Request
         from ORM-style models.
         """
         from_attributes = True
+
+class RequestChanges(BaseModel):
+    """
+    A page of the request change feed.
+
+    Attributes:
+        changes (List[RequestRead]): Requests created or updated since the supplied token.
+        deleted (List[int]): IDs of requests deleted since the supplied token.
+        next_token (str): Opaque token to pass as `since` on the next poll.
+        has_more (bool): True when another page is immediately available.
+    """
+    changes: List[RequestRead]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
     
 class RequestCreate(AssigneeInfo, PRPOInfo, Timestamps, BaseQuestionsInfo, RequestContact):
     is_new_outlet: bool
@@ -156,6 +173,9 @@ class RequestCreateResponse(AssigneeInfo, BaseQuestionsInfo, RequestContact):
         Oorm_mode = True
 
 class RequestUpdate(AssigneeInfo, PRPOInfo, Timestamps, BaseQuestionsInfo, RequestContact):
+    # Unknown fields are kept so update_request can reject them instead of dropping them silently
+    model_config = ConfigDict(extra="allow")
+
     request_id: int
     rt_code: Optional[str] = None
     territory: Optional[str] = None
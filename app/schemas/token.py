@@ -15,6 +15,15 @@ class Token(BaseModel):
     refresh_token: str
     token_type: str
 
+class LogoutRequest(BaseModel):
+    """
+    Model for logout requests.
+
+    Attributes:
+        refresh_token (Optional[str]): The refresh token issued with the access token, revoked as well when given.
+    """
+    refresh_token: Optional[str] = None
+
 class TokenRequest(BaseModel):
     """
     Model for token requests using email and OTP.
@@ -1,5 +1,5 @@
 import logging
-from app.workflows.email import send_email
+from app.workflows.notification import send_notification
 from app.config import OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL, SEND_EMAIL_URL
 
 # Set up logging for this module
@@ -17,19 +17,18 @@ def send_test_emails(temp_password: str, first_name: str, last_name: str):
         last_name (str): The user's last name.
     """
     try:
-        test_emails = [OTP_TEST_EMAIL, OTP_TEST_CC_EMAIL]
-        for email in test_emails:
-            send_email(
-                workflow_url=SEND_EMAIL_URL,
-                email=email,
-                type="Temporary Password",
-                body={
-                    "Email": email,
-                    "TempPassword": temp_password,
-                    "Firstname": first_name,
-                    "Lastname": last_name
-                }
-            )
-            logger.info(f"Test email sent to {email}.")
+        # One workflow call; the workflow delivers the copy to the CC address
+        send_notification(
+            workflow_url=SEND_EMAIL_URL,
+            type="Temporary Password",
+            body={
+                "TempPassword": temp_password,
+                "Firstname": first_name,
+                "Lastname": last_name
+            },
+            to=[OTP_TEST_EMAIL],
+            cc=[OTP_TEST_CC_EMAIL]
+        )
+        logger.info(f"Test email sent to {OTP_TEST_EMAIL} and {OTP_TEST_CC_EMAIL}.")
     except Exception as e:
         logger.error(f"Error sending test emails: {e}")
\ No newline at end of file
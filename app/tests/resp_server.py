@@ -0,0 +1,128 @@
+import socketserver
+import threading
+import time
+
+
+class FakeRespServer:
+    """
+    In-process server speaking enough of the Redis protocol for the RESP client and OTP store
+    tests: GET, SET (with PX), DEL, INCR, PEXPIRE, WATCH/UNWATCH/MULTI/EXEC, AUTH, SELECT and PING.
+    """
+
+    def __init__(self, password: str = None):
+        self.password = password
+        self.data = {}
+        self.expiries = {}
+        self.versions = {}
+        self.commands = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                state = {"watched": {}, "queued": None, "authenticated": server.password is None}
+                while True:
+                    command = self._read_command()
+                    if command is None:
+                        return
+                    self.wfile.write(server.dispatch(state, command))
+
+            def _read_command(self):
+                line = self.rfile.readline()
+                if not line:
+                    return None
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                return args
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"redis://{f':{self.password}@' if self.password else ''}{host}:{port}/0"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def dispatch(self, state: dict, args: list) -> bytes:
+        name = args[0].decode().upper()
+        with self.lock:
+            self.commands.append(name)
+            if name == "AUTH":
+                state["authenticated"] = args[1].decode() == self.password
+                return b"+OK\r\n" if state["authenticated"] else b"-WRONGPASS invalid password\r\n"
+            if not state["authenticated"]:
+                return b"-NOAUTH Authentication required.\r\n"
+            if state["queued"] is not None and name not in ("EXEC", "MULTI", "WATCH"):
+                state["queued"].append(args)
+                return b"+QUEUED\r\n"
+            if name == "MULTI":
+                state["queued"] = []
+                return b"+OK\r\n"
+            if name == "WATCH":
+                for key in args[1:]:
+                    state["watched"][key] = self.versions.get(key, 0)
+                return b"+OK\r\n"
+            if name == "UNWATCH":
+                state["watched"] = {}
+                return b"+OK\r\n"
+            if name == "EXEC":
+                queued, state["queued"] = state["queued"], None
+                watched, state["watched"] = state["watched"], {}
+                if any(self.versions.get(key, 0) != version for key, version in watched.items()):
+                    return b"*-1\r\n"
+                return b"*%d\r\n" % len(queued) + b"".join(self._apply(command) for command in queued)
+            return self._apply(args)
+
+    def _apply(self, args: list) -> bytes:
+        name, keys = args[0].decode().upper(), args[1:]
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name == "SELECT":
+            return b"+OK\r\n"
+        if name == "GET":
+            value = self._get(keys[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == "SET":
+            self._write(keys[0], keys[1])
+            if len(keys) > 3 and keys[2].upper() == b"PX":
+                self.expiries[keys[0]] = time.monotonic() + int(keys[3]) / 1000
+            return b"+OK\r\n"
+        if name == "INCR":
+            value = int(self._get(keys[0]) or 0) + 1
+            self._write(keys[0], str(value).encode(), keep_ttl=True)
+            return b":%d\r\n" % value
+        if name == "PEXPIRE":
+            if self._get(keys[0]) is None:
+                return b":0\r\n"
+            self.expiries[keys[0]] = time.monotonic() + int(keys[1]) / 1000
+            return b":1\r\n"
+        if name == "DEL":
+            removed = 0
+            for key in keys:
+                if self._get(key) is not None:
+                    removed += 1
+                    self.data.pop(key)
+                    self.expiries.pop(key, None)
+                    self.versions[key] = self.versions.get(key, 0) + 1
+            return b":%d\r\n" % removed
+        return b"-ERR unknown command '%s'\r\n" % name.encode()
+
+    def _get(self, key: bytes):
+        expires_at = self.expiries.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expiries.pop(key, None)
+        return self.data.get(key)
+
+    def _write(self, key: bytes, value: bytes, keep_ttl: bool = False):
+        self.data[key] = value
+        if not keep_ttl:
+            self.expiries.pop(key, None)
+        self.versions[key] = self.versions.get(key, 0) + 1
@@ -0,0 +1,109 @@
+import pytest
+from app.workflows import circuit_breaker
+from app.workflows.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, breaker_for
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+def make_breaker():
+    return CircuitBreaker("test", failure_rate=0.5, window=60, minimum_calls=4, open_seconds=30)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.minimum_calls):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_minimum_calls_and_failure_rate(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    # Every call failed, but fewer than minimum_calls were made
+    assert breaker.state == CLOSED
+
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_old_calls_leave_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 61
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls_in_window"] == 1
+
+
+def test_open_circuit_refuses_calls_until_open_seconds_pass(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    assert not breaker.allow()
+    clock.now += 10
+    assert breaker.retry_after() == pytest.approx(20)
+    assert not breaker.allow()
+    assert breaker.stats()["short_circuited"] == 2
+    clock.now += 20
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.retry_after() == 0
+    assert breaker.allow()
+
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    assert not breaker.allow()
+
+
+def test_released_trial_can_be_retried(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_breakers_are_shared_per_endpoint_without_the_query_string():
+    first = breaker_for("https://example.com/workflows/a?sig=one")
+    assert breaker_for("https://example.com/workflows/a?sig=two") is first
+    assert breaker_for("https://example.com/workflows/b?sig=one") is not first
+    assert first.name == "example.com/workflows/a"
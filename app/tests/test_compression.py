@@ -0,0 +1,87 @@
+import asyncio
+import gzip
+from app.middleware.compression import CompressionMiddleware, parse_accept_encoding
+
+
+def make_app(chunks, content_type="application/json", headers=(), status=200):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type.encode()), *headers],
+        })
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+
+def call(app, accept_encoding="gzip"):
+    messages = []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = dict(messages[0]["headers"])
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return headers, body, messages
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.5, identity;q=0") == {"gzip": 1.0, "br": 0.5, "identity": 0.0}
+
+
+def test_large_response_is_gzipped():
+    payload = b'{"field": "value"}' * 200
+    headers, body, _ = call(CompressionMiddleware(make_app([payload]), minimum_size=500))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(body)).encode()
+    assert gzip.decompress(body) == payload
+
+
+def test_small_response_is_not_compressed():
+    headers, body, _ = call(CompressionMiddleware(make_app([b"{}"]), minimum_size=500))
+    assert b"content-encoding" not in headers
+    assert body == b"{}"
+
+
+def test_client_without_gzip_is_not_compressed():
+    payload = b"x" * 2000
+    headers, body, _ = call(CompressionMiddleware(make_app([payload]), minimum_size=500), accept_encoding="gzip;q=0")
+    assert b"content-encoding" not in headers
+    assert body == payload
+
+
+def test_streaming_response_is_compressed_chunk_by_chunk():
+    chunks = [b"row,value\n" * 100 for _ in range(5)]
+    headers, body, messages = call(CompressionMiddleware(make_app(chunks), minimum_size=500))
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert len(messages) == 1 + len(chunks)
+    assert gzip.decompress(body) == b"".join(chunks)
+
+
+def test_event_stream_is_never_compressed():
+    chunks = [b"data: x\n\n" * 100, b""]
+    headers, body, _ = call(CompressionMiddleware(make_app(chunks, "text/event-stream"), minimum_size=10))
+    assert b"content-encoding" not in headers
+    assert body == b"".join(chunks)
+
+
+def test_compressed_response_gets_a_weak_etag():
+    payload = b'{"field": "value"}' * 200
+    app = make_app([payload], headers=[(b"etag", b'"v1"')])
+    headers, _, _ = call(CompressionMiddleware(app, minimum_size=500))
+    assert headers[b"etag"] == b'W/"v1"'
+    headers, _, _ = call(CompressionMiddleware(app, minimum_size=500), accept_encoding="identity")
+    assert headers[b"etag"] == b'"v1"'
+
+
+def test_not_modified_carries_the_weak_etag():
+    app = make_app([b""], headers=[(b"etag", b'"v1"')], status=304)
+    headers, _, _ = call(CompressionMiddleware(app, minimum_size=500))
+    assert headers[b"etag"] == b'W/"v1"'
@@ -0,0 +1,134 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base import Base
+from app.models.email_outbox import EmailOutbox
+from app.crud.email_outbox import enqueue_notification
+from app.core import email_dispatcher as dispatcher_module
+from app.core.email_dispatcher import EmailDispatcher
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[EmailOutbox.__table__])
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    calls = []
+    outcomes = []
+
+    def send_notification(url, email_type, body, to, cc, bcc, retries):
+        calls.append({"type": email_type, "body": body, "to": to, "bcc": bcc})
+        return outcomes.pop(0) if outcomes else {"status": "success"}
+
+    monkeypatch.setattr(dispatcher_module, "send_notification", send_notification)
+    return calls, outcomes
+
+
+def queue(session_factory, **kwargs):
+    db = session_factory()
+    db_email = enqueue_notification(db, type="OTP", body={"OTP": "123456"}, to=["user@example.com"], **kwargs)
+    db.commit()
+    outbox_id = db_email.outbox_id
+    db.close()
+    return outbox_id
+
+
+def load(session_factory, outbox_id):
+    db = session_factory()
+    row = db.get(EmailOutbox, outbox_id)
+    db.close()
+    return row
+
+
+def make_dispatcher(session_factory, **kwargs):
+    return EmailDispatcher(session_factory, "https://workflow.example", retry_delay=30, lease=120, **kwargs)
+
+
+def test_payload_is_encrypted_at_rest_and_cleared_once_sent(session_factory, sent):
+    outbox_id = queue(session_factory, bcc=["audit@example.com"])
+    assert "123456" not in load(session_factory, outbox_id).payload
+
+    assert make_dispatcher(session_factory).dispatch_once() == 1
+    assert sent[0] == [{"type": "OTP", "body": {"OTP": "123456"}, "to": ["user@example.com"], "bcc": ["audit@example.com"]}]
+    row = load(session_factory, outbox_id)
+    assert (row.status, row.attempts, row.payload) == ("sent", 1, None)
+
+
+def test_claim_skips_rows_that_are_not_due(session_factory, sent):
+    outbox_id = queue(session_factory)
+    db = session_factory()
+    db.get(EmailOutbox, outbox_id).next_attempt_on = datetime.utcnow() + timedelta(minutes=5)
+    db.commit()
+    db.close()
+    assert make_dispatcher(session_factory).dispatch_once() == 0
+    assert sent[0] == []
+
+
+def test_claim_leases_rows_to_one_dispatcher(session_factory, sent):
+    outbox_id = queue(session_factory)
+    dispatcher = make_dispatcher(session_factory)
+    assert [item[0] for item in dispatcher._claim()] == [outbox_id]
+    # Leased until the first dispatcher reports back or its lease runs out
+    assert make_dispatcher(session_factory).dispatch_once() == 0
+    assert load(session_factory, outbox_id).attempts == 1
+
+
+def test_failures_are_retried_with_backoff_then_given_up(session_factory, sent):
+    outbox_id = queue(session_factory)
+    sent[1].extend([{"status": "failure", "error": "HTTP 500"}] * 2)
+    dispatcher = make_dispatcher(session_factory, max_attempts=2)
+
+    before = datetime.utcnow()
+    assert dispatcher.dispatch_once() == 1
+    row = load(session_factory, outbox_id)
+    assert (row.status, row.attempts, row.last_error) == ("pending", 1, "HTTP 500")
+    assert before + timedelta(seconds=14) <= row.next_attempt_on <= before + timedelta(seconds=31)
+    assert row.payload is not None
+
+    db = session_factory()
+    db.get(EmailOutbox, outbox_id).next_attempt_on = before
+    db.commit()
+    db.close()
+    assert dispatcher.dispatch_once() == 1
+    row = load(session_factory, outbox_id)
+    assert (row.status, row.attempts, row.payload) == ("failed", 2, None)
+    assert (dispatcher.retried, dispatcher.failed) == (1, 1)
+
+
+def test_open_circuit_defers_without_using_an_attempt(session_factory, sent):
+    outbox_id = queue(session_factory)
+    sent[1].append({"status": "failure", "circuit_open": True, "retry_after": 10})
+    dispatcher = make_dispatcher(session_factory)
+    assert dispatcher.dispatch_once() == 1
+    row = load(session_factory, outbox_id)
+    assert (row.status, row.attempts) == ("pending", 0)
+    assert dispatcher.deferred == 1
+
+
+def test_undecryptable_payload_is_given_up_at_once(session_factory, sent):
+    outbox_id = queue(session_factory)
+    db = session_factory()
+    db.get(EmailOutbox, outbox_id).payload = "not-a-valid-token"
+    db.commit()
+    db.close()
+    assert make_dispatcher(session_factory).dispatch_once() == 1
+    assert sent[0] == []
+    row = load(session_factory, outbox_id)
+    assert (row.status, row.payload) == ("failed", None)
+
+
+def test_rows_queued_before_encryption_are_still_delivered(session_factory, sent):
+    outbox_id = queue(session_factory)
+    db = session_factory()
+    db.get(EmailOutbox, outbox_id).payload = json.dumps({"OTP": "654321"})
+    db.commit()
+    db.close()
+    make_dispatcher(session_factory).dispatch_once()
+    assert sent[0][0]["body"] == {"OTP": "654321"}
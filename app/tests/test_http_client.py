@@ -0,0 +1,31 @@
+import asyncio
+import json
+import types
+import httpx
+from app.workflows import email as email_module
+from app.workflows.http_client import AsyncWorkflowHttpClient
+
+
+def test_async_send_retries_through_the_async_client(monkeypatch):
+    statuses = [502, 200]
+    captured = []
+
+    def workflow(request):
+        captured.append(json.loads(request.content))
+        return httpx.Response(statuses.pop(0), json={"status": "ok"})
+
+    client = AsyncWorkflowHttpClient(mounts={"all://": httpx.MockTransport(workflow)})
+    monkeypatch.setattr(email_module, "async_workflow_client", client)
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(email_module, "asyncio", types.SimpleNamespace(sleep=sleep))
+    result = asyncio.run(email_module.send_email_async(
+        "https://async-workflow.example/send", "user@example.com", {"OTP": "1"}, "OTP"
+    ))
+    assert result["status"] == "success"
+    assert captured == [{"OTP": "1"}, {"OTP": "1"}]
+    assert len(delays) == 1
+    assert client.stats()["requests"] == 2
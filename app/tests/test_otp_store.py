@@ -0,0 +1,158 @@
+import types
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base import Base
+from app.models.user import User
+from app.models.auth import Otp
+from app.core.otp_store import OtpStore, DatabaseOtpStore, MemoryOtpStore, RespOtpStore, AttemptResult
+from app.utils.resp import RespClient
+from app.tests.resp_server import FakeRespServer
+from app.crud import auth as auth_crud
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    # Let SQLAlchemy manage transactions so savepoints behave as on MySQL
+    event.listen(engine, "connect", lambda connection, _: setattr(connection, "isolation_level", None))
+    event.listen(engine, "begin", lambda connection: connection.exec_driver_sql("BEGIN"))
+    Base.metadata.create_all(engine, tables=[User.__table__, Otp.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(params=["database", "memory", "redis"])
+def store(request):
+    if request.param == "database":
+        yield DatabaseOtpStore()
+    elif request.param == "memory":
+        yield MemoryOtpStore(ttl=300)
+    else:
+        server = FakeRespServer()
+        yield RespOtpStore(RespClient(server.url), ttl=300)
+        server.close()
+
+
+def test_issue_replaces_the_previous_otp(store, db):
+    store.issue(db, 1, "first")
+    store.issue(db, 1, "second")
+    current = store.get(db, 1)
+    assert current.otp == "second" and current.attempts == 0
+    assert store.get(db, 2) is None
+
+
+def test_failures_are_counted_then_lock_out(store, db):
+    otp = store.issue(db, 1, "digest")
+    for attempt in range(1, 4):
+        assert store.register_failure(db, otp, max_attempts=3) is AttemptResult.COUNTED
+        assert store.get(db, 1).attempts == attempt
+    assert store.register_failure(db, otp, max_attempts=3) is AttemptResult.LOCKED
+    db.commit()
+    assert store.get(db, 1) is None
+    assert store.register_failure(db, otp, max_attempts=3) is AttemptResult.MISSING
+
+
+def test_delete_removes_the_current_otp_once(store, db):
+    otp = store.issue(db, 1, "digest")
+    assert store.delete(db, otp) is True
+    assert store.get(db, 1) is None
+    assert store.delete(db, otp) is False
+
+
+def test_stale_record_never_touches_a_reissued_otp(store, db):
+    store.issue(db, 1, "old")
+    stale = store.get(db, 1)
+    store.issue(db, 1, "new")
+    assert store.register_failure(db, stale, max_attempts=0) is AttemptResult.MISSING
+    assert store.delete(db, stale) is False
+    current = store.get(db, 1)
+    assert current.otp == "new" and current.attempts == 0
+
+
+def test_consume_succeeds_only_once(store, db):
+    otp = store.issue(db, 1, "digest")
+    assert store.consume(db, otp, max_attempts=3) is True
+    assert store.consume(db, otp, max_attempts=3) is False
+    assert store.get(db, 1) is None
+
+
+def test_consume_refuses_a_locked_or_replaced_otp(store, db):
+    otp = store.issue(db, 1, "digest")
+    for _ in range(2):
+        store.register_failure(db, otp, max_attempts=2)
+    # Failures counted since the OTP was read are taken into account
+    assert store.consume(db, otp, max_attempts=2) is False
+    assert store.get(db, 1) is not None
+
+    store.issue(db, 1, "new")
+    assert store.consume(db, otp, max_attempts=3) is False
+    assert store.get(db, 1).otp == "new"
+
+
+def test_resp_delete_loses_to_a_concurrent_reissue(db):
+    server = FakeRespServer()
+    try:
+        store = RespOtpStore(RespClient(server.url), ttl=300)
+        other = RespOtpStore(RespClient(server.url), ttl=300)
+        otp = store.issue(db, 1, "old")
+        pipeline = store.client.pipeline
+
+        def reissue_after_watch(*commands):
+            replies = pipeline(*commands)
+            if commands[0][0] == "WATCH":
+                other.issue(db, 1, "new")
+            return replies
+
+        store.client.pipeline = reissue_after_watch
+        assert store.delete(db, otp) is False
+        assert store.get(db, 1).otp == "new"
+    finally:
+        server.close()
+
+
+def test_resp_consume_loses_to_a_concurrent_failure(db):
+    server = FakeRespServer()
+    try:
+        store = RespOtpStore(RespClient(server.url), ttl=300)
+        other = RespOtpStore(RespClient(server.url), ttl=300)
+        otp = store.issue(db, 1, "digest")
+        pipeline = store.client.pipeline
+
+        def fail_after_watch(*commands):
+            replies = pipeline(*commands)
+            if commands[0][0] == "WATCH":
+                other.register_failure(db, otp, max_attempts=3)
+            return replies
+
+        store.client.pipeline = fail_after_watch
+        assert store.consume(db, otp, max_attempts=3) is False
+        assert other.get(db, 1).attempts == 1
+    finally:
+        server.close()
+
+
+def test_database_otp_is_committed_only_with_its_email(db, monkeypatch):
+    monkeypatch.setattr(auth_crud, "otp_store", DatabaseOtpStore())
+
+    def enqueue_fails(*args, **kwargs):
+        raise RuntimeError("outbox unavailable")
+
+    monkeypatch.setattr(auth_crud, "enqueue_notification", enqueue_fails)
+    user = types.SimpleNamespace(user_id=1, email="user@example.com", first_name="A", last_name="B")
+    with pytest.raises(HTTPException) as raised:
+        auth_crud.create_otp(db, user)
+    assert raised.value.status_code == 500
+    assert db.query(Otp).count() == 0
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class IssueOnlyStore(OtpStore):
+        def issue(self, db, user_id, digest):
+            return None
+
+    with pytest.raises(TypeError):
+        IssueOnlyStore()
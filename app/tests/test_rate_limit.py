@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+from app.middleware.rate_limit import RateLimitMiddleware, MemoryRateLimitBackend, RespRateLimitBackend, parse_rules
+from app.utils.resp import RespClient
+from app.tests.resp_server import FakeRespServer
+
+
+def make_app(seen):
+    async def app(scope, receive, send):
+        message = await receive()
+        seen.append(message.get("body", b""))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+
+def call(app, path="/login", body=None, client="10.0.0.1", headers=()):
+    messages = []
+    raw = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "client": (client, 1234),
+        "headers": [(b"content-length", str(len(raw)).encode()), *headers],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": raw, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+def make_middleware(rules, seen, backend=None, **kwargs):
+    return RateLimitMiddleware(make_app(seen), parse_rules(rules), backend or MemoryRateLimitBackend(), **kwargs)
+
+
+def test_ip_limit_rejects_with_retry_after():
+    app = make_middleware({"POST /login": {"ip": [2, 60]}}, [])
+    assert call(app)[0] == 200
+    assert call(app)[0] == 200
+    status, headers = call(app)
+    assert status == 429
+    assert int(headers[b"retry-after"]) >= 1
+    assert call(app, client="10.0.0.2")[0] == 200
+
+
+def test_email_limit_is_case_insensitive_and_body_is_replayed():
+    seen = []
+    app = make_middleware({"POST /login": {"email": [1, 60]}}, seen)
+    assert call(app, body={"email": "User@Example.com"})[0] == 200
+    assert json.loads(seen[0]) == {"email": "User@Example.com"}
+    assert call(app, body={"email": "user@example.com"}, client="10.0.0.9")[0] == 429
+    assert call(app, body={"email": "other@example.com"})[0] == 200
+
+
+def test_unlisted_routes_are_not_limited():
+    app = make_middleware({"POST /login": {"ip": [1, 60]}}, [])
+    for _ in range(3):
+        assert call(app, path="/other")[0] == 200
+
+
+def test_forwarded_header_is_ignored_by_default():
+    app = make_middleware({"POST /login": {"ip": [1, 60]}}, [])
+    assert call(app, headers=[(b"x-forwarded-for", b"1.1.1.1")])[0] == 200
+    assert call(app, headers=[(b"x-forwarded-for", b"2.2.2.2")])[0] == 429
+
+
+def test_forwarded_ip_is_taken_from_the_trusted_hop():
+    app = make_middleware({"POST /login": {"ip": [1, 60]}}, [], trust_forwarded=True)
+    assert call(app, headers=[(b"x-forwarded-for", b"1.1.1.1, 203.0.113.5")])[0] == 200
+    # A client-supplied left-most entry does not give a fresh budget
+    assert call(app, headers=[(b"x-forwarded-for", b"2.2.2.2, 203.0.113.5")])[0] == 429
+    assert call(app, headers=[(b"x-forwarded-for", b"203.0.113.6")])[0] == 200
+
+
+def test_forwarded_hops_count_from_the_right():
+    app = make_middleware({"POST /login": {"ip": [1, 60]}}, [], trust_forwarded=True, forwarded_hops=2)
+    assert call(app, headers=[(b"x-forwarded-for", b"1.1.1.1, 203.0.113.5, 10.0.0.7")])[0] == 200
+    assert call(app, headers=[(b"x-forwarded-for", b"2.2.2.2, 203.0.113.5, 10.0.0.8")])[0] == 429
+    # Too few entries to have passed both proxies: fall back to the peer address
+    assert call(app, headers=[(b"x-forwarded-for", b"203.0.113.9")], client="10.0.0.3")[0] == 200
+    assert call(app, headers=[(b"x-forwarded-for", b"203.0.113.10")], client="10.0.0.3")[0] == 429
+
+
+def test_resp_backend_is_called_off_the_event_loop():
+    server = FakeRespServer()
+    try:
+        backend = RespRateLimitBackend(RespClient(server.url))
+        threads = []
+        hit = backend.hit
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return hit(*args)
+
+        backend.hit = record_thread
+        app = make_middleware({"POST /login": {"ip": [1, 60]}}, [], backend=backend)
+        assert call(app)[0] == 200
+        assert call(app)[0] == 429
+        assert threading.main_thread() not in threads
+    finally:
+        server.close()
@@ -0,0 +1,78 @@
+import socket
+import threading
+import pytest
+from app.utils.resp import RespClient, RespError, RespConnectionError, _encode
+from app.tests.resp_server import FakeRespServer
+
+
+@pytest.fixture
+def server():
+    server = FakeRespServer()
+    yield server
+    server.close()
+
+
+def test_encode_uses_bulk_strings():
+    assert _encode(("SET", "key", 5)) == b"*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$1\r\n5\r\n"
+
+
+def test_replies_are_decoded(server):
+    client = RespClient(server.url)
+    assert client.execute("PING") == "PONG"
+    assert client.execute("SET", "key", "value") == "OK"
+    assert client.execute("GET", "key") == b"value"
+    assert client.execute("GET", "missing") is None
+    assert client.execute("INCR", "counter") == 1
+
+
+def test_error_reply_is_raised_by_execute_and_returned_by_pipeline(server):
+    client = RespClient(server.url)
+    with pytest.raises(RespError):
+        client.execute("BOGUS")
+    replies = client.pipeline(("INCR", "counter"), ("BOGUS",), ("INCR", "counter"))
+    assert replies[0] == 1 and isinstance(replies[1], RespError) and replies[2] == 2
+
+
+def test_transaction_is_discarded_when_a_watched_key_changes(server):
+    client, other = RespClient(server.url), RespClient(server.url)
+    client.execute("SET", "key", "a")
+    client.execute("WATCH", "key")
+    other.execute("SET", "key", "b")
+    assert client.pipeline(("MULTI",), ("DEL", "key"), ("EXEC",))[-1] is None
+    assert client.execute("GET", "key") == b"b"
+
+
+def test_password_is_sent_on_connect():
+    server = FakeRespServer(password="secret")
+    try:
+        assert RespClient(server.url).execute("PING") == "PONG"
+        with pytest.raises(RespError):
+            RespClient(server.url.replace("secret", "wrong")).execute("PING")
+    finally:
+        server.close()
+
+
+def test_each_thread_uses_its_own_connection(server):
+    client = RespClient(server.url)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.execute("INCR", "counter"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == list(range(1, 9))
+
+
+def test_connection_failure_raises():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+    client = RespClient(f"redis://127.0.0.1:{port}/0", timeout=0.5)
+    with pytest.raises(RespConnectionError):
+        client.execute("PING")
+
+
+def test_unsupported_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        RespClient("http://localhost:6379")
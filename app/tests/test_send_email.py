@@ -0,0 +1,113 @@
+import types
+from http import HTTPStatus
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from app.workflows import email as email_module
+from app.workflows.email import send_email, backoff_delay, is_retryable_status
+from app.workflows.circuit_breaker import breaker_for
+from app.workflows.http_client import workflow_client
+
+
+class ScriptedWorkflow(BaseAdapter):
+    """
+    Transport adapter answering a fixed sequence of statuses (None times out).
+    """
+
+    def __init__(self, *outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.captured = []
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        outcome = self.outcomes.pop(0)
+        self.captured.append(request.body)
+        if outcome is None:
+            raise requests.exceptions.ReadTimeout("Scripted workflow did not answer.", request=request)
+        response = requests.Response()
+        response.status_code = outcome
+        response.reason = HTTPStatus(outcome).phrase
+        response.headers = CaseInsensitiveDict({"Retry-After": "1"} if outcome == 429 else {})
+        response._content = b"{}"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def workflow(monkeypatch, request):
+    delays = []
+    monkeypatch.setattr(email_module, "time", types.SimpleNamespace(sleep=delays.append))
+    url = f"scripted-{request.node.name}://workflow/send"
+
+    def script(*outcomes):
+        fake = ScriptedWorkflow(*outcomes)
+        workflow_client.mount(url.split("//")[0] + "//", fake)
+        return fake
+
+    return url, script, delays
+
+
+def test_retryable_statuses():
+    assert is_retryable_status(429)
+    assert is_retryable_status(500) and is_retryable_status(503)
+    assert not is_retryable_status(400) and not is_retryable_status(404)
+
+
+def test_backoff_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(email_module, "WORKFLOW_BACKOFF_MAX_SECONDS", 8)
+    for attempt in range(3):
+        delays = [backoff_delay(attempt, 0.5) for _ in range(200)]
+        assert all(0 <= delay <= 0.5 * 2 ** attempt for delay in delays)
+        assert len(set(delays)) > 1
+    assert all(backoff_delay(10, 0.5) <= 8 for _ in range(200))
+
+
+def test_backoff_honours_retry_after_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(email_module, "WORKFLOW_BACKOFF_MAX_SECONDS", 8)
+    assert backoff_delay(0, 0.5, retry_after=3) == 3
+    assert backoff_delay(0, 0.5, retry_after=120) == 8
+
+
+def test_success_after_retryable_failures(workflow):
+    url, script, delays = workflow
+    fake = script(500, 429, 200)
+    result = send_email(url, "user@example.com", {"OTP": "1"}, "OTP", retries=3)
+    assert result["status"] == "success"
+    assert len(fake.captured) == 3
+    # The 429 carried Retry-After: 1
+    assert len(delays) == 2 and delays[1] >= 1
+
+
+def test_client_errors_are_not_retried(workflow):
+    url, script, delays = workflow
+    fake = script(400, 200)
+    result = send_email(url, "user@example.com", {}, "OTP", retries=3)
+    assert result["status"] == "failure" and result["error"].startswith("400")
+    assert len(fake.captured) == 1 and delays == []
+    # The endpoint answered, so the rejection counts as healthy
+    assert breaker_for(url).stats()["failures_in_window"] == 0
+
+
+def test_timeouts_are_retried_until_attempts_run_out(workflow):
+    url, script, delays = workflow
+    script(None, 502, 503)
+    result = send_email(url, "user@example.com", {}, "OTP", retries=3)
+    assert result["status"] == "failure" and result["error"].startswith("Max retries exceeded")
+    assert len(delays) == 2
+    assert breaker_for(url).stats()["failures_in_window"] == 3
+
+
+def test_open_circuit_returns_at_once(workflow):
+    url, script, delays = workflow
+    breaker = breaker_for(url)
+    for _ in range(breaker.minimum_calls):
+        breaker.record_failure()
+    fake = script(200)
+    result = send_email(url, "user@example.com", {}, "OTP", retries=3)
+    assert result["circuit_open"] is True and result["retry_after"] > 0
+    assert fake.outcomes == [200]
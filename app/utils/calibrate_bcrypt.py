@@ -0,0 +1,120 @@
+"""
+Measure bcrypt on the current hardware and pick the cost factor for `BCRYPT_ROUNDS`.
+
+Run it on the instance type the service is deployed to:
+
+    python -m app.utils.calibrate_bcrypt --target-ms 250
+    python -m app.utils.calibrate_bcrypt --target-ms 250 --env-file .env
+
+The chosen cost is printed as `BCRYPT_ROUNDS=<n>` and, with `--env-file`, written to that file.
+Existing hashes are moved to the new cost as their users next log in.
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+import bcrypt
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# bcrypt accepts costs 4-31; going below 10 is not considered safe for passwords
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+SAFE_MIN_ROUNDS = 10
+
+
+def measure_rounds(rounds: int, samples: int = 3) -> float:
+    """
+    Time one bcrypt hash at the given cost.
+
+    Args:
+        rounds (int): bcrypt cost factor (log2 of the iteration count).
+        samples (int): Number of hashes to time.
+
+    Returns:
+        float: Median hashing time in milliseconds.
+    """
+    password = b"calibration-password"
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(password, salt)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int = SAFE_MIN_ROUNDS, max_rounds: int = 16, samples: int = 3) -> tuple[int, dict]:
+    """
+    Find the highest bcrypt cost whose hashing time fits within `target_ms`.
+
+    Each extra round doubles the work, so costs are measured in increasing order and the
+    search stops at the first one over the target.
+
+    Args:
+        target_ms (float): Latency budget for one hash, in milliseconds.
+        min_rounds (int): Lowest cost ever returned, even if it exceeds the target.
+        max_rounds (int): Highest cost considered.
+        samples (int): Hashes timed per cost.
+
+    Returns:
+        tuple[int, dict]: The chosen cost and the measured milliseconds per cost.
+    """
+    chosen = min_rounds
+    timings = {}
+    for rounds in range(MIN_ROUNDS, max_rounds + 1):
+        elapsed = measure_rounds(rounds, samples)
+        timings[rounds] = elapsed
+        logger.info(f"bcrypt cost {rounds}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = max(chosen, rounds)
+    return chosen, timings
+
+
+def write_env_file(path: str, rounds: int):
+    """
+    Set `BCRYPT_ROUNDS` in a dotenv file, replacing an existing entry or appending one.
+    """
+    lines = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    entry = f"BCRYPT_ROUNDS={rounds}"
+    for index, line in enumerate(lines):
+        if line.strip().startswith("BCRYPT_ROUNDS="):
+            lines[index] = entry
+            break
+    else:
+        lines.append(entry)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Pick the bcrypt cost factor for this hardware.")
+    parser.add_argument("--target-ms", type=float, default=250, help="Latency budget for one password hash.")
+    parser.add_argument("--min-rounds", type=int, default=SAFE_MIN_ROUNDS, help="Lowest cost to accept.")
+    parser.add_argument("--max-rounds", type=int, default=16, help="Highest cost to try.")
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per cost.")
+    parser.add_argument("--env-file", help="Dotenv file to store BCRYPT_ROUNDS in.")
+    args = parser.parse_args(argv)
+
+    if not MIN_ROUNDS <= args.min_rounds <= args.max_rounds <= MAX_ROUNDS:
+        parser.error(f"rounds must satisfy {MIN_ROUNDS} <= --min-rounds <= --max-rounds <= {MAX_ROUNDS}")
+
+    rounds, timings = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    for cost, elapsed in timings.items():
+        print(f"cost {cost:2d}: {elapsed:8.1f} ms")
+    if rounds not in timings or timings[rounds] > args.target_ms:
+        print(f"Warning: cost {rounds} exceeds the {args.target_ms:.0f} ms target; it is the configured minimum.")
+    print(f"BCRYPT_ROUNDS={rounds}")
+    if args.env_file:
+        write_env_file(args.env_file, rounds)
+        print(f"Written to {args.env_file}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,56 +2,56 @@ import logging
 from fastapi import HTTPException, status
 from app.schemas.token import OTP
 from app.models.user import User
-from app.models.auth import Otp
+from app.core.otp_store import otp_store, AttemptResult
+from app.config import OTP_MAX_ATTEMPTS
+from app.crud.cache_version import bump_cache_version
+from app.core.user_cache import user_cache
+from app.core.security_stamps import security_stamps, rotate_security_stamp
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 
 def verify_otp_attempts(db, otp: OTP):
     """
-    Verify and update the OTP attempt count, handling the case where the maximum number of attempts is reached.
+    Count a failed OTP attempt, handling the case where the maximum number of attempts is reached.
+
+    The attempt is counted with a single atomic operation in the OTP store. Once `OTP_MAX_ATTEMPTS`
+    failures have been counted, the next one removes the OTP and deactivates the user in the same
+    transaction.
 
     Args:
         db: Database session to perform queries and operations.
-        otp (OTP): OTP schema object containing the OTP ID and the number of attempts.
-
-    Returns:
-        Otp: Updated OTP object from the database.
+        otp (OTP): OTP schema object containing the OTP ID and the user ID.
 
     Raises:
         HTTPException: 403 if max attempts are reached and OTP is deleted,
-                       404 if the OTP is not found,
+                       404 if the OTP or user is not found,
                        500 for any internal server error.
     """
-    # Check if the maximum number of attempts has been reached
-    if otp.attempts >= 3:
-        # Retrieve and delete OTP if max attempts are reached
-        db_otp = db.query(Otp).filter(Otp.otp_id == otp.otp_id).first()
-        db_user = db.query(User).filter(User.user_id == otp.user_id).first()
-        if db_otp:
-            db.delete(db_otp)
-            db.commit()
-            logger.warning(f"Max attempts reached for OTP ID: {otp.otp_id}. OTP deleted.")
-            if db_user:
-                setattr(db_user, "is_active", False)
-                db.commit()
-                logger.warning(f"User with ID {otp.user_id} deactivated.")
-            else:
-                logger.warning(f"User with ID {otp.user_id} not found during max attempt check.")
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Max OTP attempts reached.")
-        else:
-            logger.warning(f"OTP with ID {otp.otp_id} not found during max attempt check.")
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OTP not found.")
-    
-    # Update OTP attempt count if within the limits
-    db_otp = db.query(Otp).filter(Otp.otp_id == otp.otp_id).first()
-    if db_otp:
-        setattr(db_otp, "attempts", otp.attempts + 1)
-        db.commit()
-        db.refresh(db_otp)
-        logger.info(f"OTP with ID {otp.otp_id} updated successfully. Attempt count: {otp.attempts + 1}.")
-        return db_otp
-    else:
+    result = otp_store.register_failure(db, otp, int(OTP_MAX_ATTEMPTS or 3))
+    if result is AttemptResult.MISSING:
+        db.rollback()
         logger.warning(f"OTP with ID {otp.otp_id} not found during update attempt.")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="OTP not found.")
+
+    if result is AttemptResult.COUNTED:
+        logger.info(f"Failed attempt counted for OTP ID: {otp.otp_id}.")
+        return
+
+    logger.warning(f"Max attempts reached for OTP ID: {otp.otp_id}. OTP deleted.")
+    db_user = db.query(User).filter(User.user_id == otp.user_id).first()
+    if db_user is None:
+        db.commit()
+        logger.warning(f"User with ID {otp.user_id} not found during max attempt check.")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+
+    db_user.is_active = False
+    rotate_security_stamp(db_user)
+    bump_cache_version(db, User.__tablename__)
+    # Commits the OTP removal and the deactivation together
+    db.commit()
+    # Deactivation must apply to the user's very next request
+    user_cache.invalidate(db_user.email)
+    security_stamps.record(db_user.user_id, db_user.security_stamp)
+    logger.warning(f"User with ID {otp.user_id} deactivated.")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Max OTP attempts reached.")
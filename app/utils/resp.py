@@ -0,0 +1,151 @@
+import socket
+import threading
+import logging
+from urllib.parse import urlparse, parse_qs, unquote
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+class RespError(Exception):
+    """
+    Error reply returned by the server (a RESP `-ERR ...` line).
+    """
+
+class RespConnectionError(Exception):
+    """
+    The server could not be reached or the connection broke mid-command.
+    """
+
+class RespClient:
+    """
+    Minimal blocking client for the Redis serialisation protocol (RESP2).
+
+    Works against Redis or any server speaking the same protocol, over TCP
+    (`redis://[:password@]host:port/db`) or a local Unix socket (`unix:///path/to.sock?db=0`).
+    Each thread keeps its own connection, opened on first use and dropped after a failure.
+
+    Args:
+        url (str): Server URL.
+        timeout (float): Socket connect and read timeout in seconds.
+    """
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        parsed = urlparse(url)
+        self.scheme = parsed.scheme
+        self.timeout = timeout
+        if parsed.scheme == "unix":
+            self.address = parsed.path
+            self.db = int(parse_qs(parsed.query).get("db", ["0"])[0])
+        elif parsed.scheme == "redis":
+            self.address = (parsed.hostname or "localhost", parsed.port or 6379)
+            self.db = int(parsed.path.lstrip("/") or 0)
+        else:
+            raise ValueError(f"Unsupported RESP URL scheme: {parsed.scheme}")
+        self.password = unquote(parsed.password) if parsed.password else None
+        self._local = threading.local()
+
+    def execute(self, *args):
+        """
+        Send one command and return its decoded reply.
+
+        Raises:
+            RespError: If the server replies with an error.
+            RespConnectionError: If the connection fails.
+        """
+        reply = self.pipeline(args)[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def pipeline(self, *commands) -> list:
+        """
+        Send several commands in one write and read their replies in order.
+
+        Error replies are returned in place as `RespError` instances rather than raised, so the
+        caller can tell which command failed.
+
+        Raises:
+            RespConnectionError: If the connection fails.
+        """
+        connection = self._connection()
+        try:
+            connection[0].sendall(b"".join(_encode(command) for command in commands))
+            return [self._read(connection[1]) for _ in commands]
+        except (OSError, EOFError) as e:
+            self._close()
+            raise RespConnectionError(str(e)) from e
+
+    def close(self):
+        self._close()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        try:
+            if self.scheme == "unix":
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        except OSError as e:
+            raise RespConnectionError(f"Cannot connect to {self.address}: {e}") from e
+        connection = (sock, sock.makefile("rb"))
+        self._local.connection = connection
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in self.pipeline(*setup):
+                if isinstance(reply, RespError):
+                    self._close()
+                    raise reply
+        return connection
+
+    def _close(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection[1].close()
+                connection[0].close()
+            except OSError:
+                pass
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            return RespError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = reader.read(length + 2)
+            if len(data) != length + 2:
+                raise EOFError("Connection closed by server")
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read(reader) for _ in range(length)]
+        raise EOFError(f"Unexpected RESP reply: {line!r}")
+
+def _encode(command) -> bytes:
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
@@ -0,0 +1,66 @@
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+class SyncToken(NamedTuple):
+    """
+    Position of a client in a change feed.
+
+    Attributes:
+        updated_on (Optional[datetime]): `updated_on` of the last row the client has seen.
+        row_id (int): Primary key of that row, used to break ties on equal timestamps.
+        deleted_on (Optional[datetime]): `deleted_on` of the last tombstone the client has seen.
+        tombstone_id (int): ID of that tombstone, used to break ties on equal timestamps.
+    """
+    updated_on: Optional[datetime] = None
+    row_id: int = 0
+    tombstone_id: int = 0
+    deleted_on: Optional[datetime] = None
+
+def encode_sync_token(token: SyncToken) -> str:
+    """
+    Encode a sync position as an opaque, URL-safe string.
+
+    Args:
+        token (SyncToken): The position to encode.
+
+    Returns:
+        str: The opaque sync token handed to clients.
+    """
+    raw = json.dumps({
+        "t": token.updated_on.isoformat() if token.updated_on else None,
+        "r": token.row_id,
+        "d": token.tombstone_id,
+        "e": token.deleted_on.isoformat() if token.deleted_on else None
+    }, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_sync_token(value: Optional[str]) -> SyncToken:
+    """
+    Decode an opaque sync token; an empty token means "from the beginning".
+
+    Args:
+        value (Optional[str]): The token received from a client.
+
+    Returns:
+        SyncToken: The decoded sync position.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    if not value:
+        return SyncToken()
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        data = json.loads(raw)
+        updated_on = datetime.fromisoformat(data["t"]) if data.get("t") else None
+        deleted_on = datetime.fromisoformat(data["e"]) if data.get("e") else None
+        return SyncToken(
+            updated_on=updated_on,
+            row_id=int(data.get("r", 0)),
+            tombstone_id=int(data.get("d", 0)),
+            deleted_on=deleted_on
+        )
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid sync token.") from e
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from app.config import (
+    WORKFLOW_BREAKER_FAILURE_RATE, WORKFLOW_BREAKER_WINDOW_SECONDS, WORKFLOW_BREAKER_MINIMUM_CALLS,
+    WORKFLOW_BREAKER_OPEN_SECONDS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one outbound endpoint.
+
+    While closed, the outcome of every call in the last `window` seconds is kept. Once at least
+    `minimum_calls` were made and the share of failures reaches `failure_rate`, the circuit
+    opens and `allow` refuses calls for `open_seconds`, so callers fail immediately instead of
+    waiting on a dead endpoint. After that a single trial call is let through (half-open): its
+    success closes the circuit, its failure opens it again.
+
+    Args:
+        name (str): Name used in logs and metrics.
+        failure_rate (float): Share of failed calls (0-1) that opens the circuit.
+        window (float): Seconds of call history considered.
+        minimum_calls (int): Calls needed in the window before the circuit can open.
+        open_seconds (float): Seconds the circuit stays open before a trial call.
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, window: float = 60, minimum_calls: int = 5, open_seconds: float = 30):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._calls = deque()
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    def allow(self) -> bool:
+        """
+        Whether a call may be made now. A True result in half-open state reserves the trial call.
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.short_circuited += 1
+                    return False
+                self.state = HALF_OPEN
+                logger.info(f"Circuit {self.name} half-open; sending a trial call.")
+            if self.state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self.short_circuited += 1
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def retry_after(self) -> float:
+        """
+        Seconds until the circuit lets a call through again (0 when it is closed).
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._trial_in_flight = False
+                self._calls.clear()
+                logger.info(f"Circuit {self.name} closed.")
+                return
+            self._record(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+                self._open()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._calls if not ok)
+            if len(self._calls) >= self.minimum_calls and failures / len(self._calls) >= self.failure_rate:
+                self._open()
+
+    def release(self):
+        """
+        Give back a call allowed by `allow` that never reached the endpoint, recording no outcome.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            failures = sum(1 for _, ok in self._calls if not ok)
+            return {
+                "state": self.state,
+                "calls_in_window": len(self._calls),
+                "failures_in_window": failures,
+                "times_opened": self.times_opened,
+                "short_circuited": self.short_circuited
+            }
+
+    def _record(self, ok: bool):
+        now = time.monotonic()
+        self._calls.append((now, ok))
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self._calls.clear()
+        logger.warning(f"Circuit {self.name} opened for {self.open_seconds:.0f} seconds.")
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """
+    Return the shared circuit breaker of an endpoint, creating it on first use.
+
+    Breakers are keyed by host and path; the query string, which carries the workflow's
+    signature, is left out of keys, logs and metrics.
+    """
+    parts = urlsplit(url or "")
+    name = f"{parts.netloc}{parts.path}"
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                failure_rate=WORKFLOW_BREAKER_FAILURE_RATE,
+                window=WORKFLOW_BREAKER_WINDOW_SECONDS,
+                minimum_calls=WORKFLOW_BREAKER_MINIMUM_CALLS,
+                open_seconds=WORKFLOW_BREAKER_OPEN_SECONDS
+            )
+        return breaker
+
+
+def breaker_stats() -> dict:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
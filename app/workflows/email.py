@@ -1,72 +1,194 @@
+import httpx
 import requests
 import logging
+import random
 import time
+import asyncio
+from typing import Optional
+from app.workflows.http_client import workflow_client, async_workflow_client, WorkflowBusyError
+from app.workflows.circuit_breaker import breaker_for, CircuitBreaker
+from app.config import WORKFLOW_BACKOFF_MAX_SECONDS
 
 # Set up logging for this module
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)  # Adjust the level based on your needs
 
-def send_email(workflow_url: str, email: str, body: dict, type: str, retries: int = 3, backoff_factor: float = 0.5) -> dict:
+# Headers for the POST request
+HEADERS = {"Content-Type": "application/json"}
+
+def is_retryable_status(status_code: int) -> bool:
+    """
+    Whether a workflow response is worth retrying: throttling (429) and server errors (5xx).
+    """
+    return status_code == 429 or status_code >= 500
+
+def backoff_delay(attempt: int, backoff_factor: float, retry_after: Optional[float] = None) -> float:
     """
-    Sends an OTP to the specified email using an external API with retry mechanism.
+    Exponential backoff with full jitter.
 
     Args:
-        email (str): The recipient's email address.
-        otp (int): The OTP code to be sent.
-        retries (int): Number of retry attempts in case of failure.
-        backoff_factor (float): Factor by which to increase wait time between retries.
+        attempt (int): Zero-based number of the attempt that just failed.
+        backoff_factor (float): Base delay in seconds; doubled for every further attempt.
+        retry_after (float | None): Delay requested by the server through Retry-After.
 
     Returns:
-        dict: The API response if successful, or an error message if the request fails.
+        float: Seconds to wait, at most `WORKFLOW_BACKOFF_MAX_SECONDS`.
     """
+    delay = random.uniform(0, min(WORKFLOW_BACKOFF_MAX_SECONDS, backoff_factor * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, WORKFLOW_BACKOFF_MAX_SECONDS))
+    return delay
 
-    # Prepare the payload (body) for the POST request
-    payload = body
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
 
-    # Prepare the headers for the POST request
-    headers = {
-        "Content-Type": "application/json"
+def _json_or_text(response):
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+def _circuit_open(breaker: CircuitBreaker, type: str, email: str) -> dict:
+    logger.warning(f"Circuit {breaker.name} is open; not sending {type} to {email}.")
+    return {
+        "status": "failure",
+        "error": f"Circuit open for {breaker.name}.",
+        "circuit_open": True,
+        "retry_after": breaker.retry_after()
     }
 
-    attempt = 0
-    while attempt < retries:
+def send_email(workflow_url: str, email: str, body: dict, type: str, retries: int = 3, backoff_factor: float = 0.5) -> dict:
+    """
+    Sends an email through the Power Automate workflow with retries and a circuit breaker.
+
+    Calls go through the shared, pooled `workflow_client`, which bounds each one with connect
+    and read timeouts. Timeouts, connection errors, 429 and 5xx responses are retried with
+    jittered exponential backoff. Failures also feed the endpoint's circuit breaker; while it
+    is open this returns at once with `circuit_open` set, so callers can keep the email queued.
+
+    Args:
+        workflow_url (str): The workflow endpoint.
+        email (str): The recipient's email address.
+        body (dict): JSON body posted to the workflow.
+        type (str): Type of email, used for logging.
+        retries (int): Number of attempts in total.
+        backoff_factor (float): Base delay in seconds between attempts, doubled for each retry.
+
+    Returns:
+        dict: The API response if successful, or an error message if the request fails.
+    """
+    breaker = breaker_for(workflow_url)
+    error = None
+    for attempt in range(retries):
+        if not breaker.allow():
+            return _circuit_open(breaker, type, email)
+        retry_after = None
         try:
-            # Log the action of sending the request
             logger.info(f"Attempt {attempt + 1}: Sending {type} to {email}")
+            response = workflow_client.post(workflow_url, json=body, headers=HEADERS)
+        except WorkflowBusyError as busy_err:
+            # Local saturation says nothing about the endpoint's health
+            breaker.release()
+            logger.error(f"Request failed: {busy_err}")
+            return {"status": "failure", "error": str(busy_err)}
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as req_err:
+            breaker.record_failure()
+            error = str(req_err)
+            logger.warning(f"Request failed: {req_err}")
+        except requests.exceptions.RequestException as req_err:
+            breaker.release()
+            logger.error(f"Request failed: {req_err}")
+            return {"status": "failure", "error": str(req_err)}
+        except Exception as err:
+            breaker.release()
+            logger.error(f"An unexpected error occurred: {err}")
+            return {"status": "failure", "error": str(err)}
+        else:
+            if response.ok:
+                breaker.record_success()
+                result = _json_or_text(response)
+                logger.info(f"{type} sent successfully to {email}. Response: {result}")
+                return {"status": "success", "response": result}
+            error = f"{response.status_code} {response.reason}"
+            logger.error(f"HTTP error occurred: {error} - Response: {response.text}")
+            if not is_retryable_status(response.status_code):
+                # The endpoint is up and rejected this request; retrying will not help
+                breaker.record_success()
+                return {"status": "failure", "error": error, "response": response.text}
+            breaker.record_failure()
+            retry_after = _retry_after(response.headers)
 
-            # Send the POST request to the API
-            response = requests.post(workflow_url, json=payload, headers=headers)
+        if attempt + 1 < retries:
+            delay = backoff_delay(attempt, backoff_factor, retry_after)
+            logger.warning(f"Retrying {type} to {email} in {delay:.2f} seconds...")
+            time.sleep(delay)
 
-            # Check the response status code
-            response.raise_for_status()
+    logger.error(f"Failed to send {type} to {email} after {retries} attempts.")
+    return {"status": "failure", "error": f"Max retries exceeded: {error}"}
 
-            # Log and return the successful response
-            logger.info(f"{type} sent successfully to {email}. Response: {response.json()}")
-            return {"status": "success", "response": response.json()}
+async def send_email_async(workflow_url: str, email: str, body: dict, type: str, retries: int = 3, backoff_factor: float = 0.5) -> dict:
+    """
+    Async counterpart of `send_email` for callers running on the event loop.
 
-        except requests.exceptions.HTTPError as http_err:
-            # Log the HTTP error, including response details
-            logger.error(f"HTTP error occurred: {http_err} - Response: {response.text}")
-            if response.status_code == 502:
-                # If it's a 502 error, retry after a delay
-                logger.warning(f"Received 502 Bad Gateway. Retrying in {backoff_factor * (attempt + 1)} seconds...")
-                time.sleep(backoff_factor * (attempt + 1))
-            else:
-                # If it's another HTTP error, return immediately
-                return {"status": "failure", "error": str(http_err), "response": response.text}
+    Uses the shared `async_workflow_client` and the same retry policy and circuit breaker, so it
+    never blocks a thread while waiting.
 
-        except requests.exceptions.RequestException as req_err:
-            # Log and return a general request exception
+    Args:
+        workflow_url (str): The workflow endpoint.
+        email (str): The recipient's email address.
+        body (dict): JSON body posted to the workflow.
+        type (str): Type of email, used for logging.
+        retries (int): Number of attempts in total.
+        backoff_factor (float): Base delay in seconds between attempts, doubled for each retry.
+
+    Returns:
+        dict: The API response if successful, or an error message if the request fails.
+    """
+    breaker = breaker_for(workflow_url)
+    error = None
+    for attempt in range(retries):
+        if not breaker.allow():
+            return _circuit_open(breaker, type, email)
+        retry_after = None
+        try:
+            logger.info(f"Attempt {attempt + 1}: Sending {type} to {email}")
+            response = await async_workflow_client.post(workflow_url, json=body, headers=HEADERS)
+        except WorkflowBusyError as busy_err:
+            breaker.release()
+            logger.error(f"Request failed: {busy_err}")
+            return {"status": "failure", "error": str(busy_err)}
+        except (httpx.TimeoutException, httpx.NetworkError) as req_err:
+            breaker.record_failure()
+            error = str(req_err) or req_err.__class__.__name__
+            logger.warning(f"Request failed: {error}")
+        except httpx.HTTPError as req_err:
+            breaker.release()
             logger.error(f"Request failed: {req_err}")
             return {"status": "failure", "error": str(req_err)}
-
         except Exception as err:
-            # Log and return any other general exceptions
+            breaker.release()
             logger.error(f"An unexpected error occurred: {err}")
             return {"status": "failure", "error": str(err)}
+        else:
+            if response.is_success:
+                breaker.record_success()
+                logger.info(f"{type} sent successfully to {email}.")
+                return {"status": "success", "response": _json_or_text(response)}
+            error = f"{response.status_code} {response.reason_phrase}"
+            logger.error(f"HTTP error occurred: {error} - Response: {response.text}")
+            if not is_retryable_status(response.status_code):
+                breaker.record_success()
+                return {"status": "failure", "error": error, "response": response.text}
+            breaker.record_failure()
+            retry_after = _retry_after(response.headers)
 
-        attempt += 1
+        if attempt + 1 < retries:
+            delay = backoff_delay(attempt, backoff_factor, retry_after)
+            logger.warning(f"Retrying {type} to {email} in {delay:.2f} seconds...")
+            await asyncio.sleep(delay)
 
-    # If all retry attempts fail, return failure
     logger.error(f"Failed to send {type} to {email} after {retries} attempts.")
-    return {"status": "failure", "error": "Max retries exceeded."}
+    return {"status": "failure", "error": f"Max retries exceeded: {error}"}
@@ -0,0 +1,271 @@
+"""
+Local stand-in for the Power Automate email workflow, for load and integration tests.
+
+In process, with no network: set `SEND_EMAIL_URL=fake://workflow` and every workflow call made
+through the shared workflow clients is answered by `fake_workflow`.
+
+As a server, for load tests against a running instance:
+
+    python -m app.workflows.fake_workflow --port 8099
+    SEND_EMAIL_URL=http://127.0.0.1:8099/workflow
+
+Behaviour is set with the FAKE_WORKFLOW_* variables: a latency distribution, error and
+throttling rates and periodic 502 bursts. Received requests are kept for inspection
+(`GET /_captured`, `DELETE /_captured`, `GET /_stats` on the server).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from http import HTTPStatus
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from starlette.types import Receive, Scope, Send
+from app.config import (
+    FAKE_WORKFLOW_LATENCY_MS, FAKE_WORKFLOW_ERROR_RATE, FAKE_WORKFLOW_THROTTLE_RATE,
+    FAKE_WORKFLOW_BURST_EVERY_SECONDS, FAKE_WORKFLOW_BURST_SECONDS, FAKE_WORKFLOW_CAPTURE_SIZE, FAKE_WORKFLOW_SEED
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# URL scheme routed to the in-process fake
+FAKE_SCHEME = "fake://"
+
+
+def parse_latency(spec: str, rng: random.Random):
+    """
+    Parse a latency distribution into a sampler returning seconds.
+
+    Supported specs, in milliseconds: "fixed:<ms>", "uniform:<low>,<high>",
+    "normal:<mean>,<stddev>", "lognormal:<median>,<sigma>" and "exponential:<mean>".
+
+    Raises:
+        ValueError: If the spec is not understood.
+    """
+    kind, _, params = (spec or "fixed:0").partition(":")
+    values = [float(value) for value in params.split(",") if value.strip()]
+    samplers = {
+        ("fixed", 1): lambda: values[0],
+        ("uniform", 2): lambda: rng.uniform(values[0], values[1]),
+        ("normal", 2): lambda: rng.gauss(values[0], values[1]),
+        # Long-tailed, like most real upstream latencies
+        ("lognormal", 2): lambda: values[0] * rng.lognormvariate(0, values[1]),
+        ("exponential", 1): lambda: rng.expovariate(1 / values[0]) if values[0] else 0.0,
+    }
+    sampler = samplers.get((kind.strip().lower(), len(values)))
+    if sampler is None:
+        raise ValueError(f"Unsupported latency distribution: {spec!r}")
+    return lambda: max(sampler(), 0.0) / 1000
+
+
+class FakeWorkflow:
+    """
+    Behaviour and request log of the fake workflow, shared by its ASGI app and requests adapter.
+
+    Each call waits for a latency drawn from the distribution, then answers 502 during a burst
+    (the first `burst_seconds` of every `burst_every` seconds), otherwise 500 with probability
+    `error_rate`, 429 with probability `throttle_rate`, and 200 for the rest.
+
+    Args:
+        latency (str): Latency distribution, see `parse_latency`.
+        error_rate (float): Share of calls answered with 500.
+        throttle_rate (float): Share of calls answered with 429 and a Retry-After header.
+        burst_every (float): Seconds between the starts of 502 bursts; 0 disables bursts.
+        burst_seconds (float): Length of each 502 burst.
+        capture_size (int): Number of most recent requests kept.
+        seed (int): Seed for reproducible runs.
+    """
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 burst_every: float = 0, burst_seconds: float = 0, capture_size: int = 1000, seed: int = None):
+        self._rng = random.Random(seed)
+        self._latency = parse_latency(latency, self._rng)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.burst_every = burst_every
+        self.burst_seconds = burst_seconds
+        self.captured = deque(maxlen=capture_size)
+        self._statuses = Counter()
+        self._latency_total = 0.0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def decide(self) -> tuple:
+        """
+        Draw the outcome of one call.
+
+        Returns:
+            tuple: (latency in seconds, HTTP status code).
+        """
+        with self._lock:
+            latency = self._latency()
+            elapsed = time.monotonic() - self._started
+            if self.burst_every > 0 and elapsed % self.burst_every < self.burst_seconds:
+                status = 502
+            else:
+                roll = self._rng.random()
+                if roll < self.error_rate:
+                    status = 500
+                elif roll < self.error_rate + self.throttle_rate:
+                    status = 429
+                else:
+                    status = 200
+            self._statuses[status] += 1
+            self._latency_total += latency
+            return latency, status
+
+    def record(self, path: str, body: bytes, headers: dict, status: int):
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            payload = body.decode(errors="replace")
+        # The query string carries the real workflow's signature; keep only the path
+        self.captured.append({
+            "path": path.split("?")[0],
+            "body": payload,
+            "content_type": headers.get("content-type"),
+            "status": status,
+            "received_on": time.time()
+        })
+
+    @staticmethod
+    def response(status: int) -> tuple:
+        """
+        Body and headers answered for a status.
+        """
+        headers = {"Content-Type": "application/json"}
+        if status == 429:
+            headers["Retry-After"] = "1"
+        body = {"status": "accepted"} if status < 400 else {"error": HTTPStatus(status).phrase}
+        return json.dumps(body).encode(), headers
+
+    def reset(self):
+        with self._lock:
+            self.captured.clear()
+            self._statuses.clear()
+            self._latency_total = 0.0
+            self._started = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = sum(self._statuses.values())
+            return {
+                "calls": calls,
+                "statuses": {str(status): count for status, count in sorted(self._statuses.items())},
+                "avg_latency_ms": round(self._latency_total / calls * 1000, 1) if calls else None,
+                "captured": len(self.captured)
+            }
+
+
+class FakeWorkflowApp:
+    """
+    ASGI app serving a `FakeWorkflow`: any POST is a workflow call, plus the
+    `/_captured` and `/_stats` inspection routes.
+    """
+
+    def __init__(self, workflow: FakeWorkflow):
+        self.workflow = workflow
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return
+        method, path = scope["method"], scope["path"]
+        if path == "/_captured" and method == "GET":
+            await self._send_json(send, 200, list(self.workflow.captured))
+        elif path == "/_captured" and method == "DELETE":
+            self.workflow.reset()
+            await self._send_json(send, 204, None)
+        elif path == "/_stats" and method == "GET":
+            await self._send_json(send, 200, self.workflow.stats())
+        elif method == "POST":
+            body = b""
+            more_body = True
+            while more_body:
+                message = await receive()
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+            latency, status = self.workflow.decide()
+            await asyncio.sleep(latency)
+            headers = {key.decode().lower(): value.decode() for key, value in scope["headers"]}
+            self.workflow.record(path, body, headers, status)
+            content, response_headers = self.workflow.response(status)
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(key.lower().encode(), value.encode()) for key, value in response_headers.items()]
+            })
+            await send({"type": "http.response.body", "body": content})
+        else:
+            await self._send_json(send, 405, {"error": "Method Not Allowed"})
+
+    @staticmethod
+    async def _send_json(send: Send, status: int, payload):
+        content = json.dumps(payload).encode() if payload is not None else b""
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": content})
+
+
+class FakeWorkflowAdapter(BaseAdapter):
+    """
+    requests transport adapter answering calls from a `FakeWorkflow` in process.
+
+    Latency is spent on the calling thread and a latency above the read timeout raises
+    `ReadTimeout` after the timeout, as a real slow upstream would.
+    """
+
+    def __init__(self, workflow: FakeWorkflow):
+        super().__init__()
+        self.workflow = workflow
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        latency, status = self.workflow.decide()
+        if read_timeout is not None and latency > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Fake workflow did not answer within {read_timeout} seconds.", request=request)
+        time.sleep(latency)
+        body = request.body.encode() if isinstance(request.body, str) else (request.body or b"")
+        self.workflow.record(request.path_url, body, {key.lower(): value for key, value in request.headers.items()}, status)
+
+        content, headers = self.workflow.response(status)
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+# Process-wide fake, used when SEND_EMAIL_URL starts with fake://
+fake_workflow = FakeWorkflow(
+    latency=FAKE_WORKFLOW_LATENCY_MS,
+    error_rate=FAKE_WORKFLOW_ERROR_RATE,
+    throttle_rate=FAKE_WORKFLOW_THROTTLE_RATE,
+    burst_every=FAKE_WORKFLOW_BURST_EVERY_SECONDS,
+    burst_seconds=FAKE_WORKFLOW_BURST_SECONDS,
+    capture_size=FAKE_WORKFLOW_CAPTURE_SIZE,
+    seed=FAKE_WORKFLOW_SEED
+)
+app = FakeWorkflowApp(fake_workflow)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the fake Power Automate workflow.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from app.config import (
+    SEND_EMAIL_URL, WORKFLOW_CONNECT_TIMEOUT_SECONDS, WORKFLOW_READ_TIMEOUT_SECONDS, WORKFLOW_POOL_SIZE,
+    WORKFLOW_MAX_CONCURRENCY, WORKFLOW_ACQUIRE_TIMEOUT_SECONDS
+)
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+
+class WorkflowBusyError(requests.exceptions.RequestException):
+    """
+    Raised when no outbound slot frees up within the acquire timeout.
+    """
+
+
+class _CallStats:
+    """
+    Thread-safe counters and recent latencies of outbound calls.
+    """
+
+    def __init__(self, window: int = 512):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.connections_opened = 0
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, seconds: float, error: bool = False, timeout: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.errors += error
+            self.timeouts += timeout
+            self._latencies.append(seconds * 1000)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            opened = self.connections_opened
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+                "connections_opened": opened,
+                "connections_reused": max(self.requests - opened, 0),
+                "latency_ms": {
+                    "avg": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                    "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1) if latencies else None,
+                    "max": round(latencies[-1], 1) if latencies else None
+                }
+            }
+
+
+class WorkflowHttpClient:
+    """
+    Shared keep-alive HTTP client for calls to the Power Automate workflow.
+
+    One `requests.Session` holds a pool of up to `pool_size` connections per host, so repeated
+    calls skip the DNS lookup and TCP/TLS handshake. Every call has connect and read timeouts,
+    and at most `max_concurrency` calls are in flight at once; a caller that cannot get a slot
+    within `acquire_timeout` seconds fails with `WorkflowBusyError` instead of tying up its
+    thread.
+
+    Args:
+        connect_timeout (float): Seconds to establish a connection.
+        read_timeout (float): Seconds to wait for the response after sending the request.
+        pool_size (int): Keep-alive connections kept per host.
+        max_concurrency (int): Maximum number of calls in flight.
+        acquire_timeout (float): Seconds to wait for a free slot.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 15, pool_size: int = 10,
+                 max_concurrency: int = 10, acquire_timeout: float = 5):
+        self.timeout = (connect_timeout, read_timeout)
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats = _CallStats()
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+    def mount(self, prefix: str, adapter):
+        """
+        Route URLs starting with `prefix` through another transport adapter.
+        """
+        self._session.mount(prefix, adapter)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        POST through the shared session. Keyword arguments are passed to `requests.Session.post`.
+
+        Raises:
+            WorkflowBusyError: If all slots stay busy for `acquire_timeout` seconds.
+            requests.exceptions.RequestException: On connection errors and timeouts.
+        """
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._stats.reject()
+            raise WorkflowBusyError(f"No free outbound slot for {url} within {self.acquire_timeout} seconds.")
+        kwargs.setdefault("timeout", self.timeout)
+        self._stats.started()
+        started = time.perf_counter()
+        error = timeout = False
+        try:
+            return self._session.post(url, **kwargs)
+        except requests.exceptions.Timeout:
+            error = timeout = True
+            raise
+        except requests.exceptions.RequestException:
+            error = True
+            raise
+        finally:
+            self._stats.finished(time.perf_counter() - started, error, timeout)
+            self._slots.release()
+
+    def close(self):
+        self._session.close()
+
+    def stats(self) -> dict:
+        # urllib3 counts the connections each host pool has opened
+        pools = self._adapter.poolmanager.pools
+        self._stats.connections_opened = sum(pools[key].num_connections for key in pools.keys())
+        return self._stats.snapshot()
+
+
+class AsyncWorkflowHttpClient:
+    """
+    `httpx.AsyncClient` counterpart of `WorkflowHttpClient` for async callers.
+
+    Uses the same timeouts, pool size and concurrency cap; connections opened are counted
+    through httpcore's trace extension. `mounts` routes URL prefixes to other transports. Must be
+    closed with `aclose` on shutdown.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 15, pool_size: int = 10,
+                 max_concurrency: int = 10, acquire_timeout: float = 5, mounts: dict = None):
+        self.acquire_timeout = acquire_timeout
+        self.max_concurrency = max_concurrency
+        self._stats = _CallStats()
+        self._slots = None
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            mounts=mounts
+        )
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        POST through the shared async client. Keyword arguments are passed to `httpx.AsyncClient.post`.
+
+        Raises:
+            WorkflowBusyError: If all slots stay busy for `acquire_timeout` seconds.
+            httpx.HTTPError: On connection errors and timeouts.
+        """
+        if self._slots is None:
+            # Created on first use so it binds to the running event loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats.reject()
+            raise WorkflowBusyError(f"No free outbound slot for {url} within {self.acquire_timeout} seconds.")
+        extensions = kwargs.pop("extensions", {})
+        extensions.setdefault("trace", self._trace)
+        self._stats.started()
+        started = time.perf_counter()
+        error = timeout = False
+        try:
+            return await self._client.post(url, extensions=extensions, **kwargs)
+        except httpx.TimeoutException:
+            error = timeout = True
+            raise
+        except httpx.HTTPError:
+            error = True
+            raise
+        finally:
+            self._stats.finished(time.perf_counter() - started, error, timeout)
+            self._slots.release()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def stats(self) -> dict:
+        return self._stats.snapshot()
+
+    async def _trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self._stats.connections_opened += 1
+
+
+_client_options = dict(
+    connect_timeout=WORKFLOW_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=WORKFLOW_READ_TIMEOUT_SECONDS,
+    pool_size=WORKFLOW_POOL_SIZE,
+    max_concurrency=WORKFLOW_MAX_CONCURRENCY,
+    acquire_timeout=WORKFLOW_ACQUIRE_TIMEOUT_SECONDS
+)
+
+# Load testing: with SEND_EMAIL_URL=fake://... workflow calls are answered in process by the
+# fake workflow, with no network
+_use_fake_workflow = (SEND_EMAIL_URL or "").startswith("fake://")
+_async_mounts = None
+if _use_fake_workflow:
+    from app.workflows.fake_workflow import FAKE_SCHEME, FakeWorkflowAdapter, fake_workflow, app as fake_workflow_app
+    _async_mounts = {FAKE_SCHEME: httpx.ASGITransport(app=fake_workflow_app)}
+    logger.warning("SEND_EMAIL_URL points at the fake workflow; no email will be delivered.")
+
+# Process-wide workflow clients
+workflow_client = WorkflowHttpClient(**_client_options)
+async_workflow_client = AsyncWorkflowHttpClient(**_client_options, mounts=_async_mounts)
+if _use_fake_workflow:
+    workflow_client.mount(FAKE_SCHEME, FakeWorkflowAdapter(fake_workflow))
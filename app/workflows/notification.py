@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+from app.workflows.email import send_email
+
+# Set up logging for this module
+logger = logging.getLogger(__name__)
+
+# Separator the workflow splits recipient lists on (as Outlook's "To"/"CC"/"BCC" fields expect)
+RECIPIENT_SEPARATOR = ";"
+
+def join_recipients(recipients: Optional[list]) -> str:
+    """
+    Join a recipient list for the workflow, dropping empty and duplicate addresses.
+    """
+    seen = []
+    for email in recipients or []:
+        if email and email not in seen:
+            seen.append(email)
+    return RECIPIENT_SEPARATOR.join(seen)
+
+def split_recipients(recipients: Optional[str]) -> list:
+    return [email for email in (recipients or "").split(RECIPIENT_SEPARATOR) if email]
+
+def build_notification(body: dict, to: list, cc: list = None, bcc: list = None) -> dict:
+    """
+    Build the workflow payload of one message addressed to several recipients.
+
+    Args:
+        body (dict): Message fields, e.g. names and the OTP.
+        to (list): Primary recipients.
+        cc (list): Visible copy recipients.
+        bcc (list): Hidden copy recipients.
+
+    Returns:
+        dict: `body` plus `To`, `Cc` and `Bcc` as separated address lists. `Email` is set to
+        the `To` list for workflows that predate the recipient fields.
+    """
+    recipients = join_recipients(to)
+    return {
+        **body,
+        "Email": recipients,
+        "To": recipients,
+        "Cc": join_recipients(cc),
+        "Bcc": join_recipients(bcc)
+    }
+
+def send_notification(workflow_url: str, type: str, body: dict, to: list, cc: list = None, bcc: list = None, **kwargs) -> dict:
+    """
+    Send one message to all its recipients with a single workflow call.
+
+    The workflow fans the message out to the `To`, `Cc` and `Bcc` lists, so a message with
+    copies costs one outbound call instead of one per recipient.
+
+    Args:
+        workflow_url (str): The workflow endpoint.
+        type (str): Type of email, used for logging.
+        body (dict): Message fields.
+        to (list): Primary recipients.
+        cc (list): Visible copy recipients.
+        bcc (list): Hidden copy recipients.
+        **kwargs: Passed on to `send_email`, e.g. `retries`.
+
+    Returns:
+        dict: The result of `send_email`.
+    """
+    payload = build_notification(body, to, cc, bcc)
+    return send_email(workflow_url=workflow_url, email=payload["To"], body=payload, type=type, **kwargs)
@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS audit_log (
+    audit_id INT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    row_id INT NOT NULL,
+    action VARCHAR(16) NOT NULL,
+    field_name VARCHAR(64) NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    changed_by VARCHAR(255),
+    changed_on DATETIME NOT NULL,
+    INDEX idx_audit_log_row (table_name, row_id, audit_id)
+);
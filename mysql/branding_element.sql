@@ -5,6 +5,8 @@ CREATE TABLE IF NOT EXISTS Branding_Elements (
     branding_element VARCHAR(255),
     created_by VARCHAR(255),
     created_on DATETIME,
+    updated_on DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    INDEX idx_branding_elements_updated_on (updated_on, branding_element_id),
     FOREIGN KEY (req_branding_elements_type_id) REFERENCES Request_Branding_Elements_Type(req_branding_elements_type_id),
     FOREIGN KEY (request_id) REFERENCES Request(request_id)
 );
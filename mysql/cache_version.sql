@@ -0,0 +1,89 @@
+CREATE TABLE IF NOT EXISTS cache_version (
+    name VARCHAR(64) PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_on DATETIME NOT NULL
+);
+
+INSERT IGNORE INTO cache_version (name, version, updated_on)
+VALUES
+('lookup', 0, NOW()),
+('Request_Type', 0, NOW()),
+('Branding_Elements_Type', 0, NOW()),
+('Request_Branding_Elements_Type', 0, NOW()),
+('territory_info', 0, NOW()),
+('channel_info', 0, NOW()),
+('brand_info', 0, NOW()),
+('user', 0, NOW()),
+('revoked_token', 0, NOW());
+
+-- Reference tables cached in process are also written outside the API (seed scripts, manual fixes);
+-- these triggers bump their version on every write so all workers reload them within a poll.
+CREATE TRIGGER IF NOT EXISTS trg_lookup_cache_ai AFTER INSERT ON Lookup FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('lookup', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_lookup_cache_au AFTER UPDATE ON Lookup FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('lookup', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_lookup_cache_ad AFTER DELETE ON Lookup FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('lookup', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+
+CREATE TRIGGER IF NOT EXISTS trg_request_type_cache_ai AFTER INSERT ON Request_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Request_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_request_type_cache_au AFTER UPDATE ON Request_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Request_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_request_type_cache_ad AFTER DELETE ON Request_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Request_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+
+CREATE TRIGGER IF NOT EXISTS trg_branding_elements_type_cache_ai AFTER INSERT ON Branding_Elements_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Branding_Elements_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_branding_elements_type_cache_au AFTER UPDATE ON Branding_Elements_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Branding_Elements_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_branding_elements_type_cache_ad AFTER DELETE ON Branding_Elements_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Branding_Elements_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+
+CREATE TRIGGER IF NOT EXISTS trg_request_branding_elements_type_cache_ai AFTER INSERT ON Request_Branding_Elements_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Request_Branding_Elements_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_request_branding_elements_type_cache_au AFTER UPDATE ON Request_Branding_Elements_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Request_Branding_Elements_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_request_branding_elements_type_cache_ad AFTER DELETE ON Request_Branding_Elements_Type FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('Request_Branding_Elements_Type', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+
+CREATE TRIGGER IF NOT EXISTS trg_territory_info_cache_ai AFTER INSERT ON Territory_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('territory_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_territory_info_cache_au AFTER UPDATE ON Territory_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('territory_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_territory_info_cache_ad AFTER DELETE ON Territory_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('territory_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+
+CREATE TRIGGER IF NOT EXISTS trg_channel_info_cache_ai AFTER INSERT ON Channel_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('channel_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_channel_info_cache_au AFTER UPDATE ON Channel_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('channel_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_channel_info_cache_ad AFTER DELETE ON Channel_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('channel_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+
+CREATE TRIGGER IF NOT EXISTS trg_brand_info_cache_ai AFTER INSERT ON Brand_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('brand_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_brand_info_cache_au AFTER UPDATE ON Brand_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('brand_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
+CREATE TRIGGER IF NOT EXISTS trg_brand_info_cache_ad AFTER DELETE ON Brand_Info FOR EACH ROW
+    INSERT INTO cache_version (name, version, updated_on) VALUES ('brand_info', 1, UTC_TIMESTAMP())
+    ON DUPLICATE KEY UPDATE version = version + 1, updated_on = UTC_TIMESTAMP();
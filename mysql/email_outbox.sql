@@ -0,0 +1,22 @@
+CREATE TABLE IF NOT EXISTS email_outbox (
+    outbox_id INT AUTO_INCREMENT PRIMARY KEY,
+    email_type VARCHAR(64) NOT NULL,
+    recipient VARCHAR(1024) NOT NULL,
+    cc VARCHAR(1024),
+    bcc VARCHAR(1024),
+    payload TEXT,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_on DATETIME NOT NULL,
+    last_error TEXT,
+    created_on DATETIME NOT NULL,
+    sent_on DATETIME,
+    INDEX idx_email_outbox_due (status, next_attempt_on)
+);
+
+CREATE EVENT IF NOT EXISTS delete_old_email_outbox
+ON SCHEDULE EVERY 1 DAY
+STARTS CURRENT_DATE + INTERVAL 23 HOUR + INTERVAL 59 MINUTE
+DO
+DELETE FROM email_outbox
+WHERE status <> 'pending' AND created_on < UTC_TIMESTAMP() - INTERVAL 30 DAY;
@@ -0,0 +1,11 @@
+-- One-off migration for databases created before the change feed columns were added.
+-- Fresh installs get them from request.sql and branding_element.sql; run this once, not on every deploy.
+
+ALTER TABLE Request
+    ADD COLUMN created_on DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6),
+    ADD COLUMN updated_on DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_request_updated_on (updated_on, request_id);
+
+ALTER TABLE Branding_Elements
+    ADD COLUMN updated_on DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_branding_elements_updated_on (updated_on, branding_element_id);
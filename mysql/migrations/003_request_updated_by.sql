@@ -0,0 +1,4 @@
+-- One-off migration: last editor of a request, for databases created before the column was added.
+
+ALTER TABLE Request
+    ADD COLUMN updated_by VARCHAR(255) AFTER updated_on;
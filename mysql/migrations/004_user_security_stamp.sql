@@ -0,0 +1,4 @@
+-- One-off migration: security stamp for databases created before it was added to user.sql.
+
+ALTER TABLE user
+    ADD COLUMN security_stamp INT NOT NULL DEFAULT 0;
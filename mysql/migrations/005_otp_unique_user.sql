@@ -0,0 +1,7 @@
+-- One-off migration: one OTP row per user, for databases created before uq_otp_user_id was added.
+-- Clears outstanding OTPs (users request a new one) so duplicate rows cannot block the index.
+-- Run once; otp.sql already creates the index on fresh installs.
+
+DELETE FROM Otp;
+ALTER TABLE Otp
+    ADD UNIQUE INDEX uq_otp_user_id (user_id);
@@ -4,7 +4,8 @@ CREATE TABLE IF NOT EXISTS Otp (
     otp VARCHAR(255),
     attempts INT, 
     created_on DATETIME,
-    FOREIGN KEY (user_id) REFERENCES user(user_id)
+    FOREIGN KEY (user_id) REFERENCES user(user_id),
+    UNIQUE INDEX uq_otp_user_id (user_id)
 );
 
 CREATE EVENT IF NOT EXISTS delete_expired_otp
@@ -54,7 +54,11 @@ CREATE TABLE IF NOT EXISTS Request (
     tm_signed_off_on DATETIME,
     cdm_signed_off_on DATETIME,
     hod_approved_on DATETIME,
+    created_on DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6),
+    updated_on DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+    updated_by VARCHAR(255),
     PRIMARY KEY (request_id),
+    INDEX idx_request_updated_on (updated_on, request_id),
     FOREIGN KEY (request_type_id) REFERENCES Request_Type(request_type_id),
     FOREIGN KEY (outlet_info_id) REFERENCES Outlet_Info(outlet_info_id),
     FOREIGN KEY (territory_info_id) REFERENCES Territory_Info(territory_info_id),
@@ -67,4 +71,4 @@ CREATE TABLE IF NOT EXISTS Request (
     FOREIGN KEY (designer_email) REFERENCES user(email),
     FOREIGN KEY (supplier_email) REFERENCES user(email),
     FOREIGN KEY (auditor_email) REFERENCES user(email)
-);
\ No newline at end of file
+);
@@ -0,0 +1,15 @@
+CREATE TABLE IF NOT EXISTS revoked_token (
+    revoked_token_id INT AUTO_INCREMENT PRIMARY KEY,
+    jti VARCHAR(64) NOT NULL UNIQUE,
+    email VARCHAR(255),
+    expires_on DATETIME NOT NULL,
+    revoked_on DATETIME NOT NULL,
+    INDEX idx_revoked_token_expires_on (expires_on)
+);
+
+CREATE EVENT IF NOT EXISTS delete_expired_revoked_token
+ON SCHEDULE EVERY 1 DAY
+STARTS CURRENT_DATE + INTERVAL 23 HOUR + INTERVAL 59 MINUTE
+DO
+DELETE FROM revoked_token
+WHERE expires_on < UTC_TIMESTAMP();
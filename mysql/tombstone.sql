@@ -0,0 +1,14 @@
+CREATE TABLE IF NOT EXISTS tombstone (
+    tombstone_id INT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    row_id INT NOT NULL,
+    deleted_on DATETIME NOT NULL,
+    INDEX idx_tombstone_table (table_name, deleted_on, tombstone_id)
+);
+
+-- Synced rows can be deleted outside the API (seed scripts, manual fixes), so every deletion
+-- records its tombstone here rather than in the application.
+CREATE TRIGGER IF NOT EXISTS trg_request_tombstone_ad AFTER DELETE ON request FOR EACH ROW
+    INSERT INTO tombstone (table_name, row_id, deleted_on) VALUES ('request', OLD.request_id, UTC_TIMESTAMP());
+CREATE TRIGGER IF NOT EXISTS trg_branding_elements_tombstone_ad AFTER DELETE ON Branding_Elements FOR EACH ROW
+    INSERT INTO tombstone (table_name, row_id, deleted_on) VALUES ('Branding_Elements', OLD.branding_element_id, UTC_TIMESTAMP());
@@ -15,7 +15,8 @@ CREATE TABLE IF NOT EXISTS user (
     created_by VARCHAR(255), 
     created_on DATETIME, 
     updated_by VARCHAR(255), 
-    updated_on DATETIME
+    updated_on DATETIME,
+    security_stamp INT NOT NULL DEFAULT 0
 );
 
 